@@ -0,0 +1,3 @@
+"""
+Reproducible benchmarks for the combat, targeting, rendering and persistence hot paths.
+"""
\ No newline at end of file
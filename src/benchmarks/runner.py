@@ -0,0 +1,432 @@
+"""
+Benchmark runner.
+
+Times each benchmark against seeded waves of 10 to 10,000 enemies, measures
+its memory, and compares the numbers with a stored baseline. Speeds are
+compared relative to a fixed calibration workload timed right alongside
+each one, so a baseline recorded on a faster or slower (or busier) machine
+still lines up. Run it
+from the src directory:
+
+    python -m benchmarks                      # run everything, compare with baseline.json
+    python -m benchmarks --filter render --sizes 100 1000
+    python -m benchmarks --save-baseline      # record the current numbers as the baseline
+"""
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import json
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+import numpy as np
+from benchmarks.scenarios import (ENEMY_COUNTS, DURABLE_HP, SCREEN_WIDTH, SCREEN_HEIGHT,
+                                  build_enemies, build_player, build_scenario)
+from entities.enemy import Enemy
+from entities.enemy_pool import EnemyPool
+from entities.enemy_store import ENEMY_TYPES
+from entities.entity import Projectile
+from entities.projectile_pool import ProjectilePool, OWNER_ENEMY
+from game.horde import HordeWaveGenerator
+from game.simulation import Simulation
+from systems.abilities import Passive
+from systems.gear import GearItem, GearSlot, GearSystem
+from systems.loot import LootSystem
+from systems.progression import ProgressionSystem, MetaUpgradeType
+from utils.flow_field import FlowField
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25  # slowdown (or memory growth) tolerated before flagging a regression
+MEMORY_ITERATIONS = 3  # op calls traced when measuring memory
+INVENTORY_SIZE = 2000
+MACHINE_KEY = '_machine'  # baseline entry describing where it was recorded
+
+Op = Callable[[], None]
+
+@dataclass
+class Benchmark:
+    """A named hot path. setup(size, seed) builds the state and returns the op to time."""
+    name: str
+    setup: Callable[[Optional[int], int], Op]
+    sizes: Sequence[Optional[int]] = ENEMY_COUNTS  # (None,) if the op doesn't scale with enemies
+    per_object: bool = False  # op builds size objects; report its memory per object
+
+    def key(self, size: Optional[int]) -> str:
+        return self.name if size is None else f"{self.name}[{size}]"
+
+def _process_turn(size, seed):
+    scenario = build_scenario(size, seed)
+    player, enemies, combat = scenario.player, scenario.enemies, scenario.combat
+    attackers = [player] + [enemy for enemy, _ in combat.enemies_in_range(player.x, player.y)]
+    clock = [0.0]
+
+    def op():
+        # Everyone in reach is ready again, so each call is a full turn
+        for entity in attackers:
+            entity.attack_cooldown = 0
+            entity.attacking = False
+        clock[0] += combat.turn_delay
+        combat.process_turn(player, enemies, clock[0])
+    return op
+
+def _process_tick(size, seed):
+    # Called every simulation tick, as the game does: most enemies are idle
+    # between actions, so each call only handles the few that are due
+    scenario = build_scenario(size, seed)
+    player, enemies, combat = scenario.player, scenario.enemies, scenario.combat
+    clock = [0.0]
+
+    def op():
+        clock[0] += 1 / 60
+        combat.process_turn(player, enemies, clock[0])
+    return op
+
+def _combat_update(size, seed):
+    combat = build_scenario(size, seed).combat
+    return combat.update
+
+def _nearest_target(size, seed):
+    scenario = build_scenario(size, seed)
+    player, combat = scenario.player, scenario.combat
+    return lambda: combat.nearest_enemy(player.x, player.y)
+
+def _entity_update(size, seed):
+    enemies = build_scenario(size, seed).enemies
+
+    def op():
+        for enemy in enemies:
+            enemy.update()
+    return op
+
+def _player_attack(character_class, geared=False):
+    def setup(size, seed):
+        player = build_player(character_class, seed)
+        if geared:
+            # Every input of the stat resolver in play
+            for slot, stat in ((GearSlot.WEAPON, 'attack'), (GearSlot.ARMOR, 'defense'),
+                               (GearSlot.ACCESSORY, 'speed')):
+                player.gear.equip_item(GearItem(stat, slot, {stat: 5, 'max_hp': 10}, '', level=3))
+            player.abilities.add_passive(Passive('Leech', '', 'life_steal', 0.05))
+            player.progression.meta_upgrades[MetaUpgradeType.DAMAGE_BOOST] = 3
+        player.projectile_pool = ProjectilePool(800, 600)
+        target = build_enemies(1, seed)[0]
+        pool = player.projectile_pool
+
+        def op():
+            player.attack_cooldown = 0
+            player.attacking = False
+            player.attack(target)
+            if pool.count >= 256:
+                pool.clear()
+        return op
+    return setup
+
+def _horde_step(use_enemy_store):
+    # A whole simulation tick against a fully streamed-in horde wave of size
+    def setup(size, seed):
+        horde = HordeWaveGenerator(base_count=size, growth=1.0, max_count=size)
+        simulation = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT, ProgressionSystem(save_path=None),
+                                use_enemy_store=use_enemy_store, seed=seed, horde=horde)
+        simulation.start_run('warrior', difficulty=1.0)
+        simulation.player.stats.hp = simulation.player.stats.max_hp = DURABLE_HP
+        while simulation.spawn_stream is not None:
+            simulation.step()
+        if use_enemy_store:
+            simulation.enemy_store.hp[:] = DURABLE_HP
+        for enemy in simulation.enemies:
+            enemy.stats.hp = enemy.stats.max_hp = DURABLE_HP
+        return simulation.step
+    return setup
+
+def _flow_field_build(size, seed):
+    # A rebuild for every call: the goal hops to a new cell each time
+    field = FlowField(SCREEN_WIDTH, SCREEN_HEIGHT)
+    rng = random.Random(seed)
+    goals = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)) for _ in range(64)]
+    calls = [0]
+
+    def op():
+        calls[0] += 1
+        field.goal_cell = -1
+        field.update(*goals[calls[0] % len(goals)])
+    return op
+
+def _flow_field_steer(size, seed):
+    # Every enemy looks up its next waypoint towards the player
+    scenario = build_scenario(size, seed)
+    field = FlowField(SCREEN_WIDTH, SCREEN_HEIGHT)
+    field.update(scenario.player.x, scenario.player.y)
+    enemies = scenario.enemies
+
+    def op():
+        waypoint = field.waypoint
+        for enemy in enemies:
+            enemy.set_target(*waypoint(enemy.x, enemy.y))
+    return op
+
+def _inventory_churn(size, seed):
+    # A long run's stash: pick up a drop, check the best weapon, sell the drop
+    rng = random.Random(seed)
+    gear = GearSystem()
+    for i in range(INVENTORY_SIZE):
+        gear.add_to_inventory(GearItem(f"item{i}", rng.choice(list(GearSlot)),
+                                       {rng.choice(['attack', 'defense', 'speed']): rng.randint(1, 20)},
+                                       '', level=rng.randint(1, 10)))
+    drop = GearItem('drop', GearSlot.WEAPON, {'attack': 10}, '', level=5)
+
+    def op():
+        gear.add_to_inventory(drop)
+        gear.get_best_item(GearSlot.WEAPON, 'attack')
+        gear.get_item_by_name('item0')
+        gear.remove_from_inventory(drop)
+    return op
+
+def _loot_wave(size, seed):
+    # A whole wave of one type dying at once, late enough for every rarity
+    loot = LootSystem(random.Random(seed))
+    return lambda: loot.roll_batch('tank', 20, size)
+
+def _build_enemies(size, seed):
+    return lambda: build_enemies(size, seed)
+
+def _spawn_wave(pooled):
+    # Allocating a wave of enemies, or recycling one through a warm pool
+    def setup(size, seed):
+        rng = random.Random(seed)
+        wave = [(rng.uniform(0, 800), rng.uniform(0, 600), rng.choice(ENEMY_TYPES)) for _ in range(size)]
+        if not pooled:
+            return lambda: [Enemy(x, y, enemy_type) for x, y, enemy_type in wave]
+        pool = EnemyPool()
+        pool.prewarm(size)
+
+        def op():
+            enemies = [pool.acquire(x, y, enemy_type) for x, y, enemy_type in wave]
+            pool.release_all(enemies)
+        return op
+    return setup
+
+def _build_projectiles(size, seed):
+    rng = random.Random(seed)
+    targets = [(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(size)]
+    return lambda: [Projectile(400, 300, x, y, 6, 5, (255, 0, 255)) for x, y in targets]
+
+def _spawn_pooled_projectiles(size, seed):
+    rng = random.Random(seed)
+    targets = [(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(size)]
+
+    def op():
+        pool = ProjectilePool(800, 600)
+        for x, y in targets:
+            pool.spawn(400, 300, x, y, 6, 5, (255, 0, 255), OWNER_ENEMY)
+        return pool
+    return op
+
+_game = None
+
+def _render(size, seed):
+    global _game
+    if _game is None:
+        import main
+        _game = main.Game()
+    scenario = build_scenario(size, seed)
+    _game.simulation.player = scenario.player
+    _game.simulation.enemies = scenario.enemies
+    _game.simulation.combat = scenario.combat
+    _game.battle_log = [f"Player attacks basic for {i} damage" for i in range(5)]
+    _game.state = 'battle'
+    return _game.render
+
+# Run after each benchmark to release what its setups left behind (temp dirs)
+_cleanups: List[Callable[[], None]] = []
+
+def _run_cleanups() -> None:
+    while _cleanups:
+        _cleanups.pop()()
+
+def _progression(action):
+    def setup(size, seed):
+        directory = tempfile.mkdtemp(prefix='bench-')
+        progression = ProgressionSystem(save_path=os.path.join(directory, 'progress.json'))
+
+        def cleanup():
+            progression.flush_progress()  # nothing may still be writing into it
+            shutil.rmtree(directory, ignore_errors=True)
+        _cleanups.append(cleanup)
+        progression.total_gold = 12345
+        progression.meta_upgrades[MetaUpgradeType.DAMAGE_BOOST] = 3
+        progression.save_progress()
+        progression.flush_progress()
+        if action == 'save_and_flush':
+            # The full cost of getting a save onto disk, not just queueing it
+            def op():
+                progression.save_progress()
+                progression.flush_progress()
+            return op
+        return getattr(progression, action)
+    return setup
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark('combat.process_turn', _process_turn),
+    Benchmark('combat.process_tick', _process_tick),
+    Benchmark('combat.update', _combat_update),
+    Benchmark('targeting.nearest', _nearest_target),
+    Benchmark('entity.update', _entity_update),
+    Benchmark('player.attack.warrior', _player_attack('warrior'), (None,)),
+    Benchmark('player.attack.mage', _player_attack('mage'), (None,)),
+    Benchmark('player.attack.geared', _player_attack('mage', geared=True), (None,)),
+    Benchmark('horde.step', _horde_step(use_enemy_store=False)),
+    Benchmark('horde.step_store', _horde_step(use_enemy_store=True)),
+    Benchmark('flow_field.build', _flow_field_build, (None,)),
+    Benchmark('flow_field.steer', _flow_field_steer),
+    Benchmark('inventory.churn', _inventory_churn, (None,)),
+    Benchmark('loot.wave', _loot_wave),
+    Benchmark('game.render', _render),
+    Benchmark('memory.enemies', _build_enemies, per_object=True),
+    Benchmark('spawn.wave', _spawn_wave(pooled=False), per_object=True),
+    Benchmark('spawn.wave_pooled', _spawn_wave(pooled=True), per_object=True),
+    Benchmark('memory.projectiles', _build_projectiles, per_object=True),
+    Benchmark('memory.projectile_pool', _spawn_pooled_projectiles, per_object=True),
+    Benchmark('progression.save', _progression('save_progress'), (None,)),
+    Benchmark('progression.save_flushed', _progression('save_and_flush'), (None,)),
+    Benchmark('progression.load', _progression('load_progress'), (None,)),
+]
+
+def measure_speed(op: Op, repeat: int = 3) -> float:
+    """Best-of-repeat throughput of op in calls per second."""
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return 1.0 / best if best > 0 else float('inf')
+
+def _calibration_op() -> Op:
+    # Fixed mix of interpreter and numpy work, the yardstick for this machine
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(2000)]
+    array = np.array(values)
+
+    def op():
+        sorted(values)
+        sum(value * value for value in values)
+        np.sort(array)
+    return op
+
+def describe_machine() -> Dict[str, str]:
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'python': platform.python_version(),
+        'cpus': str(os.cpu_count()),
+    }
+
+def measure_memory(setup: Callable[[], Op]) -> Dict[str, float]:
+    """KiB held by the state setup builds, and peak KiB allocated while op runs."""
+    tracemalloc.start()
+    try:
+        op = setup()
+        setup_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(MEMORY_ITERATIONS):
+            op()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'setup_kib': setup_bytes / 1024, 'op_peak_kib': max(0, peak - setup_bytes) / 1024}
+
+def run_benchmarks(name_filter: str = '', sizes: Optional[Sequence[int]] = None,
+                   seed: int = 0, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """Run every matching benchmark and return its numbers keyed by name[size]."""
+    results = {}
+    calibration = _calibration_op()
+    for benchmark in BENCHMARKS:
+        if name_filter not in benchmark.name:
+            continue
+        for size in benchmark.sizes:
+            if size is not None and sizes is not None and size not in sizes:
+                continue
+            try:
+                result = measure_memory(lambda: benchmark.setup(size, seed))
+                result['ops_per_sec'] = measure_speed(benchmark.setup(size, seed), repeat)
+            finally:
+                _run_cleanups()
+            # Speed in calibration ops, timed just after so the machine's load
+            # at the moment weighs on both alike
+            result['relative_speed'] = result['ops_per_sec'] / measure_speed(calibration, repeat)
+            if benchmark.per_object and size:
+                result['bytes_each'] = result['op_peak_kib'] * 1024 / size
+            results[benchmark.key(size)] = result
+            print(f"  {benchmark.key(size):32} {result['ops_per_sec']:>14,.1f} ops/s", file=sys.stderr)
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Print results beside the baseline and return the keys that regressed.
+
+    Speed is judged on relative_speed (ops/s in calibration ops) where both
+    sides have it, so the machine the baseline came from doesn't matter.
+    """
+    regressions = []
+    print(f"{'benchmark':32} {'ops/s':>14} {'vs base':>9} {'setup KiB':>11} {'op KiB':>10} {'B each':>8}")
+    for key, result in results.items():
+        base = baseline.get(key)
+        change = ''
+        if base:
+            if 'relative_speed' in base and 'relative_speed' in result:
+                speed = result['relative_speed'] / base['relative_speed'] - 1
+            else:
+                speed = result['ops_per_sec'] / base['ops_per_sec'] - 1
+            change = f"{speed:+.0%}"
+            memory_limit = base['op_peak_kib'] * (1 + tolerance) + 1  # +1 KiB so tiny numbers don't flap
+            if speed < -tolerance or result['op_peak_kib'] > memory_limit:
+                regressions.append(key)
+                change += ' !'
+        each = f"{result['bytes_each']:,.0f}" if 'bytes_each' in result else ''
+        print(f"{key:32} {result['ops_per_sec']:>14,.1f} {change:>9} "
+              f"{result['setup_kib']:>11,.1f} {result['op_peak_kib']:>10,.1f} {each:>8}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths.")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--sizes', type=int, nargs='+', help="enemy counts to run (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="timing repeats; the best is kept")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="write these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.sizes, args.seed, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    machine = describe_machine()
+    recorded_on = baseline.pop(MACHINE_KEY, None)
+    if recorded_on is not None and recorded_on != machine:
+        print(f"Note: the baseline was recorded on another machine ({recorded_on['processor']}, "
+              f"Python {recorded_on['python']}); speeds are compared relative to the calibration op",
+              file=sys.stderr)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline[MACHINE_KEY] = machine
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
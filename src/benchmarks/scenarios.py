@@ -0,0 +1,51 @@
+import random
+from dataclasses import dataclass
+from typing import List
+from entities.enemy import Enemy
+from entities.player import Player
+from systems.combat import CombatSystem
+from systems.progression import ProgressionSystem
+
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+ENEMY_COUNTS = (10, 100, 1000, 10000)
+
+# Enough HP that nothing dies while a benchmark is repeating, so every
+# iteration does the same work
+DURABLE_HP = 10**9
+
+@dataclass
+class Scenario:
+    """A seeded battle: a player in the middle of a wave of enemies."""
+    player: Player
+    enemies: List[Enemy]
+    combat: CombatSystem
+
+def build_enemies(count: int, seed: int = 0) -> List[Enemy]:
+    """A reproducible wave of count enemies of mixed types spread over the screen."""
+    rng = random.Random(seed)
+    enemies = []
+    for _ in range(count):
+        enemy = Enemy(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+                      rng.choice(['basic', 'ranged', 'tank']))
+        enemy.stats.hp = enemy.stats.max_hp = DURABLE_HP
+        enemies.append(enemy)
+    return enemies
+
+def build_player(character_class: str = 'warrior', seed: int = 0) -> Player:
+    """A durable player in the middle of the screen, without saved meta-upgrades."""
+    player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, character_class,
+                    ProgressionSystem(save_path=None), rng=random.Random(seed))
+    player.stats.hp = player.stats.max_hp = DURABLE_HP
+    return player
+
+def build_scenario(count: int, seed: int = 0, character_class: str = 'warrior') -> Scenario:
+    """A battle against count enemies that is already under way."""
+    player = build_player(character_class, seed)
+    enemies = build_enemies(count, seed)
+    for enemy in enemies:
+        enemy.set_target(player.x, player.y)
+    combat = CombatSystem(SCREEN_WIDTH, SCREEN_HEIGHT)
+    combat.rng = random.Random(seed)
+    combat.start_battle(player, enemies)
+    return Scenario(player, enemies, combat)
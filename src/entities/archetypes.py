@@ -0,0 +1,190 @@
+"""
+Enemy types and character classes, loaded from data/archetypes.json.
+
+Every parameter of a type or class lives in one shared, immutable template
+(a flyweight); instances only copy the numbers they change or read in hot
+loops and make fresh Stats. The parsed templates are pickled next to the
+data file and reused while the JSON is unchanged, so startup skips parsing
+and validation. New enemy types only need a new entry in the JSON; a new
+class also needs a history_code of its own, the id run history stores it
+under.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import json
+import os
+import pickle
+import tempfile
+from .stats import Stats
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'archetypes.json')
+CACHE_FORMAT = 2  # bump when the template classes change shape
+
+Color = Tuple[int, int, int]
+
+# Run history stores a class as one byte, and 255 means unknown
+MAX_HISTORY_CODE = 255
+
+@dataclass(frozen=True)
+class SkillTemplate:
+    name: str
+    damage: int
+    cooldown: float
+    description: str
+
+@dataclass(frozen=True)
+class PassiveTemplate:
+    name: str
+    description: str
+    effect_type: str
+    value: float
+
+@dataclass(frozen=True)
+class Archetype:
+    """What every character of one kind starts with."""
+    name: str
+    color: Color
+    size: Tuple[int, int]
+    stats: Tuple[int, int, int, int, int, int]  # level, hp, max_hp, attack, defense, speed
+    attack_range: float
+    attack_duration: int
+    attack_cooldown_max: int
+    projectile_speed: float
+    movement_speed: float
+    ranged: bool
+
+    def new_stats(self) -> Stats:
+        """A fresh, mutable copy of the starting stats."""
+        return Stats(*self.stats)
+
+    def reset_stats(self, stats: Stats) -> None:
+        """Put existing stats back to the starting values."""
+        stats.level, stats.hp, stats.max_hp, stats.attack, stats.defense, stats.speed = self.stats
+
+@dataclass(frozen=True)
+class EnemyArchetype(Archetype):
+    exp: int = 10
+    gold: int = 5
+    drop_chance: float = 0.05
+    first_wave: int = 1  # first wave this type can spawn in
+
+@dataclass(frozen=True)
+class ClassArchetype(Archetype):
+    history_code: int = 0  # stable id the run history stores the class under
+    skills: Tuple[SkillTemplate, ...] = ()
+    passives: Tuple[PassiveTemplate, ...] = ()
+
+@dataclass(frozen=True)
+class Archetypes:
+    enemies: Dict[str, EnemyArchetype]
+    classes: Dict[str, ClassArchetype]
+
+    def enemy(self, enemy_type: str) -> EnemyArchetype:
+        archetype = self.enemies.get(enemy_type)
+        if archetype is None:
+            raise ValueError(f"Unknown enemy type {enemy_type!r}")
+        return archetype
+
+    def character_class(self, name: str) -> ClassArchetype:
+        archetype = self.classes.get(name)
+        if archetype is None:
+            raise ValueError(f"Unknown character class {name!r}")
+        return archetype
+
+    def enemy_types_for_wave(self, wave: int) -> Tuple[str, ...]:
+        """Enemy types that can spawn in a wave, in data-file order."""
+        return tuple(name for name, archetype in self.enemies.items() if archetype.first_wave <= wave)
+
+_STAT_FIELDS = ('level', 'hp', 'max_hp', 'attack', 'defense', 'speed')
+
+def _common(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    stats = data['stats']
+    return dict(
+        name=name,
+        color=tuple(data['color']),
+        size=tuple(data.get('size', (32, 32))),
+        stats=tuple(int(stats[field]) for field in _STAT_FIELDS),
+        attack_range=data['attack_range'],
+        attack_duration=int(data['attack_duration']),
+        attack_cooldown_max=int(data['attack_cooldown_max']),
+        projectile_speed=data.get('projectile_speed', 0),
+        movement_speed=data['movement_speed'],
+        ranged=bool(data.get('ranged', False))
+    )
+
+def parse_archetypes(data: Dict[str, Any]) -> Archetypes:
+    """Build templates from the JSON document."""
+    enemies = {}
+    for name, entry in data['enemies'].items():
+        enemies[name] = EnemyArchetype(
+            **_common(name, entry),
+            exp=int(entry.get('exp', 10)),
+            gold=int(entry.get('gold', 5)),
+            drop_chance=float(entry.get('drop_chance', 0.05)),
+            first_wave=int(entry.get('first_wave', 1))
+        )
+    classes = {}
+    history_codes = {}
+    for name, entry in data['classes'].items():
+        history_code = int(entry['history_code'])
+        if not 0 <= history_code < MAX_HISTORY_CODE:
+            raise ValueError(f"Class {name!r} has history_code {history_code}, outside 0-{MAX_HISTORY_CODE - 1}")
+        if history_code in history_codes:
+            raise ValueError(f"Classes {history_codes[history_code]!r} and {name!r} share history_code {history_code}")
+        history_codes[history_code] = name
+        classes[name] = ClassArchetype(
+            **_common(name, entry),
+            history_code=history_code,
+            skills=tuple(SkillTemplate(**skill) for skill in entry.get('skills', ())),
+            passives=tuple(PassiveTemplate(**passive) for passive in entry.get('passives', ()))
+        )
+    return Archetypes(enemies, classes)
+
+def _cache_path(path: str) -> str:
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, '__pycache__', f"{os.path.splitext(filename)[0]}.{CACHE_FORMAT}.pickle")
+
+def load_archetypes(path: str = DATA_PATH, use_cache: bool = True) -> Archetypes:
+    """Load templates, from the compiled cache while it matches the data file."""
+    source = os.stat(path)
+    key = (source.st_mtime_ns, source.st_size)
+    cache_path = _cache_path(path)
+
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, archetypes = pickle.load(f)
+            if cached_key == key:
+                return archetypes
+        except Exception:
+            pass  # stale or unreadable; rebuild it below
+
+    with open(path, 'r') as f:
+        archetypes = parse_archetypes(json.load(f))
+
+    if use_cache:
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, archetypes), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"Error writing archetype cache: {e}")
+            # Don't leave half-written temp files next to the cache
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    return archetypes
+
+_archetypes: Optional[Archetypes] = None
+
+def get_archetypes() -> Archetypes:
+    """The archetypes every enemy and player is built from."""
+    global _archetypes
+    if _archetypes is None:
+        _archetypes = load_archetypes()
+    return _archetypes
@@ -1,64 +1,52 @@
+from typing import Tuple
 from .entity import Entity
-from .stats import Stats
+from .archetypes import EnemyArchetype, get_archetypes
 import pygame
-from typing import Tuple
-import random
+from utils.spatial import wrapped_delta
+from utils.text import get_text_renderer
 
 class Enemy(Entity):
+    __slots__ = ('template', 'enemy_type', 'stats', 'projectile_speed')
+    
     def __init__(self, x: float, y: float, enemy_type: str = 'basic'):
-        # Set color based on enemy type
-        color_map = {
-            'basic': (255, 165, 0),    # Orange
-            'ranged': (255, 0, 255),   # Magenta
-            'tank': (128, 128, 128)    # Gray
-        }
-        color = color_map.get(enemy_type, (255, 165, 0))
+        # Everything about the type comes from its shared template
+        template = get_archetypes().enemy(enemy_type)
+        super().__init__(x, y, template.size[0], template.size[1], template.color)
+        self.stats = template.new_stats()
+        self._apply_template(template, enemy_type)
         
-        super().__init__(x, y, 32, 32, color)
+    def reset(self, x: float, y: float, enemy_type: str = 'basic') -> None:
+        """Turn this enemy into a fresh one of enemy_type at (x, y), in place.
+
+        Plays exactly like Enemy(x, y, enemy_type) but keeps the Stats object
+        and projectile list, so a pooled enemy costs no allocations.
+        """
+        template = get_archetypes().enemy(enemy_type)
+        Entity.reset(self, x, y)
+        self.width, self.height = template.size
+        self.color = template.color
+        template.reset_stats(self.stats)
+        self._apply_template(template, enemy_type)
         
-        # Set enemy type and stats
+    def _apply_template(self, template: EnemyArchetype, enemy_type: str) -> None:
+        self.template = template
         self.enemy_type = enemy_type
-        self.stats = self._create_stats()
         
-        # Set attack properties based on type
-        if enemy_type == 'basic':
-            self.attack_range = 40  # Very close range
-            self.attack_duration = 20  # frames
-            self.attack_cooldown_max = 30  # frames
-            self.projectile_speed = 0  # No projectiles
-        elif enemy_type == 'ranged':
-            self.attack_range = 150  # Medium range
-            self.attack_duration = 15  # frames
-            self.attack_cooldown_max = 25  # frames
-            self.projectile_speed = 6  # Medium speed projectiles
-        else:  # tank
-            self.attack_range = 40  # Very close range
-            self.attack_duration = 25  # frames
-            self.attack_cooldown_max = 40  # frames
-            self.projectile_speed = 0  # No projectiles
+        # Copy the attack and movement numbers read every tick
+        self.attack_range = template.attack_range
+        self.attack_duration = template.attack_duration
+        self.attack_cooldown_max = template.attack_cooldown_max
+        self.projectile_speed = template.projectile_speed
+        self.movement_speed = template.movement_speed
         
-        # Movement properties
-        self.target_x = x
-        self.target_y = y
-        self.movement_speed = 1.5
-        
-    def _create_stats(self) -> Stats:
-        """Create stats based on enemy type."""
-        if self.enemy_type == 'basic':
-            return Stats(level=1, hp=30, max_hp=30, attack=3, defense=2, speed=3)
-        elif self.enemy_type == 'ranged':
-            return Stats(level=1, hp=25, max_hp=25, attack=5, defense=1, speed=4)
-        else:  # tank
-            return Stats(level=1, hp=50, max_hp=50, attack=2, defense=4, speed=2)
-        
-    def attack(self, target: Entity) -> bool:
-        """Attack a target."""
+    def attack(self, target: Entity, world_size: Tuple[float, float]) -> bool:
+        """Attack a target; world_size is the (width, height) the screen wraps at."""
         if not self.can_attack():
             return False
             
-        # Calculate distance to target
-        dx = target.x - self.x
-        dy = target.y - self.y
+        # Calculate distance to target across the screen wrap
+        dx = wrapped_delta(target.x - self.x, world_size[0])
+        dy = wrapped_delta(target.y - self.y, world_size[1])
         distance = (dx**2 + dy**2)**0.5
         
         # Only attack if in range
@@ -67,70 +55,66 @@ class Enemy(Entity):
             damage = self.stats.attack
             
             # Handle different attack types
-            if self.enemy_type == 'ranged':
+            if self.template.ranged:
                 # Ranged attack
                 self.shoot_projectile(target.x, target.y, 
                                     self.projectile_speed, int(damage))
             else:
                 # Close range attack
                 self.start_attack()
-                target.stats.hp -= int(damage)
+                target.take_damage(damage)
             
             return True
         return False
         
     def update(self):
         """Update enemy state."""
-        super().update()
+        Entity.update(self)
         
         # Update attack cooldown
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
+        cooldown = self.attack_cooldown
+        if cooldown > 0:
+            self.attack_cooldown = cooldown - 1
             
         # Update attack animation
         if self.attacking:
-            self.attack_frame += 1
-            if self.attack_frame >= self.attack_duration:
+            frame = self.attack_frame + 1
+            if frame >= self.attack_duration:
                 self.attacking = False
-                self.attack_frame = 0
-                
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update()
-            if projectile.is_dead():
-                self.projectiles.remove(projectile)
+                frame = 0
+            self.attack_frame = frame
                 
-    def draw(self, screen: pygame.Surface, world):
-        """Draw the enemy and its projectiles."""
+    def draw(self, screen: pygame.Surface, world) -> pygame.Rect:
+        """Draw the enemy and its projectiles and return the area drawn."""
         # Convert world coordinates to screen coordinates
         screen_x, screen_y = world.world_to_screen(self.x, self.y)
         
         # Draw base enemy
-        pygame.draw.rect(screen, self.color, 
-                        (screen_x, screen_y, self.width, self.height))
+        drawn = [pygame.draw.rect(screen, self.color, 
+                                  (screen_x, screen_y, self.width, self.height))]
         
         # Draw health bar
         health_width = (self.width * self.stats.hp) // self.stats.max_hp
-        pygame.draw.rect(screen, (255, 0, 0), 
-                        (screen_x, screen_y - 10, self.width, 5))
+        drawn.append(pygame.draw.rect(screen, (255, 0, 0), 
+                                      (screen_x, screen_y - 10, self.width, 5)))
         pygame.draw.rect(screen, (0, 255, 0), 
                         (screen_x, screen_y - 10, health_width, 5))
         
         # Draw enemy type
         type_text = self.enemy_type.capitalize()
-        type_surface = pygame.font.Font(None, 20).render(type_text, True, (255, 255, 255))
-        screen.blit(type_surface, (screen_x, screen_y - 25))
+        drawn.append(get_text_renderer().blit(screen, type_text, (screen_x, screen_y - 25), 20, (255, 255, 255)))
         
         # Draw attack animation
         if self.attacking:
             # Calculate offset based on attack frame
             offset = (self.attack_frame / self.attack_duration) * 20
             # Draw attack effect
-            pygame.draw.circle(screen, (255, 0, 0),
-                             (int(screen_x + self.width/2 + offset),
-                              int(screen_y + self.height/2)),
-                             5)
+            drawn.append(pygame.draw.circle(screen, (255, 0, 0),
+                                            (int(screen_x + self.width/2 + offset),
+                                             int(screen_y + self.height/2)),
+                                            5))
         
         # Draw projectiles
         for projectile in self.projectiles:
-            projectile.draw(screen, world) 
\ No newline at end of file
+            drawn.append(projectile.draw(screen, world))
+        return drawn[0].unionall(drawn[1:])
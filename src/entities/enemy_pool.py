@@ -0,0 +1,47 @@
+from .enemy import Enemy
+from typing import Iterable, List
+
+class EnemyPool:
+    """Recycles Enemy objects between waves instead of allocating new ones.
+
+    Released enemies go on a free list; acquire() resets one in place to the
+    requested type and position, so a wave boundary creates no Enemy, Stats
+    or projectile list objects once the pool holds a wave's worth. Any type
+    can be reused as any other, since reset() reapplies the whole template.
+    """
+
+    def __init__(self):
+        self._free: List[Enemy] = []
+        self.hits = 0  # acquires served from the free list
+        self.misses = 0  # acquires that had to allocate
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of acquires that reused a pooled enemy."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def prewarm(self, count: int) -> None:
+        """Allocate enemies up front until at least count are free."""
+        while len(self._free) < count:
+            self._free.append(Enemy(0, 0))
+
+    def acquire(self, x: float, y: float, enemy_type: str = 'basic') -> Enemy:
+        """A fresh enemy of enemy_type at (x, y), recycled when one is free."""
+        if self._free:
+            enemy = self._free.pop()
+            enemy.reset(x, y, enemy_type)
+            self.hits += 1
+            return enemy
+        self.misses += 1
+        return Enemy(x, y, enemy_type)
+
+    def release(self, enemy: Enemy) -> None:
+        """Hand back an enemy nothing references any more."""
+        self._free.append(enemy)
+
+    def release_all(self, enemies: Iterable[Enemy]) -> None:
+        self._free.extend(enemies)
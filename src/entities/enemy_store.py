@@ -0,0 +1,341 @@
+from .archetypes import get_archetypes
+from .enemy import Enemy
+from .projectile_pool import ProjectilePool, OWNER_ENEMY
+from typing import Dict, List, Optional, Tuple
+from utils.spatial import wrapped_delta
+import numpy as np
+
+ENEMY_TYPES = tuple(get_archetypes().enemies)
+TYPE_CODES = {name: code for code, name in enumerate(ENEMY_TYPES)}
+
+# Enemy.update advances cooldowns and attack animations once more on top of
+# Entity.update, so object enemies tick their timers twice per frame.
+TIMER_STEPS_PER_TICK = 2
+
+def _build_type_table() -> Dict[str, np.ndarray]:
+    """Lay the per-type archetype parameters out as columns indexed by type code."""
+    archetypes = get_archetypes()
+    templates = [archetypes.enemy(enemy_type) for enemy_type in ENEMY_TYPES]
+    stats = [t.new_stats() for t in templates]
+    return {
+        'hp': np.array([s.max_hp for s in stats], dtype=np.int32),
+        'attack': np.array([s.attack for s in stats], dtype=np.int32),
+        'defense': np.array([s.defense for s in stats], dtype=np.int32),
+        'speed': np.array([s.speed for s in stats], dtype=np.int32),
+        'movement_speed': np.array([e.movement_speed for e in templates], dtype=np.float64),
+        'attack_range': np.array([e.attack_range for e in templates], dtype=np.float64),
+        'attack_duration': np.array([e.attack_duration for e in templates], dtype=np.int32),
+        'cooldown_max': np.array([e.attack_cooldown_max for e in templates], dtype=np.int32),
+        'projectile_speed': np.array([e.projectile_speed for e in templates], dtype=np.float64),
+        'color': [e.color for e in templates],
+        'color_rgb': np.array([e.color for e in templates], dtype=np.uint8),
+        'size': [e.size for e in templates],
+        'radius': np.array([max(e.size) / 2 for e in templates], dtype=np.float64),
+    }
+
+TYPE_TABLE = _build_type_table()
+
+class EnemyStatsView:
+    """Stats facade over one row of an EnemyStore."""
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'EnemyStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def hp(self) -> int:
+        return int(self._store.hp[self._index])
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self._store.hp[self._index] = value
+
+    @property
+    def max_hp(self) -> int:
+        return int(self._store.max_hp[self._index])
+
+    @property
+    def attack(self) -> int:
+        return int(self._store.attack[self._index])
+
+    @property
+    def defense(self) -> int:
+        return int(self._store.defense[self._index])
+
+    @property
+    def speed(self) -> int:
+        return int(TYPE_TABLE['speed'][self._store.type_code[self._index]])
+
+    @property
+    def level(self) -> int:
+        return 1
+
+class EnemyView:
+    """Lightweight Enemy stand-in for one row of an EnemyStore.
+
+    Views are only valid until the store is next compacted, so callers should
+    fetch fresh views every frame rather than holding on to them.
+    """
+    __slots__ = ('_store', '_index')
+
+    projectiles = ()
+
+    def __init__(self, store: 'EnemyStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def x(self) -> float:
+        return float(self._store.x[self._index])
+
+    @property
+    def y(self) -> float:
+        return float(self._store.y[self._index])
+
+    @property
+    def enemy_type(self) -> str:
+        return ENEMY_TYPES[self._store.type_code[self._index]]
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        return TYPE_TABLE['color'][self._store.type_code[self._index]]
+
+    @property
+    def width(self) -> int:
+        return TYPE_TABLE['size'][self._store.type_code[self._index]][0]
+
+    @property
+    def height(self) -> int:
+        return TYPE_TABLE['size'][self._store.type_code[self._index]][1]
+
+    @property
+    def stats(self) -> EnemyStatsView:
+        return EnemyStatsView(self._store, self._index)
+
+    @property
+    def attack_range(self) -> float:
+        return float(self._store.attack_range[self._index])
+
+    def take_damage(self, amount: int) -> None:
+        self._store.hp[self._index] -= int(amount)
+
+    @property
+    def attacking(self) -> bool:
+        return bool(self._store.attacking[self._index])
+
+    @property
+    def attack_frame(self) -> int:
+        return int(self._store.attack_frame[self._index])
+
+    @property
+    def attack_duration(self) -> int:
+        return int(TYPE_TABLE['attack_duration'][self._store.type_code[self._index]])
+
+    # Views draw exactly like the enemies they stand in for
+    draw = Enemy.draw
+
+class EnemyStore:
+    """Struct-of-arrays storage for large enemy waves.
+
+    Each enemy is one row across NumPy columns, and movement, timers, range
+    checks and removal of the dead are done for the whole wave at once.
+    Behaviour mirrors Enemy, so a wave plays the same in either form.
+    """
+    COLUMNS = {
+        'x': np.float64, 'y': np.float64,
+        'target_x': np.float64, 'target_y': np.float64,
+        'hp': np.int32, 'max_hp': np.int32,
+        'attack': np.int32, 'defense': np.int32,
+        'movement_speed': np.float64, 'attack_range': np.float64,
+        'cooldown': np.int32, 'attack_frame': np.int32,
+        'attacking': np.bool_, 'type_code': np.int8,
+        'next_turn': np.float64,  # battle time of the next action; -1 until scheduled
+    }
+
+    def __init__(self, screen_width: int, screen_height: int, capacity: int = 256):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.count = 0
+        self._allocate(capacity)
+        
+        # Ranged enemies fire into this pool when one is attached
+        self.projectile_pool: Optional[ProjectilePool] = None
+
+    def _allocate(self, capacity: int) -> None:
+        """Create (or grow) every column to the given capacity."""
+        for name, dtype in self.COLUMNS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if self.count:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """Remove every enemy."""
+        self.count = 0
+
+    def spawn(self, x: float, y: float, enemy_type: str = 'basic') -> int:
+        """Add one enemy and return its row index."""
+        self.spawn_many(np.array([x]), np.array([y]),
+                        np.array([TYPE_CODES[enemy_type]], dtype=np.int8))
+        return self.count - 1
+
+    def spawn_many(self, xs: np.ndarray, ys: np.ndarray, type_codes: np.ndarray,
+                   hp_scale: float = 1.0, attack_scale: float = 1.0) -> None:
+        """Add a batch of enemies from position and type-code arrays.
+
+        hp_scale and attack_scale toughen the batch the way WavePlan.scale
+        does an Enemy.
+        """
+        n = len(xs)
+        if self.count + n > self.capacity:
+            self._allocate(max(self.capacity * 2, self.count + n))
+
+        rows = slice(self.count, self.count + n)
+        self.x[rows] = xs
+        self.y[rows] = ys
+        self.target_x[rows] = xs
+        self.target_y[rows] = ys
+        self.type_code[rows] = type_codes
+        self.hp[rows] = TYPE_TABLE['hp'][type_codes]
+        self.max_hp[rows] = TYPE_TABLE['hp'][type_codes]
+        self.attack[rows] = TYPE_TABLE['attack'][type_codes]
+        if hp_scale != 1.0:
+            self.hp[rows] = self.max_hp[rows] = np.maximum(1, np.rint(self.max_hp[rows] * hp_scale))
+        if attack_scale != 1.0:
+            self.attack[rows] = np.maximum(1, np.rint(self.attack[rows] * attack_scale))
+        self.defense[rows] = TYPE_TABLE['defense'][type_codes]
+        self.movement_speed[rows] = TYPE_TABLE['movement_speed'][type_codes]
+        self.attack_range[rows] = TYPE_TABLE['attack_range'][type_codes]
+        self.cooldown[rows] = 0
+        self.attack_frame[rows] = 0
+        self.attacking[rows] = False
+        self.next_turn[rows] = -1.0
+        self.count += n
+
+    def update(self) -> None:
+        """Move every enemy towards its target and advance timers."""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        dx = self.target_x[:n] - x
+        dy = self.target_y[:n] - y
+        distance = np.hypot(dx, dy)
+
+        # Step towards the target, snapping onto it when closer than a pixel
+        moving = distance > 1
+        step = np.divide(self.movement_speed[:n], distance,
+                         out=np.zeros(n), where=moving)
+        x[:] = np.where(moving, x + dx * step, self.target_x[:n])
+        y[:] = np.where(moving, y + dy * step, self.target_y[:n])
+
+        # Handle screen wrapping
+        np.mod(x, self.screen_width, out=x)
+        np.mod(y, self.screen_height, out=y)
+
+        # Update attack animation
+        attacking = self.attacking[:n]
+        frames = self.attack_frame[:n]
+        frames[attacking] += TIMER_STEPS_PER_TICK
+        finished = attacking & (frames >= TYPE_TABLE['attack_duration'][self.type_code[:n]])
+        attacking[finished] = False
+        frames[finished] = 0
+
+        # Update attack cooldown
+        cooldown = self.cooldown[:n]
+        np.maximum(cooldown - TIMER_STEPS_PER_TICK, 0, out=cooldown)
+
+    def distances_to(self, x: float, y: float, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distance from every enemy (or just the given rows) to a point across the screen wrap."""
+        if rows is None:
+            rows = slice(0, self.count)
+        return np.hypot(wrapped_delta(self.x[rows] - x, self.screen_width),
+                        wrapped_delta(self.y[rows] - y, self.screen_height))
+
+    def in_range(self, x: float, y: float, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Mask of enemies (or of the given rows) whose attack range reaches a point."""
+        if rows is None:
+            rows = slice(0, self.count)
+        return self.distances_to(x, y, rows) <= self.attack_range[rows]
+
+    def nearest(self, x: float, y: float) -> int:
+        """Row index of the enemy closest to a point, or -1 if empty."""
+        if self.count == 0:
+            return -1
+        return int(np.argmin(self.distances_to(x, y)))
+
+    def attack_target(self, target, rows: Optional[np.ndarray] = None) -> Tuple[int, np.ndarray]:
+        """Let every ready enemy in range attack the target.
+
+        rows, indices of live enemies in ascending order, limits this to
+        the ones whose turn it is.
+
+        Melee damage is applied to the target directly and ranged enemies
+        fire into the attached projectile pool. Returns the melee damage dealt
+        and the row indices of ranged enemies that fired.
+        """
+        if rows is None:
+            rows = np.arange(self.count)
+        if len(rows) == 0:
+            return 0, np.empty(0, dtype=np.intp)
+        ready = rows[~self.attacking[rows] & (self.cooldown[rows] <= 0)
+                     & self.in_range(target.x, target.y, rows)]
+        codes = self.type_code[ready]
+        ranged = TYPE_TABLE['projectile_speed'][codes] > 0
+
+        melee = ready[~ranged]
+        self.attacking[melee] = True
+        self.attack_frame[melee] = 0
+        damage = int(self.attack[melee].sum())
+        if damage:
+            target.take_damage(damage)
+
+        fired = ready[ranged]
+        if len(fired) and self.projectile_pool is not None:
+            fired_codes = codes[ranged]
+            self.projectile_pool.spawn_many(
+                self.x[fired], self.y[fired], target.x, target.y,
+                TYPE_TABLE['projectile_speed'][fired_codes], self.attack[fired],
+                TYPE_TABLE['color_rgb'][fired_codes], OWNER_ENEMY)
+        self.cooldown[ready] = TYPE_TABLE['cooldown_max'][codes]
+        return damage, fired
+
+    def take_damage(self, rows: np.ndarray, amounts: np.ndarray) -> None:
+        """Apply damage to many rows at once; a row may appear more than once."""
+        np.subtract.at(self.hp, rows, amounts.astype(self.hp.dtype))
+
+    def radii(self) -> np.ndarray:
+        """Collision radius of every enemy."""
+        return TYPE_TABLE['radius'][self.type_code[:self.count]]
+
+    def compact(self) -> np.ndarray:
+        """Drop every dead enemy and return the type codes of the removed rows."""
+        n = self.count
+        alive = self.hp[:n] > 0
+        if alive.all():
+            return np.empty(0, dtype=np.int8)
+
+        dead_codes = self.type_code[:n][~alive].copy()
+        keep = np.flatnonzero(alive)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.count = len(keep)
+        return dead_codes
+
+    def view(self, index: int) -> EnemyView:
+        """Enemy-like view of one row."""
+        return EnemyView(self, index)
+
+    def views(self) -> List[EnemyView]:
+        """Views of every live enemy, e.g. for drawing."""
+        return [EnemyView(self, i) for i in range(self.count)]
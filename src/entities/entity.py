@@ -1,8 +1,12 @@
 import pygame
 import math
+from math import sqrt
 from typing import Optional, Tuple, List
+from .projectile_pool import ProjectilePool, OWNER_ENEMY
 
 class Projectile:
+    __slots__ = ('x', 'y', 'target_x', 'target_y', 'speed', 'damage', 'color', 'size', 'dx', 'dy')
+    
     def __init__(self, x: float, y: float, target_x: float, target_y: float, 
                  speed: float, damage: int, color: Tuple[int, int, int]):
         self.x = x
@@ -25,15 +29,24 @@ class Projectile:
         self.x += self.dx * self.speed
         self.y += self.dy * self.speed
         
-    def draw(self, screen: pygame.Surface, world) -> None:
-        pygame.draw.circle(screen, self.color, 
-                         (int(self.x), int(self.y)), self.size)
+    def draw(self, screen: pygame.Surface, world) -> pygame.Rect:
+        return pygame.draw.circle(screen, self.color, 
+                                  (int(self.x), int(self.y)), self.size)
         
     def is_off_screen(self, width: int, height: int) -> bool:
         return (self.x < 0 or self.x > width or 
                 self.y < 0 or self.y > height)
 
 class Entity:
+    # Fixed attribute layout: no per-instance __dict__, and faster attribute
+    # access in update(), which runs for every enemy every tick
+    __slots__ = ('x', 'y', 'width', 'height', 'color', 'target_x', 'target_y', 'movement_speed',
+                 'attacking', 'attack_frame', 'attack_duration', 'attack_range',
+                 'attack_cooldown', 'attack_cooldown_max', 'projectiles', 'projectile_pool')
+    
+    # Side this entity's projectiles belong to
+    projectile_owner = OWNER_ENEMY
+    
     def __init__(self, x: float, y: float, width: int, height: int, color: Tuple[int, int, int]):
         self.x = x
         self.y = y
@@ -52,49 +65,76 @@ class Entity:
         self.attack_cooldown = 0
         self.attack_cooldown_max = 30  # frames
         
-        # Projectiles
+        # Projectiles; fired into the shared pool when one is attached
         self.projectiles: List[Projectile] = []
+        self.projectile_pool: Optional[ProjectilePool] = None
+        
+    def reset(self, x: float, y: float) -> None:
+        """Put the entity back at (x, y), idle, off cooldown and with no projectiles."""
+        self.x = x
+        self.y = y
+        self.target_x = x
+        self.target_y = y
+        self.attacking = False
+        self.attack_frame = 0
+        self.attack_cooldown = 0
+        self.projectiles.clear()
+        self.projectile_pool = None
         
     def set_target(self, x: float, y: float) -> None:
         self.target_x = x
         self.target_y = y
         
+    @property
+    def max_step(self) -> float:
+        """Farthest one update() can move the entity: a step, or the snap onto its target."""
+        return max(self.movement_speed, 1)
+        
     def update(self) -> None:
-        # Update position
-        dx = self.target_x - self.x
-        dy = self.target_y - self.y
-        distance = math.sqrt(dx*dx + dy*dy)
+        # Update position; each attribute is read once into a local
+        x = self.x
+        y = self.y
+        target_x = self.target_x
+        target_y = self.target_y
+        dx = target_x - x
+        dy = target_y - y
+        distance = sqrt(dx*dx + dy*dy)
         
         if distance > 1:
-            self.x += (dx / distance) * self.movement_speed
-            self.y += (dy / distance) * self.movement_speed
+            speed = self.movement_speed
+            self.x = x + (dx / distance) * speed
+            self.y = y + (dy / distance) * speed
         else:
-            self.x = self.target_x
-            self.y = self.target_y
+            self.x = target_x
+            self.y = target_y
             
         # Update attack animation
         if self.attacking:
-            self.attack_frame += 1
-            if self.attack_frame >= self.attack_duration:
+            frame = self.attack_frame + 1
+            if frame >= self.attack_duration:
                 self.attacking = False
-                self.attack_frame = 0
+                frame = 0
+            self.attack_frame = frame
                 
         # Update attack cooldown
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
+        cooldown = self.attack_cooldown
+        if cooldown > 0:
+            self.attack_cooldown = cooldown - 1
             
-        # Update projectiles
-        for projectile in self.projectiles[:]:
-            projectile.update()
-            if projectile.is_off_screen(800, 600):  # Use screen dimensions
-                self.projectiles.remove(projectile)
+        # Update projectiles that were fired without a pool
+        if self.projectiles:
+            for projectile in self.projectiles:
+                projectile.update()
+            self.projectiles = [p for p in self.projectiles
+                                if not p.is_off_screen(800, 600)]  # Use screen dimensions
                 
-    def draw(self, screen: pygame.Surface, world) -> None:
+    def draw(self, screen: pygame.Surface, world) -> pygame.Rect:
+        """Draw the entity and return the bounding box of everything drawn."""
         # Draw entity
-        pygame.draw.rect(screen, self.color, 
-                        (int(self.x - self.width/2), 
-                         int(self.y - self.height/2),
-                         self.width, self.height))
+        drawn = [pygame.draw.rect(screen, self.color, 
+                                  (int(self.x - self.width/2), 
+                                   int(self.y - self.height/2),
+                                   self.width, self.height))]
         
         # Draw attack animation
         if self.attacking:
@@ -103,20 +143,25 @@ class Entity:
             if progress < 0.5:
                 # Forward slash
                 offset = int(progress * 2 * self.attack_range)
-                pygame.draw.line(screen, (255, 255, 0),  # Yellow slash
-                               (self.x, self.y),
-                               (self.x + offset, self.y - offset), 3)
+                drawn.append(pygame.draw.line(screen, (255, 255, 0),  # Yellow slash
+                                              (self.x, self.y),
+                                              (self.x + offset, self.y - offset), 3))
             else:
                 # Backward slash
                 offset = int((1 - progress) * 2 * self.attack_range)
-                pygame.draw.line(screen, (255, 255, 0),
-                               (self.x, self.y),
-                               (self.x - offset, self.y - offset), 3)
+                drawn.append(pygame.draw.line(screen, (255, 255, 0),
+                                              (self.x, self.y),
+                                              (self.x - offset, self.y - offset), 3))
         
         # Draw projectiles
         for projectile in self.projectiles:
-            projectile.draw(screen, world)
+            drawn.append(projectile.draw(screen, world))
+        return drawn[0].unionall(drawn[1:])
             
+    def take_damage(self, amount: int) -> None:
+        """Apply damage from any source, melee or projectile."""
+        self.stats.hp -= int(amount)
+        
     def can_attack(self) -> bool:
         return not self.attacking and self.attack_cooldown <= 0
         
@@ -129,8 +174,13 @@ class Entity:
     def shoot_projectile(self, target_x: float, target_y: float, 
                         speed: float, damage: int) -> None:
         if self.can_attack():
-            self.projectiles.append(Projectile(
-                self.x, self.y, target_x, target_y,
-                speed, damage, self.color
-            ))
+            if self.projectile_pool is not None:
+                self.projectile_pool.spawn(self.x, self.y, target_x, target_y,
+                                           speed, damage, self.color, self.projectile_owner)
+            elif target_x != self.x or target_y != self.y:
+                # A shot at its own position has no direction (the pool skips these too)
+                self.projectiles.append(Projectile(
+                    self.x, self.y, target_x, target_y,
+                    speed, damage, self.color
+                ))
             self.attack_cooldown = self.attack_cooldown_max 
\ No newline at end of file
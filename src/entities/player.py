@@ -1,68 +1,50 @@
 from .entity import Entity
 from .stats import Stats
+from .archetypes import get_archetypes
+from .projectile_pool import OWNER_PLAYER
 import pygame
-from typing import Tuple
-from dataclasses import dataclass
+from typing import Optional, Tuple
 from systems.abilities import AbilitySystem, Skill, Passive
 from systems.gear import GearSystem, GearItem, GearSlot
 from systems.progression import MetaUpgradeType
+from systems.stat_resolver import StatResolver
 import random
-
-@dataclass
-class Stats:
-    def __init__(self, level: int = 1, hp: int = 0, max_hp: int = 0, 
-                 attack: int = 0, defense: int = 0, speed: int = 0):
-        self.level = level
-        self.hp = hp
-        self.max_hp = max_hp
-        self.attack = attack
-        self.defense = defense
-        self.speed = speed
+from utils.text import get_text_renderer
 
 class Player(Entity):
-    def __init__(self, x: float, y: float, character_class: str = 'warrior', progression_system=None):
-        # Set color based on character class
-        color_map = {
-            'warrior': (255, 0, 0),    # Red
-            'rogue': (0, 255, 0),      # Green
-            'mage': (0, 0, 255)        # Blue
-        }
-        color = color_map.get(character_class, (255, 0, 0))
-        
-        super().__init__(x, y, 32, 32, color)
+    __slots__ = ('template', 'progression', 'rng', 'character_class', 'stats', 'abilities', 'gear',
+                 'stat_resolver', 'projectile_speed', 'experience', 'level',
+                 'experience_to_next_level')
+    projectile_owner = OWNER_PLAYER
+    
+    def __init__(self, x: float, y: float, character_class: str = 'warrior', progression_system=None,
+                 clock=None, rng: Optional[random.Random] = None):
+        # Everything about the class comes from its shared template
+        template = get_archetypes().character_class(character_class)
+        super().__init__(x, y, template.size[0], template.size[1], template.color)
+        self.template = template
         
         # Store progression system reference
         self.progression = progression_system
         
+        # Random stream for crit rolls
+        self.rng = rng if rng is not None else random.Random()
+        
         # Set character class and stats
         self.character_class = character_class
         self.stats = self._create_stats()
         
-        # Initialize ability and gear systems
-        self.abilities = AbilitySystem()
+        # Initialize ability and gear systems; skill cooldowns run on the simulation clock
+        self.abilities = AbilitySystem(clock)
         self.gear = GearSystem()
+        self.stat_resolver = StatResolver(self.stats, self.abilities, self.gear, self.progression)
         
-        # Set attack properties based on class
-        if character_class == 'warrior':
-            self.attack_range = 50  # Close range
-            self.attack_duration = 20  # frames
-            self.attack_cooldown_max = 30  # frames
-            self.projectile_speed = 0  # No projectiles
-        elif character_class == 'rogue':
-            self.attack_range = 150  # Medium range
-            self.attack_duration = 15  # frames
-            self.attack_cooldown_max = 25  # frames
-            self.projectile_speed = 8  # Fast projectiles
-        else:  # mage
-            self.attack_range = 200  # Long range
-            self.attack_duration = 10  # frames
-            self.attack_cooldown_max = 35  # frames
-            self.projectile_speed = 6  # Medium speed projectiles
-        
-        # Movement properties
-        self.target_x = x
-        self.target_y = y
-        self.movement_speed = 2
+        # Set attack and movement properties from the class
+        self.attack_range = template.attack_range
+        self.attack_duration = template.attack_duration
+        self.attack_cooldown_max = template.attack_cooldown_max
+        self.projectile_speed = template.projectile_speed
+        self.movement_speed = template.movement_speed
         
         # Experience and leveling
         self.experience = 0
@@ -75,14 +57,7 @@ class Player(Entity):
     def _create_stats(self) -> Stats:
         """Create stats based on character class and meta-upgrades."""
         # Get base stats
-        if self.character_class == 'warrior':
-            base_stats = Stats(level=1, hp=50, max_hp=50, attack=8, defense=4, speed=4)
-        elif self.character_class == 'rogue':
-            base_stats = Stats(level=1, hp=40, max_hp=40, attack=12, defense=2, speed=5)
-        elif self.character_class == 'mage':
-            base_stats = Stats(level=1, hp=30, max_hp=30, attack=15, defense=1, speed=3)
-        else:
-            base_stats = Stats()
+        base_stats = self.template.new_stats()
         
         # Apply meta-upgrade effects if available
         if self.progression:
@@ -105,44 +80,20 @@ class Player(Entity):
         
     def _initialize_class_abilities(self):
         """Initialize class-specific skills and passives."""
-        if self.character_class == 'warrior':
-            self.abilities.add_skill(Skill(
-                name="Whirlwind",
-                damage=20,
-                cooldown=5.0,
-                description="Spin and damage all nearby enemies"
-            ))
-            self.abilities.add_passive(Passive(
-                name="Toughness",
-                description="Take 20% less damage",
-                effect_type="damage_bonus",
-                value=0.2
-            ))
-        elif self.character_class == 'rogue':
-            self.abilities.add_skill(Skill(
-                name="Backstab",
-                damage=30,
-                cooldown=3.0,
-                description="Deal massive damage from behind"
-            ))
-            self.abilities.add_passive(Passive(
-                name="Critical Strike",
-                description="15% chance to deal double damage",
-                effect_type="crit_chance",
-                value=0.15
-            ))
-        elif self.character_class == 'mage':
+        # Fresh objects per player: skills track their own cooldowns
+        for skill in self.template.skills:
             self.abilities.add_skill(Skill(
-                name="Fireball",
-                damage=25,
-                cooldown=4.0,
-                description="Launch a powerful fireball"
+                name=skill.name,
+                damage=skill.damage,
+                cooldown=skill.cooldown,
+                description=skill.description
             ))
+        for passive in self.template.passives:
             self.abilities.add_passive(Passive(
-                name="Arcane Power",
-                description="Deal 25% more damage",
-                effect_type="damage_bonus",
-                value=0.25
+                name=passive.name,
+                description=passive.description,
+                effect_type=passive.effect_type,
+                value=passive.value
             ))
             
     def attack(self, target: Entity) -> bool:
@@ -150,44 +101,41 @@ class Player(Entity):
         if not self.can_attack():
             return False
             
-        # Check for critical hit
-        is_critical = False
-        crit_chance = self.abilities.apply_passive_effects(0)['crit_chance']
-        if random.random() < crit_chance:
-            is_critical = True
-        
-        # Calculate base damage
-        base_damage = self.stats.attack
+        # Gear, passives and meta-upgrades, cached until one of them changes
+        effective = self.stat_resolver.resolve()
         
-        # Apply gear bonuses
-        gear_stats = self.gear.get_total_stats()
-        base_damage += gear_stats.get('attack', 0)
+        # Check for critical hit
+        is_critical = self.rng.random() < effective.crit_chance
         
-        # Apply passive effects
-        effects = self.abilities.apply_passive_effects(base_damage, is_critical)
-        damage = base_damage * effects['damage_multiplier']
+        # Calculate damage
+        damage = effective.attack * effective.damage_multiplier
         
         if is_critical:
-            damage *= effects['crit_multiplier']
+            damage *= effective.crit_multiplier
         
         # Handle different attack types
-        if self.character_class == 'warrior':
+        if not self.template.ranged:
             # Close range attack
             self.start_attack()
-            target.stats.hp -= int(damage)
+            target.take_damage(damage)
         else:
             # Ranged attack (rogue or mage)
             self.shoot_projectile(target.x, target.y, 
                                 self.projectile_speed, int(damage))
         
         # Apply life steal if any
-        life_steal = effects['life_steal']
+        life_steal = effective.life_steal
         if life_steal > 0:
             heal_amount = int(damage * life_steal)
             self.stats.hp = min(self.stats.max_hp, self.stats.hp + heal_amount)
         
         return True
         
+    @property
+    def max_step(self) -> float:
+        # Entity.update() moves the player, then update() steps it once more
+        return super().max_step + self.movement_speed
+        
     def update(self):
         super().update()
         
@@ -236,23 +184,24 @@ class Player(Entity):
         self.stats.defense += 1
         self.stats.speed += 1
         
-    def draw(self, screen: pygame.Surface, world):
+    def draw(self, screen: pygame.Surface, world) -> pygame.Rect:
         # Draw base player
-        super().draw(screen, world)
+        drawn = [super().draw(screen, world)]
         
         # Draw health bar
         screen_x, screen_y = world.world_to_screen(self.x, self.y)
         health_width = (self.stats.hp / self.stats.max_hp) * self.width
-        pygame.draw.rect(screen, (0, 255, 0), 
-                        (screen_x, screen_y - 10, health_width, 5))
-        
-        # Draw level and experience
-        level_text = f"Lvl {self.level}"
-        exp_text = f"EXP: {self.experience}/{self.experience_to_next_level}"
-        level_surface = pygame.font.Font(None, 20).render(level_text, True, (255, 255, 255))
-        exp_surface = pygame.font.Font(None, 20).render(exp_text, True, (255, 255, 255))
-        screen.blit(level_surface, (screen_x, screen_y - 25))
-        screen.blit(exp_surface, (screen_x, screen_y - 45))
+        drawn.append(pygame.draw.rect(screen, (0, 255, 0), 
+                                      (screen_x, screen_y - 10, health_width, 5)))
+        
+        # Draw level and experience; the EXP value changes often, so it
+        # comes from the glyph atlas rather than being rendered each time
+        text = get_text_renderer()
+        drawn.append(text.blit(screen, f"Lvl {self.level}", (screen_x, screen_y - 25), 20, (255, 255, 255)))
+        label = text.blit(screen, "EXP: ", (screen_x, screen_y - 45), 20, (255, 255, 255))
+        drawn.append(label)
+        drawn.append(text.blit_number(screen, f"{self.experience}/{self.experience_to_next_level}",
+                                      (screen_x + label.width, screen_y - 45), 20, (255, 255, 255)))
         
         # Draw attack animation
         if self.attacking:
@@ -261,7 +210,8 @@ class Player(Entity):
             offset = int(20 * (1 - (2 * progress - 1)**2))  # Quadratic easing
             
             # Draw attack effect
-            pygame.draw.circle(screen, (255, 255, 0),
-                             (int(screen_x + self.width/2 + offset),
-                              int(screen_y + self.height/2)),
-                             5) 
\ No newline at end of file
+            drawn.append(pygame.draw.circle(screen, (255, 255, 0),
+                                            (int(screen_x + self.width/2 + offset),
+                                             int(screen_y + self.height/2)),
+                                            5))
+        return drawn[0].unionall(drawn[1:])
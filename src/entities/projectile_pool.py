@@ -0,0 +1,164 @@
+import pygame
+import numpy as np
+from typing import List, Tuple
+
+# Which side fired a projectile
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+PROJECTILE_SIZE = 8  # radius in pixels, same as Projectile
+
+class ProjectilePool:
+    """Preallocated storage for every projectile in flight.
+
+    Slots are recycled through a free list instead of allocating a Projectile
+    per shot, and all projectiles are moved and culled with one vectorized
+    pass per tick. The pool grows by doubling if a burst outruns it.
+    """
+
+    def __init__(self, screen_width: int, screen_height: int, capacity: int = 512):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.capacity = 0
+        self.high_water = 0  # slots at or above this index have never been used
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Create (or grow) the slot arrays and extend the free list."""
+        old = self.capacity
+        for name, dtype, shape in (('x', np.float64, ()), ('y', np.float64, ()),
+                                   ('prev_x', np.float64, ()), ('prev_y', np.float64, ()),
+                                   ('vx', np.float64, ()), ('vy', np.float64, ()),
+                                   ('damage', np.int32, ()), ('owner', np.int8, ()),
+                                   ('radius', np.float32, ()), ('alive', np.bool_, ()),
+                                   ('color', np.uint8, (3,))):
+            column = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                column[:old] = getattr(self, name)
+            setattr(self, name, column)
+
+        # Free list as a stack; lowest slots are handed out first
+        fresh = np.arange(capacity - 1, old - 1, -1, dtype=np.int32)
+        free = np.empty(capacity, dtype=np.int32)
+        free[:len(fresh)] = fresh
+        if old:
+            free[len(fresh):len(fresh) + self._free_count] = self._free[:self._free_count]
+            self._free_count += len(fresh)
+        else:
+            self._free_count = len(fresh)
+        self._free = free
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """Release every projectile."""
+        self.alive[:] = False
+        self._free = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+        self.high_water = 0
+        self.count = 0
+
+    def spawn(self, x: float, y: float, target_x: float, target_y: float,
+              speed: float, damage: int, color: Tuple[int, int, int], owner: int) -> int:
+        """Launch one projectile towards a target point and return its slot."""
+        dx = target_x - x
+        dy = target_y - y
+        length = (dx*dx + dy*dy)**0.5
+        if length == 0:
+            return -1
+        if self._free_count == 0:
+            self._allocate(self.capacity * 2)
+
+        self._free_count -= 1
+        slot = int(self._free[self._free_count])
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.vx[slot] = dx / length * speed
+        self.vy[slot] = dy / length * speed
+        self.damage[slot] = damage
+        self.owner[slot] = owner
+        self.radius[slot] = PROJECTILE_SIZE
+        self.color[slot] = color
+        self.alive[slot] = True
+        self.high_water = max(self.high_water, slot + 1)
+        self.count += 1
+        return slot
+
+    def spawn_many(self, xs: np.ndarray, ys: np.ndarray, target_x: float, target_y: float,
+                   speeds: np.ndarray, damages: np.ndarray, colors: np.ndarray, owner: int) -> None:
+        """Launch a batch of projectiles that all aim at one point."""
+        dx = target_x - xs
+        dy = target_y - ys
+        length = np.hypot(dx, dy)
+        aimed = length > 0
+        n = int(aimed.sum())
+        if n == 0:
+            return
+        while self._free_count < n:
+            self._allocate(self.capacity * 2)
+
+        self._free_count -= n
+        slots = self._free[self._free_count:self._free_count + n]
+        scale = speeds[aimed] / length[aimed]
+        self.x[slots] = self.prev_x[slots] = xs[aimed]
+        self.y[slots] = self.prev_y[slots] = ys[aimed]
+        self.vx[slots] = dx[aimed] * scale
+        self.vy[slots] = dy[aimed] * scale
+        self.damage[slots] = damages[aimed]
+        self.owner[slots] = owner
+        self.radius[slots] = PROJECTILE_SIZE
+        self.color[slots] = colors[aimed]
+        self.alive[slots] = True
+        self.high_water = max(self.high_water, int(slots.max()) + 1)
+        self.count += n
+
+    def release(self, slots: np.ndarray) -> None:
+        """Return slots to the free list."""
+        slots = slots[self.alive[slots]]
+        if len(slots) == 0:
+            return
+        self.alive[slots] = False
+        self._free[self._free_count:self._free_count + len(slots)] = slots
+        self._free_count += len(slots)
+        self.count -= len(slots)
+
+    def update(self) -> None:
+        """Move every live projectile and release the ones that left the screen.
+
+        The position before the move is kept in prev_x/prev_y so collision
+        can test the whole path travelled this tick.
+        """
+        n = self.high_water
+        if self.count == 0:
+            self.high_water = 0
+            return
+        alive = self.alive[:n]
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n] * alive
+        y += self.vy[:n] * alive
+
+        off_screen = alive & ((x < 0) | (x > self.screen_width) |
+                              (y < 0) | (y > self.screen_height))
+        if off_screen.any():
+            self.release(np.flatnonzero(off_screen).astype(np.int32))
+
+    def live_slots(self) -> np.ndarray:
+        """Indices of every projectile in flight."""
+        return np.flatnonzero(self.alive[:self.high_water])
+
+    def draw(self, screen: pygame.Surface, world) -> List[pygame.Rect]:
+        """Draw every live projectile and return the area each one covers."""
+        slots = self.live_slots()
+        if len(slots) == 0:
+            return []
+        xs = self.x[slots].astype(np.int32).tolist()
+        ys = self.y[slots].astype(np.int32).tolist()
+        radii = self.radius[slots].astype(np.int32).tolist()
+        colors = [tuple(c) for c in self.color[slots].tolist()]
+        return [pygame.draw.circle(screen, color, (x, y), r)
+                for x, y, r, color in zip(xs, ys, radii, colors)]
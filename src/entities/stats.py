@@ -1,14 +1,30 @@
-from dataclasses import dataclass
 from typing import Dict, Any
 
-@dataclass
 class Stats:
-    level: int = 1
-    hp: int = 100
-    max_hp: int = 100
-    attack: int = 10
-    defense: int = 5
-    speed: int = 1
+    """Level, health and combat stats of any character.
+
+    Slotted rather than a dataclass (slots=True needs Python 3.10), so every
+    enemy carries six fields and no per-instance __dict__.
+    """
+    __slots__ = ('level', 'hp', 'max_hp', 'attack', 'defense', 'speed')
+    
+    def __init__(self, level: int = 1, hp: int = 100, max_hp: int = 100,
+                 attack: int = 10, defense: int = 5, speed: int = 1):
+        self.level = level
+        self.hp = hp
+        self.max_hp = max_hp
+        self.attack = attack
+        self.defense = defense
+        self.speed = speed
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Stats({fields})"
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Stats):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
     
     @classmethod
     def create_warrior(cls) -> 'Stats':
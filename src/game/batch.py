@@ -0,0 +1,159 @@
+"""
+Monte Carlo batch runner for balance checks.
+
+Plays many complete headless runs per class and meta-upgrade configuration
+across a process pool and reduces the results into percentiles. Run it from
+the src directory:
+
+    python -m game.batch --runs 2000 --classes warrior mage --upgrade damage_boost=3
+"""
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import numpy as np
+from game.horde import HordeWaveGenerator
+from game.simulation import Simulation
+from systems.progression import ProgressionSystem, MetaUpgradeType
+
+# Columns of the per-run result arrays sent back by workers
+RESULT_FIELDS = ('waves_survived', 'exp_gained', 'gold_earned', 'level', 'duration', 'defeated')
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+@dataclass
+class RunConfig:
+    """One point in the tuning space: a class plus meta-upgrade settings."""
+    character_class: str
+    meta_upgrades: Dict[str, int] = field(default_factory=dict)  # upgrade value -> level
+    effect_values: Dict[str, float] = field(default_factory=dict)  # upgrade value -> effect_value override
+    max_waves: int = 50
+    horde: bool = False  # endless horde mode
+    chase: bool = False  # enemies chase the player along the flow field
+    width: int = 800
+    height: int = 600
+
+    @property
+    def label(self) -> str:
+        """Readable key for this configuration in result tables."""
+        parts = [self.character_class]
+        parts += [f"{k}={v}" for k, v in sorted(self.meta_upgrades.items())]
+        parts += [f"{k}@{v}" for k, v in sorted(self.effect_values.items())]
+        if self.horde:
+            parts.append('horde')
+        if self.chase:
+            parts.append('chase')
+        return ' '.join(parts)
+
+    def create_progression(self) -> ProgressionSystem:
+        """Build an in-memory progression system with this configuration applied."""
+        progression = ProgressionSystem(save_path=None)
+        for upgrade, value in self.effect_values.items():
+            progression.available_upgrades[MetaUpgradeType(upgrade)].effect_value = value
+        for upgrade, level in self.meta_upgrades.items():
+            progression.meta_upgrades[MetaUpgradeType(upgrade)] = level
+        return progression
+
+def _run_chunk(config: RunConfig, seeds: np.ndarray) -> np.ndarray:
+    """Worker entry point: play one run per seed and return a results array."""
+    results = np.zeros((len(seeds), len(RESULT_FIELDS)), dtype=np.float64)
+    for i, seed in enumerate(seeds):
+        simulation = Simulation(config.width, config.height, config.create_progression(),
+                                seed=int(seed), horde=HordeWaveGenerator() if config.horde else None,
+                                chase=config.chase)
+        run = simulation.run_headless(config.character_class, max_waves=config.max_waves)
+        results[i] = [run[name] for name in RESULT_FIELDS]
+    return results
+
+def run_batch(configs: Sequence[RunConfig], runs_per_config: int,
+              workers: Optional[int] = None, seed: int = 0,
+              chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Play runs_per_config runs of every configuration across a process pool.
+
+    Returns one (runs, len(RESULT_FIELDS)) array per configuration label. Every
+    run gets its own seed drawn from a per-configuration child of a single
+    SeedSequence, so the results only depend on seed, not on worker count,
+    chunking or scheduling.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker keeps every core busy until the end
+        total_runs = runs_per_config * len(configs)
+        chunk_size = max(1, total_runs // (workers * 4))
+
+    # Split every configuration into chunks of seeded runs
+    tasks: List[Tuple[int, int, np.ndarray]] = []
+    children = np.random.SeedSequence(seed).spawn(len(configs))
+    for config_index, child in enumerate(children):
+        run_seeds = child.generate_state(runs_per_config)
+        for start in range(0, runs_per_config, chunk_size):
+            tasks.append((config_index, start, run_seeds[start:start + chunk_size]))
+
+    results = {config.label: np.zeros((runs_per_config, len(RESULT_FIELDS)))
+               for config in configs}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_run_chunk, configs[config_index], seeds): (config_index, start)
+            for config_index, start, seeds in tasks
+        }
+        for future in as_completed(futures):
+            config_index, start = futures[future]
+            chunk = future.result()
+            results[configs[config_index].label][start:start + len(chunk)] = chunk
+
+    return results
+
+def summarize(results: Dict[str, np.ndarray],
+              percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Reduce per-run result arrays into mean and percentiles per field."""
+    summary = {}
+    for label, runs in results.items():
+        points = np.percentile(runs, percentiles, axis=0)
+        means = runs.mean(axis=0)
+        summary[label] = {
+            name: {'mean': float(means[col]),
+                   **{f"p{p:g}": float(points[i, col]) for i, p in enumerate(percentiles)}}
+            for col, name in enumerate(RESULT_FIELDS)
+        }
+    return summary
+
+def _parse_assignments(values: List[str], cast) -> Dict[str, float]:
+    """Parse NAME=VALUE command line pairs."""
+    parsed = {}
+    for value in values:
+        name, _, number = value.partition('=')
+        MetaUpgradeType(name)  # Validate the upgrade name early
+        parsed[name] = cast(number)
+    return parsed
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Monte Carlo balance runs")
+    parser.add_argument('--runs', type=int, default=1000, help="runs per configuration")
+    parser.add_argument('--classes', nargs='+', default=['warrior', 'rogue', 'mage'])
+    parser.add_argument('--upgrade', action='append', default=[], metavar='NAME=LEVEL',
+                        help="meta-upgrade level, e.g. damage_boost=3")
+    parser.add_argument('--effect', action='append', default=[], metavar='NAME=VALUE',
+                        help="override a meta-upgrade effect_value, e.g. max_health=0.15")
+    parser.add_argument('--max-waves', type=int, default=50)
+    parser.add_argument('--horde', action='store_true', help="play endless horde mode")
+    parser.add_argument('--chase', action='store_true', help="enemies chase the player")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    upgrades = _parse_assignments(args.upgrade, int)
+    effects = _parse_assignments(args.effect, float)
+    configs = [RunConfig(c, upgrades, effects, args.max_waves, args.horde, args.chase) for c in args.classes]
+
+    summary = summarize(run_batch(configs, args.runs, args.workers, args.seed))
+    columns = ['mean'] + [f"p{p:g}" for p in DEFAULT_PERCENTILES]
+    for label, fields in summary.items():
+        print(f"\n{label} ({args.runs} runs)")
+        print(f"  {'':<16}" + ''.join(f"{c:>10}" for c in columns))
+        for name, values in fields.items():
+            print(f"  {name:<16}" + ''.join(f"{values[c]:>10.1f}" for c in columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import pygame
+from typing import Iterable, List
+
+# Past this many rects, or this share of the screen, one full flip is cheaper
+MAX_DIRTY_RECTS = 128
+MAX_DIRTY_FRACTION = 0.5
+
+# Padding around each box; thick lines and circles can bleed a pixel past
+# the rect pygame.draw returns for them
+DIRTY_MARGIN = 2
+
+class DirtyRectTracker:
+    """Presents only the parts of the screen that changed since the last frame.
+
+    The frame is still composed in full on the back buffer, but only the
+    bounding boxes of what moved are copied to the display. Every box drawn
+    this frame is presented together with every box from the previous frame,
+    so the old position of something that moved is cleared too. Screens
+    whose static layers change (a new UI state, a key press) call
+    invalidate() to get one full flip instead.
+    """
+
+    def __init__(self, screen_width: int, screen_height: int):
+        self.screen_rect = pygame.Rect(0, 0, screen_width, screen_height)
+        self.full_redraw = True
+        self._previous: List[pygame.Rect] = []
+        self._current: List[pygame.Rect] = []
+
+        # Stats for the last present
+        self.last_rect_count = 0
+        self.last_area = 0
+
+    def invalidate(self) -> None:
+        """Present the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def add(self, rect: pygame.Rect) -> None:
+        """Mark an area drawn this frame."""
+        if rect.width and rect.height:
+            self._current.append(rect.inflate(DIRTY_MARGIN * 2, DIRTY_MARGIN * 2))
+
+    def add_all(self, rects: Iterable[pygame.Rect]) -> None:
+        """Mark several areas drawn this frame."""
+        for rect in rects:
+            self.add(rect)
+
+    def dirty_rects(self) -> List[pygame.Rect]:
+        """Areas to present: this frame's boxes plus last frame's, clipped to the screen."""
+        rects = []
+        for rect in self._previous + self._current:
+            clipped = rect.clip(self.screen_rect)
+            if clipped.width and clipped.height:
+                rects.append(clipped)
+        return rects
+
+    def present(self) -> None:
+        """Push this frame to the display and start tracking the next one."""
+        rects = None if self.full_redraw else self.dirty_rects()
+        if rects is not None and len(rects) <= MAX_DIRTY_RECTS:
+            area = sum(rect.width * rect.height for rect in rects)
+            if area > self.screen_rect.width * self.screen_rect.height * MAX_DIRTY_FRACTION:
+                rects = None
+        else:
+            rects = None
+
+        if rects is None:
+            pygame.display.flip()
+            self.last_rect_count = 1
+            self.last_area = self.screen_rect.width * self.screen_rect.height
+        else:
+            if rects:
+                pygame.display.update(rects)
+            self.last_rect_count = len(rects)
+            self.last_area = area
+
+        self._previous = self._current
+        self._current = []
+        self.full_redraw = False
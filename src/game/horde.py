@@ -0,0 +1,114 @@
+"""
+Endless horde mode.
+
+Waves keep growing instead of staying at three enemies: each one is bigger,
+tougher and leans further towards the later enemy types, all scaled by the
+run's difficulty multiplier. A wave is planned in one vectorized batch and
+then streamed into the battle a slice per tick, so even a wave of thousands
+never costs more than one slice's worth of spawning in a frame.
+
+Start the game with it (python src/main.py --horde), or run it headless with
+python -m game.batch --horde. It doubles as the stress scenario for the
+combat loop (the horde benchmarks).
+"""
+from dataclasses import dataclass
+from typing import Tuple
+import math
+import random
+import numpy as np
+from entities.archetypes import get_archetypes
+from entities.enemy_store import ENEMY_TYPES
+from entities.stats import Stats
+
+SPAWNS_PER_TICK = 64  # enemies streamed into the battle each tick
+
+@dataclass
+class WavePlan:
+    """Where every enemy of one wave appears, what it is and how tough."""
+    wave: int
+    x: np.ndarray
+    y: np.ndarray
+    type_codes: np.ndarray  # indices into ENEMY_TYPES
+    hp_scale: float = 1.0
+    attack_scale: float = 1.0
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    def scale(self, stats: Stats) -> None:
+        """Apply this wave's toughness to a freshly spawned enemy's stats."""
+        stats.max_hp = stats.hp = max(1, round(stats.max_hp * self.hp_scale))
+        stats.attack = max(1, round(stats.attack * self.attack_scale))
+
+class HordeWaveGenerator:
+    """Plans ever larger waves from the wave number and difficulty.
+
+    Enemy count grows geometrically from base_count up to max_count. Each
+    type's share of a wave grows with the waves since it was unlocked, so the
+    mix drifts towards the tougher types, and health and attack go up a few
+    percent per wave. Enemies appear in a ring around the player, wrapped
+    onto the screen.
+    """
+
+    def __init__(self, base_count: int = 3, growth: float = 1.25, max_count: int = 5000,
+                 hp_growth: float = 0.06, attack_growth: float = 0.04, mix_ramp: float = 0.15,
+                 spawn_radius: Tuple[float, float] = (150, 400)):
+        self.base_count = base_count
+        self.growth = growth
+        self.max_count = max_count
+        self.hp_growth = hp_growth
+        self.attack_growth = attack_growth
+        self.mix_ramp = mix_ramp
+        self.spawn_radius = spawn_radius
+
+    def wave_size(self, wave: int, difficulty: float = 1.0) -> int:
+        count = self.base_count * difficulty * self.growth ** (wave - 1)
+        return max(1, min(self.max_count, int(count)))
+
+    def type_weights(self, wave: int) -> np.ndarray:
+        """Chance of each of ENEMY_TYPES in a wave."""
+        archetypes = get_archetypes()
+        weights = np.zeros(len(ENEMY_TYPES))
+        for code, enemy_type in enumerate(ENEMY_TYPES):
+            waves_unlocked = wave - archetypes.enemy(enemy_type).first_wave
+            if waves_unlocked >= 0:
+                weights[code] = 1.0 + self.mix_ramp * waves_unlocked
+        if not weights.any():
+            weights[0] = 1.0  # nothing unlocked yet; fall back to the first type
+        return weights / weights.sum()
+
+    def plan(self, wave: int, rng: random.Random, center: Tuple[float, float],
+             width: int, height: int, difficulty: float = 1.0) -> WavePlan:
+        """Lay out a whole wave at once; rng seeds the batch so runs replay."""
+        generator = np.random.default_rng(rng.getrandbits(64))
+        count = self.wave_size(wave, difficulty)
+        type_codes = generator.choice(len(ENEMY_TYPES), size=count,
+                                      p=self.type_weights(wave)).astype(np.int8)
+        angle = generator.uniform(0, 2 * math.pi, count)
+        distance = generator.uniform(*self.spawn_radius, count)
+        return WavePlan(
+            wave=wave,
+            x=np.mod(center[0] + np.cos(angle) * distance, width),
+            y=np.mod(center[1] + np.sin(angle) * distance, height),
+            type_codes=type_codes,
+            hp_scale=difficulty * (1 + self.hp_growth * (wave - 1)),
+            attack_scale=difficulty * (1 + self.attack_growth * (wave - 1))
+        )
+
+class SpawnStream:
+    """Hands a planned wave out a slice at a time."""
+
+    def __init__(self, plan: WavePlan, per_tick: int = SPAWNS_PER_TICK):
+        self.plan = plan
+        self.per_tick = per_tick
+        self.spawned = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.plan) - self.spawned
+
+    def next_batch(self) -> slice:
+        """The plan rows to spawn this tick."""
+        start = self.spawned
+        self.spawned = min(len(self.plan), start + self.per_tick)
+        return slice(start, self.spawned)
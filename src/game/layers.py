@@ -0,0 +1,56 @@
+import pygame
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+class LayerCompositor:
+    """Full-screen layers that are drawn once and then re-blitted every frame.
+
+    Each named layer is rendered by a builder callback onto a fresh surface,
+    converted to the display's pixel format and cached. It is rebuilt only
+    when the target size changes or the caller passes a different key (for
+    example a new UI state), or after an explicit invalidate().
+    """
+
+    def __init__(self):
+        self._layers: Dict[str, Tuple[Hashable, Tuple[int, int], pygame.Surface]] = {}
+        self.builds = 0
+
+    def layer(self, name: str, size: Tuple[int, int], build: Callable[[pygame.Surface], None],
+              key: Hashable = None, alpha: Optional[int] = None,
+              transparent: bool = False) -> pygame.Surface:
+        """Cached surface for a layer, building it if missing or stale.
+
+        alpha applies a whole-surface alpha (e.g. a dimming overlay), while
+        transparent gives the layer per-pixel alpha so only what the builder
+        draws shows up (e.g. text on a clear background).
+        """
+        cached = self._layers.get(name)
+        if cached is not None and cached[0] == key and cached[1] == size:
+            return cached[2]
+
+        if transparent:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(size)
+        build(surface)
+
+        # Match the display format so blits don't convert every frame
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if transparent else surface.convert()
+        if alpha is not None:
+            surface.set_alpha(alpha)
+
+        self._layers[name] = (key, size, surface)
+        self.builds += 1
+        return surface
+
+    def blit(self, target: pygame.Surface, name: str, build: Callable[[pygame.Surface], None],
+             key: Hashable = None, alpha: Optional[int] = None, transparent: bool = False) -> None:
+        """Draw a cached layer over the whole target."""
+        target.blit(self.layer(name, target.get_size(), build, key, alpha, transparent), (0, 0))
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one layer, or every layer when no name is given."""
+        if name is None:
+            self._layers.clear()
+        else:
+            self._layers.pop(name, None)
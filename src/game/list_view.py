@@ -0,0 +1,81 @@
+import pygame
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class VirtualList(Generic[T]):
+    """A scrolling list that only draws the rows inside its viewport.
+
+    Each row is rendered once by draw_row onto its own transparent surface
+    and then cached under the key row_key returns for the item, so a row is
+    re-rendered only when that key changes (the item was edited) or after
+    it falls out of the LRU cache. Anything that changes every frame, like a
+    cooldown bar, is drawn by the caller over the rects draw() returns.
+    """
+
+    def __init__(self, rect: pygame.Rect, row_height: int,
+                 draw_row: Callable[[pygame.Surface, T], None],
+                 row_key: Callable[[T], Hashable] = id, max_cached_rows: int = 128):
+        self.rect = pygame.Rect(rect)
+        self.row_height = row_height
+        self.draw_row = draw_row
+        self.row_key = row_key
+        self.max_cached_rows = max_cached_rows
+        self.scroll = 0  # index of the first visible row
+        self.count = 0  # rows in the list at the last draw
+        self.renders = 0
+        self._rows: 'OrderedDict[Hashable, pygame.Surface]' = OrderedDict()
+
+    @property
+    def page_rows(self) -> int:
+        """Rows that fit entirely in the viewport; partly visible rows aren't drawn."""
+        return max(1, self.rect.height // self.row_height)
+
+    def scroll_by(self, rows: int) -> None:
+        self.scroll = self._clamp(self.scroll + rows)
+
+    def scroll_to(self, index: int) -> None:
+        """Scroll just far enough that row index is fully shown."""
+        if index < self.scroll:
+            self.scroll = self._clamp(index)
+        elif index >= self.scroll + self.page_rows:
+            self.scroll = self._clamp(index - self.page_rows + 1)
+
+    def _clamp(self, scroll: int) -> int:
+        return max(0, min(scroll, self.count - self.page_rows))
+
+    def invalidate(self) -> None:
+        """Drop every cached row surface."""
+        self._rows.clear()
+
+    def draw(self, screen: pygame.Surface, items: Sequence[T]) -> List[Tuple[T, pygame.Rect]]:
+        """Blit the visible rows of items; returns each shown item with its rect."""
+        self.count = len(items)
+        self.scroll = self._clamp(self.scroll)
+
+        shown = []
+        y = self.rect.y
+        for index in range(self.scroll, min(self.count, self.scroll + self.page_rows)):
+            item = items[index]
+            screen.blit(self._row_surface(item), (self.rect.x, y))
+            shown.append((item, pygame.Rect(self.rect.x, y, self.rect.width, self.row_height)))
+            y += self.row_height
+        return shown
+
+    def _row_surface(self, item: T) -> pygame.Surface:
+        key = self.row_key(item)
+        surface = self._rows.get(key)
+        if surface is not None:
+            self._rows.move_to_end(key)
+            return surface
+
+        surface = pygame.Surface((self.rect.width, self.row_height), pygame.SRCALPHA)
+        self.draw_row(surface, item)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self._rows[key] = surface
+        self.renders += 1
+        if len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+        return surface
@@ -0,0 +1,81 @@
+"""
+Replay playback at full speed.
+
+Re-runs a recorded run through the headless simulation, feeding it the
+recorded commands on the recorded ticks, and checks that every state change
+happens on the same tick as before. Run it from the src directory:
+
+    python -m game.playback replays/replay-1234.json
+"""
+import os
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from collections import deque
+from typing import Any, Callable, Dict
+import argparse
+import time
+from game.horde import HordeWaveGenerator
+from game.replay import Replay
+from game.simulation import Simulation, TICK_DT
+from systems.progression import ProgressionSystem, MetaUpgradeType
+
+# Commands a replay can contain
+COMMANDS: Dict[str, Callable[[Simulation], None]] = {
+    'start_battle': Simulation.start_battle
+}
+
+def play_replay(replay: Replay) -> Dict[str, Any]:
+    """Play a replay as fast as possible and report how it went.
+
+    desync is the index of the first recorded state change that didn't
+    happen again on the same tick, or None if the run reproduced exactly.
+    """
+    progression = ProgressionSystem(save_path=None)
+    for upgrade, level in replay.meta_upgrades.items():
+        progression.meta_upgrades[MetaUpgradeType(upgrade)] = level
+    simulation = Simulation(replay.width, replay.height, progression,
+                            use_enemy_store=replay.use_enemy_store,
+                            horde=HordeWaveGenerator() if replay.horde else None,
+                            chase=replay.chase)
+
+    started = time.perf_counter()
+    simulation.start_run(replay.character_class, seed=replay.seed, difficulty=replay.difficulty)
+    inputs = deque(replay.inputs)
+    end_tick = replay.end_tick
+    while True:
+        # Commands were given before the step that followed them
+        while inputs and inputs[0][0] <= simulation.run_tick:
+            _, command = inputs.popleft()
+            COMMANDS[command](simulation)
+        if simulation.run_tick >= end_tick:
+            break
+        simulation.step()
+    elapsed = time.perf_counter() - started
+
+    simulated = simulation.run_tick * TICK_DT
+    return {
+        'ticks': simulation.run_tick,
+        'waves_survived': simulation.waves_cleared,
+        'defeated': simulation.state == 'defeated',
+        'desync': simulation.replay.first_desync(replay),
+        'elapsed': elapsed,
+        'speedup': simulated / elapsed if elapsed > 0 else float('inf')
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play back a recorded run at full speed.")
+    parser.add_argument('replay', help="replay file written by the game")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    result = play_replay(replay)
+    print(f"{replay.character_class} seed {replay.seed}: {result['waves_survived']} waves, "
+          f"{result['ticks']} ticks in {result['elapsed']:.3f}s ({result['speedup']:.0f}x real time)")
+    if result['desync'] is None:
+        print("Replay reproduced exactly")
+    else:
+        expected = replay.transitions[result['desync']] if result['desync'] < len(replay.transitions) else None
+        print(f"Desync at state change {result['desync']}: expected {expected}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+REPLAY_VERSION = 1
+
+@dataclass
+class Replay:
+    """Everything needed to re-run one run of the simulation exactly.
+
+    The run's seed and starting conditions, the commands given to the
+    simulation and the state changes that followed, each stamped with the
+    tick (counted from the start of the run) at which it happened. Playing
+    the commands back against the same seed must reproduce the same state
+    changes; the first one that differs marks a desync.
+    """
+    seed: int
+    character_class: str
+    meta_upgrades: Dict[str, int] = field(default_factory=dict)  # upgrade value -> level
+    width: int = 800
+    height: int = 600
+    use_enemy_store: bool = False
+    horde: bool = False  # endless horde mode
+    chase: bool = False  # enemies follow the flow field towards the player
+    difficulty: float = 1.0
+    inputs: List[Tuple[int, str]] = field(default_factory=list)  # (tick, command)
+    transitions: List[Tuple[int, str]] = field(default_factory=list)  # (tick, state)
+
+    @property
+    def end_tick(self) -> int:
+        """Tick of the last recorded input or state change."""
+        last = [events[-1][0] for events in (self.inputs, self.transitions) if events]
+        return max(last, default=0)
+
+    def first_desync(self, other: 'Replay') -> Optional[int]:
+        """Index of the first state change that differs from other's, or None."""
+        for i, (ours, theirs) in enumerate(zip(self.transitions, other.transitions)):
+            if tuple(ours) != tuple(theirs):
+                return i
+        if len(self.transitions) != len(other.transitions):
+            return min(len(self.transitions), len(other.transitions))
+        return None
+
+    def save(self, path: str) -> None:
+        """Write the replay as compact JSON."""
+        data = {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'class': self.character_class,
+            'meta_upgrades': self.meta_upgrades,
+            'size': [self.width, self.height],
+            'enemy_store': self.use_enemy_store,
+            'horde': self.horde,
+            'chase': self.chase,
+            'difficulty': self.difficulty,
+            'inputs': self.inputs,
+            'transitions': self.transitions
+        }
+        try:
+            with open(path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """Read a replay written by save()."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        width, height = data['size']
+        return cls(
+            seed=data['seed'],
+            character_class=data['class'],
+            meta_upgrades=data['meta_upgrades'],
+            width=width,
+            height=height,
+            use_enemy_store=data['enemy_store'],
+            horde=data.get('horde', False),
+            chase=data.get('chase', False),
+            difficulty=data.get('difficulty', 1.0),
+            inputs=[(tick, command) for tick, command in data['inputs']],
+            transitions=[(tick, state) for tick, state in data['transitions']]
+        )
@@ -0,0 +1,396 @@
+from typing import List, Dict, Any, Optional
+from entities.player import Player
+from entities.enemy import Enemy
+from entities.archetypes import get_archetypes
+from entities.enemy_store import EnemyStore, ENEMY_TYPES
+from entities.projectile_pool import ProjectilePool
+from systems.combat import CombatSystem
+from systems.progression import ProgressionSystem
+from systems.run_history import OUTCOME_DEFEATED, OUTCOME_CLEARED, OUTCOME_ABANDONED
+from game.horde import HordeWaveGenerator, SpawnStream
+from game.replay import Replay
+from utils.clock import SimulationClock
+from utils.flow_field import FlowField
+from utils.profiler import get_profiler
+from utils.rng import RandomStreams, SEED_RANGE
+import random
+import numpy as np
+
+# Fixed simulation step. One tick matches one frame of the original 60 FPS
+# loop, so per-frame movement and attack timings keep their tuning.
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+
+class Simulation:
+    """Headless battle engine that advances the game at a fixed tick.
+
+    Owns the player, the current wave of enemies, the combat system and wave
+    spawning. Nothing here touches the display, fonts or a frame cap, so a
+    battle can be stepped as fast as the CPU allows.
+
+    With use_enemy_store the wave lives in an array-backed EnemyStore instead
+    of a list of Enemy objects, for waves too large to update one by one.
+
+    Every system reads time from one SimulationClock, advanced once per
+    step, so pass a clock in to share it (e.g. with the game's UI).
+
+    With a HordeWaveGenerator the run is endless horde mode: waves grow with
+    the wave number and difficulty, and each is streamed in over a few ticks.
+
+    With chase, enemies close in on the player
+    along a shared FlowField instead of holding their spawn positions, and
+    stop once the player is within their attack range.
+
+    Randomness comes from per-subsystem RandomStreams. Each run gets its own
+    seed, drawn from the simulation's seed unless one is given, and is
+    recorded as a Replay of its commands and state changes.
+    """
+
+    def __init__(self, width: int, height: int, progression: ProgressionSystem,
+                 use_enemy_store: bool = False, clock: Optional[SimulationClock] = None,
+                 seed: Optional[int] = None, horde: Optional[HordeWaveGenerator] = None,
+                 chase: bool = False):
+        self.width = width
+        self.height = height
+        self.progression = progression
+        self.clock = clock if clock is not None else SimulationClock(TICK_RATE)
+        self.combat = CombatSystem(width, height, self.clock)
+        self.enemy_pool = self.combat.enemy_pool
+        self.profiler = get_profiler()
+
+        self.player: Optional[Player] = None
+        self.enemies: List[Enemy] = []
+        self.enemy_store = EnemyStore(width, height) if use_enemy_store else None
+        self.projectiles = ProjectilePool(width, height)
+        if self.enemy_store is not None:
+            self.enemy_store.projectile_pool = self.projectiles
+        self.current_wave = 0
+        self.waves_cleared = 0
+        
+        # Endless horde mode; the difficulty is fixed when a run starts
+        self.horde = horde
+        self.difficulty = 1.0
+        self.spawn_stream: Optional[SpawnStream] = None
+        
+        # Enemies chasing the player all steer by one field towards it
+        self.flow_field = FlowField(width, height) if chase else None
+
+        # Simulation state: 'idle', 'playing', 'battle', 'defeated'
+        self.state = 'idle'
+
+        # Seeds for successive runs come from one master stream
+        self.seed = seed if seed is not None else random.randrange(SEED_RANGE)
+        self._run_seeds = random.Random(self.seed)
+        self._use_streams(RandomStreams(self.seed))
+        self.replay: Optional[Replay] = None
+        self.run_start_tick = 0
+
+    @property
+    def tick(self) -> int:
+        """Ticks stepped so far."""
+        return self.clock.tick
+
+    @property
+    def time(self) -> float:
+        """Simulated seconds since the simulation was created."""
+        return self.clock.now
+
+    @property
+    def battle_time(self) -> float:
+        """Simulated seconds since the current battle started."""
+        return self.combat.battle_time
+
+    @property
+    def run_tick(self) -> int:
+        """Ticks since the current run started."""
+        return self.tick - self.run_start_tick
+
+    def _use_streams(self, streams: RandomStreams) -> None:
+        """Hand every subsystem its random stream."""
+        self.rng = streams
+        self.spawn_rng = streams.stream('spawn')
+        self.combat.rng = streams.stream('combat')
+        self.combat.loot.rng = streams.stream('loot')
+        if self.player is not None:
+            self.player.rng = streams.stream('player')
+
+    def start_run(self, character_class: str, seed: Optional[int] = None,
+                  difficulty: Optional[float] = None) -> None:
+        """Start a new run with a fresh player and the first wave.
+
+        difficulty defaults to the progression system's multiplier for the run.
+        """
+        if seed is None:
+            seed = self._run_seeds.randrange(SEED_RANGE)
+        self.progression.start_new_run(character_class)
+        self.difficulty = difficulty if difficulty is not None else self.progression.get_difficulty_multiplier()
+        self.player = Player(self.width // 2, self.height // 2, character_class, self.progression,
+                             clock=self.clock)
+        self.player.projectile_pool = self.projectiles
+        self._use_streams(RandomStreams(seed))
+        self.projectiles.clear()
+        self.current_wave = 0
+        self.waves_cleared = 0
+
+        # Record the run from here on
+        self.run_start_tick = self.tick
+        self.replay = Replay(
+            seed=seed,
+            character_class=character_class,
+            meta_upgrades={upgrade.value: level for upgrade, level in self.progression.meta_upgrades.items()},
+            width=self.width,
+            height=self.height,
+            use_enemy_store=self.enemy_store is not None,
+            horde=self.horde is not None,
+            chase=self.flow_field is not None,
+            difficulty=self.difficulty
+        )
+
+        self.spawn_wave()
+        self._begin_battle()
+
+    def start_battle(self) -> None:
+        """Start fighting the current wave."""
+        if self.replay is not None:
+            self.replay.inputs.append((self.run_tick, 'start_battle'))
+        self._begin_battle()
+
+    def _begin_battle(self) -> None:
+        self.combat.start_battle(self.player, self.enemies, wave=self.current_wave,
+                                 store=self.enemy_store)
+        self._set_state('battle')
+
+    def _set_state(self, state: str) -> None:
+        """Change state and record the transition in the replay."""
+        self.state = state
+        if self.replay is not None:
+            self.replay.transitions.append((self.run_tick, state))
+
+    def spawn_wave(self) -> None:
+        """Spawn new enemies for the next wave."""
+        self.current_wave += 1
+        # Survivors of an abandoned wave go back to the pool; kills already did
+        self.enemy_pool.release_all(self.enemies)
+        self.enemies = []
+        num_enemies = 3
+
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
+
+        if self.horde is not None:
+            plan = self.horde.plan(self.current_wave, self.spawn_rng, (self.player.x, self.player.y),
+                                   self.width, self.height, self.difficulty)
+            self.spawn_stream = SpawnStream(plan)
+            self._stream_spawns()
+            return
+
+        # Determine enemy types based on wave number
+        enemy_types = get_archetypes().enemy_types_for_wave(self.current_wave)
+
+        for _ in range(num_enemies):
+            x = self.spawn_rng.randint(100, self.width - 100)
+            y = self.spawn_rng.randint(100, self.height - 100)
+            enemy_type = self.spawn_rng.choice(enemy_types)
+            if self.enemy_store is not None:
+                self.enemy_store.spawn(x, y, enemy_type)
+            else:
+                enemy = self.enemy_pool.acquire(x, y, enemy_type)
+                enemy.projectile_pool = self.projectiles
+                self.enemies.append(enemy)
+
+    def _stream_spawns(self) -> None:
+        """Spawn this tick's slice of a horde wave."""
+        stream = self.spawn_stream
+        plan = stream.plan
+        batch = stream.next_batch()
+        spawned = []
+        if self.enemy_store is not None:
+            self.enemy_store.spawn_many(plan.x[batch], plan.y[batch], plan.type_codes[batch],
+                                        plan.hp_scale, plan.attack_scale)
+        else:
+            for x, y, code in zip(plan.x[batch].tolist(), plan.y[batch].tolist(),
+                                  plan.type_codes[batch].tolist()):
+                enemy = self.enemy_pool.acquire(x, y, ENEMY_TYPES[code])
+                plan.scale(enemy.stats)
+                enemy.projectile_pool = self.projectiles
+                spawned.append(enemy)
+            self.enemies.extend(spawned)
+        self.combat.add_reinforcements(spawned, stream.remaining)
+        if not stream.remaining:
+            self.spawn_stream = None
+
+    def finish_run(self, outcome: int) -> None:
+        """Close the run in the progression system's history."""
+        self.progression.finish_run(self.waves_cleared, self.player.level, outcome)
+
+    def abandon_run(self) -> None:
+        """Give up on a run still in progress, e.g. when the game quits."""
+        if self.player is not None and self.state in ('playing', 'battle'):
+            self.finish_run(OUTCOME_ABANDONED)
+            self._set_state('idle')
+
+    def drawable_enemies(self) -> List[Enemy]:
+        """Enemies (or views onto stored enemies) to draw this frame."""
+        if self.enemy_store is not None:
+            return self.enemy_store.views()
+        return self.enemies
+
+    def step(self) -> List[str]:
+        """Advance the simulation by one tick. Returns new battle log entries."""
+        self.clock.advance()
+        log_entries = []
+        if self.player is None or self.state == 'idle':
+            return log_entries
+
+        profiler = self.profiler
+        if self.spawn_stream is not None and self.state != 'defeated':
+            with profiler.section('spawn'):
+                self._stream_spawns()
+
+        with profiler.section('entities'):
+            self._update_entities()
+
+        if self.state == 'battle' and self.combat.is_battle_active():
+            # Projectile hits first, so kills are reaped before anyone picks a target
+            with profiler.section('projectiles'):
+                log_entries.extend(self.combat.process_projectiles(self.player, self.projectiles, self.enemy_store))
+                if self.enemy_store is None and self.combat.is_battle_active():
+                    log_entries.extend(self.combat.collect_defeated(self.player))
+
+        if self.state == 'battle' and self.combat.is_battle_active():
+            with profiler.section('process_turn'):
+                self._update_player_target()
+                if self.enemy_store is not None:
+                    log_entries.extend(self.combat.process_store_turn(self.player, self.enemy_store))
+                else:
+                    log_entries.extend(self.combat.process_turn(self.player, self.enemies))
+
+        if self.state == 'battle' and not self.combat.is_battle_active():
+            self._end_battle()
+
+        return log_entries
+
+    def run_battle(self, max_ticks: int = 60 * TICK_RATE) -> List[str]:
+        """Step until the current battle ends or max_ticks have elapsed."""
+        log_entries = []
+        for _ in range(max_ticks):
+            if self.state != 'battle':
+                break
+            log_entries.extend(self.step())
+        return log_entries
+
+    def run_headless(self, character_class: str, max_waves: int = 50,
+                     max_battle_ticks: int = 60 * TICK_RATE) -> Dict[str, Any]:
+        """Play a complete run without any input and return its totals.
+
+        The run ends when the player dies, when max_waves have been cleared or
+        when a single battle exceeds max_battle_ticks (a stalemate).
+        """
+        self.start_run(character_class)
+        total_exp = 0
+        total_gold = 0
+        start_tick = self.tick
+
+        while True:
+            self.run_battle(max_battle_ticks)
+            total_exp += self.combat.exp_gained
+            total_gold += self.combat.gold_earned
+            if self.state != 'playing' or self.waves_cleared >= max_waves:
+                break
+            self.start_battle()
+
+        if self.state != 'defeated':
+            self.finish_run(OUTCOME_CLEARED if self.waves_cleared >= max_waves else OUTCOME_ABANDONED)
+
+        return {
+            'waves_survived': self.waves_cleared,
+            'exp_gained': total_exp,
+            'gold_earned': total_gold,
+            'level': self.player.level,
+            'duration': (self.tick - start_tick) * TICK_DT,
+            'defeated': self.state == 'defeated'
+        }
+
+    def _update_entities(self) -> None:
+        """Move all entities and wrap them around the screen edges."""
+        self.player.update()
+        self.player.x = self.player.x % self.width
+        self.player.y = self.player.y % self.height
+        self.projectiles.update()
+        if self.flow_field is not None:
+            self._steer_enemies()
+
+        if self.enemy_store is not None:
+            self.enemy_store.update()
+            return
+
+        spatial_index = self.combat.spatial_index
+        for enemy in self.enemies:
+            enemy.update()
+            enemy.x = enemy.x % self.width
+            enemy.y = enemy.y % self.height
+            spatial_index.insert(enemy, enemy.x, enemy.y)
+
+    def _steer_enemies(self) -> None:
+        """Point every enemy one flow-field step towards the player, or hold
+        position once the player is in its attack range."""
+        player = self.player
+        field = self.flow_field
+        field.update(player.x, player.y)
+
+        store = self.enemy_store
+        if store is not None:
+            n = store.count
+            target_x, target_y = field.waypoints(store.x[:n], store.y[:n])
+            holding = store.in_range(player.x, player.y)
+            store.target_x[:n] = np.where(holding, store.x[:n], target_x)
+            store.target_y[:n] = np.where(holding, store.y[:n], target_y)
+            return
+
+        distance = self.combat.spatial_index.distance
+        waypoint = field.waypoint
+        for enemy in self.enemies:
+            x, y = enemy.x, enemy.y
+            if distance(x, y, player.x, player.y) <= enemy.attack_range:
+                enemy.set_target(x, y)
+            else:
+                enemy.set_target(*waypoint(x, y))
+
+    def _update_player_target(self) -> None:
+        """Walk the player towards the nearest enemy until it is in range."""
+        if self.enemy_store is not None:
+            nearest_index = self.enemy_store.nearest(self.player.x, self.player.y)
+            nearest_enemy = self.enemy_store.view(nearest_index) if nearest_index >= 0 else None
+        else:
+            nearest_enemy, _ = self.combat.nearest_enemy(self.player.x, self.player.y)
+        if nearest_enemy is None:
+            return
+
+        # Head the short way round the screen wrap
+        dx, dy = self.combat.spatial_index.offset(self.player.x, self.player.y,
+                                                  nearest_enemy.x, nearest_enemy.y)
+        distance = (dx**2 + dy**2)**0.5
+
+        # If we're close enough to attack, stop moving and let combat resolve it
+        if distance <= self.player.attack_range:
+            self.player.set_target(self.player.x, self.player.y)
+        else:
+            self.player.set_target(self.player.x + dx, self.player.y + dy)
+
+    def _end_battle(self) -> None:
+        """Record the battle result and either queue the next wave or end the run."""
+        battle_stats = self.combat.get_battle_stats()
+        self.progression.end_run(
+            enemies_defeated=battle_stats['enemies_defeated'],
+            experience_gained=battle_stats['exp_gained'],
+            gold_earned=battle_stats['gold_earned'],
+            duration=battle_stats['duration']
+        )
+
+        if self.player.stats.hp <= 0:
+            self._set_state('defeated')
+            self.finish_run(OUTCOME_DEFEATED)
+        else:
+            self.waves_cleared += 1
+            self._set_state('playing')
+            self.spawn_wave()
@@ -1,8 +1,7 @@
 import pygame
+import os
 import sys
 from pathlib import Path
-import random
-import time
 
 # Initialize Pygame
 pygame.init()
@@ -11,7 +10,7 @@ pygame.init()
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 FPS = 60
-COUNTDOWN_TIME = 5  # seconds between rounds
+COUNTDOWN_TIME = 5  # simulated seconds between rounds
 
 # Colors
 BLACK = (0, 0, 0)
@@ -21,14 +20,22 @@ GOLD = (255, 215, 0)  # Color for gold text
 
 # Import our game components
 from game.world import World
+from game.simulation import Simulation, TICK_RATE
+from game.horde import HordeWaveGenerator
+from game.layers import LayerCompositor
+from game.dirty_rects import DirtyRectTracker
+from game.list_view import VirtualList
 from entities.player import Player
-from entities.enemy import Enemy
-from systems.combat import CombatSystem
 from systems.gear import GearSlot
 from systems.progression import ProgressionSystem, MetaUpgradeType
+from utils.clock import SimulationClock
+from utils.profiler import get_profiler
+from utils.text import get_text_renderer
 
 class Game:
-    def __init__(self):
+    def __init__(self, use_enemy_store: bool = False, use_dirty_rects: bool = False,
+                 replay_dir: str = None, profile: bool = False, horde: bool = False,
+                 chase: bool = False):
         self.screen_width = 800
         self.screen_height = 600
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
@@ -40,32 +47,67 @@ class Game:
         self.state = 'character_select'  # 'character_select', 'playing', 'battle', 'countdown', 'rewards', 'inventory', 'meta_upgrades'
         self.selected_class = 'warrior'
         self.inventory_page = 0  # 0: skills, 1: passives, 2: gear
-        self.current_wave = 0  # Track current wave number
         
-        # Initialize game world and entities
+        # Initialize game world
         self.world = World(self.screen_width, self.screen_height)  # Fixed screen size
-        self.player = None
-        self.enemies = []
         
-        # Combat system
-        self.combat = CombatSystem(self.screen_width, self.screen_height)
+        # Cached background, overlay and static UI layers
+        self.layers = LayerCompositor()
+        
+        # Optionally present only the regions that changed each frame
+        self.dirty_rects = DirtyRectTracker(self.screen_width, self.screen_height) if use_dirty_rects else None
+        self._presented_screen = None
         
         # Progression system
         self.progression = ProgressionSystem()
         
-        # Font for text
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        # Simulated time shared by the simulation and the UI; P pauses,
+        # N steps one tick while paused and F cycles fast-forward speeds
+        self.sim_clock = SimulationClock(TICK_RATE)
+        
+        # Headless simulation owns the player, enemies, combat and waves
+        self.simulation = Simulation(self.screen_width, self.screen_height, self.progression,
+                                     use_enemy_store=use_enemy_store, clock=self.sim_clock,
+                                     horde=HordeWaveGenerator() if horde else None,
+                                     chase=chase)
+        
+        # Frame timing; F3 shows the overlay, F4 exports a Chrome trace
+        self.profiler = get_profiler()
+        self.profile = profile
+        if profile:
+            self.profiler.enable()
+        self.show_profiler = False
+        self.trace_path = 'trace.json'
+        
+        # Where to save a replay of every run, if anywhere
+        self.replay_dir = replay_dir
+        self._replay_saved = True
+        
+        # Fonts for text; renders are cached, so static lines aren't re-rasterized every frame
+        self.text = get_text_renderer()
+        self.font = self.text.cached_font(36)
+        self.small_font = self.text.cached_font(24)
+        
+        # Scrolling lists for the inventory pages; only rows in view are
+        # drawn, and each row is rendered once until its item changes
+        content_bottom = self.screen_height - 100
+        self.skill_list = VirtualList(pygame.Rect(20, 60, self.screen_width - 40, content_bottom - 60),
+                                      100, self._draw_skill_row,
+                                      row_key=lambda skill: (skill.name, skill.cooldown))
+        self.passive_list = VirtualList(pygame.Rect(20, 60, self.screen_width - 40, content_bottom - 60),
+                                        80, self._draw_passive_row,
+                                        row_key=lambda passive: (passive.name, passive.description))
+        self.gear_list = VirtualList(pygame.Rect(20, 360, self.screen_width - 40, content_bottom - 360),
+                                     45, self._draw_gear_row, row_key=self._gear_row_key)
         
         # Battle log
         self.battle_log = []
         self.max_log_entries = 5
         
         # Create preview player
-        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression)
+        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression, clock=self.sim_clock)
         
-        # Game time and countdown
-        self.start_time = time.time()
+        # Countdown between rounds, from a simulation tick
         self.countdown_start = 0
         self.countdown_remaining = COUNTDOWN_TIME
         
@@ -73,41 +115,33 @@ class Game:
         self.selected_upgrade = 0
         self.upgrade_keys = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5]
         
+    @property
+    def player(self):
+        return self.simulation.player
+    
+    @property
+    def enemies(self):
+        return self.simulation.drawable_enemies()
+    
+    @property
+    def combat(self):
+        return self.simulation.combat
+        
     def start_game(self):
-        # Create player at center
-        self.player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression)
-        
-        # Create some enemies
-        self.enemies = []
-        num_enemies = 3
-        enemy_types = ['basic']
-        if self.current_wave >= 2:
-            enemy_types.append('ranged')
-        if self.current_wave >= 4:
-            enemy_types.append('tank')
-            
-        for _ in range(num_enemies):
-            x = random.randint(100, self.screen_width - 100)
-            y = random.randint(100, self.screen_height - 100)
-            enemy_type = random.choice(enemy_types)
-            enemy = Enemy(x, y, enemy_type)
-            self.enemies.append(enemy)
-            
-        # Start battle
-        self.combat.start_battle(self.player, self.enemies)
+        # Start a new run with the first wave and go straight into battle
+        self.simulation.start_run(self.selected_class)
         self.state = 'battle'
         self.battle_log = []
-        self.start_time = time.time()
+        self._replay_saved = False
 
     def start_battle(self):
         self.state = 'battle'
-        self.combat.start_battle(self.player, self.enemies)
+        self.simulation.start_battle()
         self.battle_log = []
-        self.start_time = time.time()
 
     def start_countdown(self):
         self.state = 'countdown'
-        self.countdown_start = time.time()
+        self.countdown_start = self.sim_clock.tick
         self.countdown_remaining = COUNTDOWN_TIME
 
     def handle_events(self):
@@ -115,7 +149,20 @@ class Game:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+                # Any key can change static text (gold, selection), so redraw it all
+                if self.dirty_rects is not None:
+                    self.dirty_rects.invalidate()
+                if event.key == pygame.K_p:
+                    self.sim_clock.toggle_pause()
+                elif event.key == pygame.K_n:
+                    self.sim_clock.step()
+                elif event.key == pygame.K_f:
+                    self.sim_clock.cycle_speed()
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler_overlay()
+                elif event.key == pygame.K_F4:
+                    self.profiler.export_chrome_trace(self.trace_path)
+                elif event.key == pygame.K_ESCAPE:
                     if self.state == 'inventory':
                         self.state = 'playing'
                     elif self.state == 'meta_upgrades':
@@ -125,17 +172,16 @@ class Game:
                 elif self.state == 'character_select':
                     if event.key == pygame.K_1:
                         self.selected_class = 'warrior'
-                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression)
+                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression, clock=self.sim_clock)
                     elif event.key == pygame.K_2:
                         self.selected_class = 'rogue'
-                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression)
+                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression, clock=self.sim_clock)
                     elif event.key == pygame.K_3:
                         self.selected_class = 'mage'
-                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression)
+                        self.preview_player = Player(self.screen_width // 2, self.screen_height // 2, self.selected_class, self.progression, clock=self.sim_clock)
                     elif event.key == pygame.K_m:
                         self.state = 'meta_upgrades'
                     elif event.key == pygame.K_RETURN:
-                        self.progression.start_new_run(self.selected_class)
                         self.start_game()
                 elif self.state == 'meta_upgrades':
                     if event.key in self.upgrade_keys:
@@ -148,7 +194,6 @@ class Game:
                                 pass
                     elif event.key == pygame.K_RETURN:
                         # Start new run after viewing meta-upgrades
-                        self.progression.start_new_run(self.selected_class)
                         self.start_game()
                 elif self.state == 'playing':
                     if event.key == pygame.K_SPACE:
@@ -170,207 +215,217 @@ class Game:
                         self.inventory_page = 2
                     elif event.key == pygame.K_SPACE:
                         self.state = 'playing'
+                    elif event.key == pygame.K_UP:
+                        self._inventory_list().scroll_by(-1)
+                    elif event.key == pygame.K_DOWN:
+                        self._inventory_list().scroll_by(1)
+                    elif event.key == pygame.K_PAGEUP:
+                        self._inventory_list().scroll_by(-self._inventory_list().page_rows)
+                    elif event.key == pygame.K_PAGEDOWN:
+                        self._inventory_list().scroll_by(self._inventory_list().page_rows)
+            elif event.type == pygame.MOUSEWHEEL and self.state == 'inventory':
+                self._inventory_list().scroll_by(-event.y)
 
     def update(self):
         if self.state in ['playing', 'battle', 'rewards']:
-            # Update entities
-            self.player.update()
-            
-            # Handle screen wrapping for player
-            self.player.x = self.player.x % self.screen_width
-            self.player.y = self.player.y % self.screen_height
+            # Advance the simulation by one fixed tick
+            was_in_battle = self.simulation.state == 'battle'
+            new_log_entries = self.simulation.step()
+            self.battle_log.extend(new_log_entries)
+            # Keep only the last few entries
+            self.battle_log = self.battle_log[-self.max_log_entries:]
             
-            # Update enemies and remove dead ones
-            for enemy in self.enemies[:]:  # Use slice copy to avoid modification during iteration
-                enemy.update()
-                # Handle screen wrapping for enemies
-                enemy.x = enemy.x % self.screen_width
-                enemy.y = enemy.y % self.screen_height
-                
-                # Remove dead enemies
-                if enemy.stats.hp <= 0:
-                    self.enemies.remove(enemy)
-            
-            # Check if all enemies are defeated
-            if not self.enemies and self.state == 'battle':
-                # Get battle stats
-                battle_stats = self.combat.get_battle_stats()
-                
-                # End current run and save rewards
-                self.progression.end_run(
-                    enemies_defeated=battle_stats['enemies_defeated'],
-                    experience_gained=battle_stats['exp_gained'],
-                    gold_earned=battle_stats['gold_earned'],
-                    duration=battle_stats['duration']
-                )
-                
-                # Start next wave
-                self.state = 'playing'
-                self.spawn_enemies()
-                self.battle_log = []  # Clear battle log for next wave
-                self.start_time = time.time()
-                
-            # Move player towards nearest enemy if in battle
-            if self.state == 'battle' and self.combat.is_battle_active():
-                if self.enemies:  # Only proceed if there are enemies
-                    nearest_enemy = min(self.enemies, 
-                                     key=lambda e: ((e.x - self.player.x)**2 + 
-                                                  (e.y - self.player.y)**2)**0.5)
-                    
-                    # Calculate distance to nearest enemy
-                    dx = nearest_enemy.x - self.player.x
-                    dy = nearest_enemy.y - self.player.y
-                    distance = (dx**2 + dy**2)**0.5
-                    
-                    # If we're close enough to attack, stop moving and attack
-                    if distance <= self.player.attack_range:
-                        self.player.set_target(self.player.x, self.player.y)
-                        self.player.attack(nearest_enemy)  # Attack when in range
-                    else:
-                        self.player.set_target(nearest_enemy.x, nearest_enemy.y)
-                        
-                    # Process combat turns
-                    current_time = time.time() - self.start_time
-                    new_log_entries = self.combat.process_turn(self.player, self.enemies, current_time)
-                    self.battle_log.extend(new_log_entries)
-                    # Keep only the last few entries
-                    self.battle_log = self.battle_log[-self.max_log_entries:]
-                    
-                    # Check if battle is over
-                    if not self.combat.is_battle_active():
-                        # Get battle stats
-                        battle_stats = self.combat.get_battle_stats()
-                        
-                        # End current run and save rewards
-                        self.progression.end_run(
-                            enemies_defeated=battle_stats['enemies_defeated'],
-                            experience_gained=battle_stats['exp_gained'],
-                            gold_earned=battle_stats['gold_earned'],
-                            duration=battle_stats['duration']
-                        )
-                        
-                        # Check if player died
-                        if self.player.stats.hp <= 0:
-                            self.state = 'rewards'
-                        else:
-                            # Start next wave
-                            self.state = 'playing'
-                            self.spawn_enemies()
-                            self.battle_log = []  # Clear battle log for next wave
-                            self.start_time = time.time()
+            # Check if battle is over
+            if was_in_battle and self.simulation.state != 'battle':
+                if self.simulation.state == 'defeated':
+                    self.state = 'rewards'
+                    self.save_replay()
+                else:
+                    # Next wave has been spawned, wait for the player
+                    self.state = 'playing'
+                    self.battle_log = []  # Clear battle log for next wave
         elif self.state == 'countdown':
-            # Update countdown
-            current_time = time.time()
-            self.countdown_remaining = max(0, COUNTDOWN_TIME - (current_time - self.countdown_start))
+            # Update countdown; the simulation is idle, so the clock is advanced here
+            self.sim_clock.advance()
+            elapsed = self.sim_clock.seconds_since(self.countdown_start)
+            self.countdown_remaining = max(0, COUNTDOWN_TIME - elapsed)
             
             if self.countdown_remaining <= 0:
                 # Start next round
                 self.state = 'playing'
-                self.spawn_enemies()
+                self.simulation.spawn_wave()
         else:
             # Update preview player
             self.preview_player.update()
 
     def render(self):
-        self.screen.fill(BLACK)
+        # Areas that can change from frame to frame, for dirty-rect presenting
+        drawn = []
         
-        # Draw the world
-        self.world.draw(self.screen)
+        # Draw the world from its cached background layer
+        self.layers.blit(self.screen, 'background', self._build_background)
         
         if self.state == 'character_select':
             # Draw preview player
-            self.preview_player.draw(self.screen, self.world)
-            
-            # Draw semi-transparent overlay
-            overlay = pygame.Surface((self.screen_width, self.screen_height))
-            overlay.fill(BLACK)
-            overlay.set_alpha(64)  # Less dim overlay
-            self.screen.blit(overlay, (0, 0))
+            drawn.append(self.preview_player.draw(self.screen, self.world))
             
-            # Draw character selection UI
-            title = self.font.render("Select Your Character", True, WHITE)
-            warrior = self.font.render("1 - Warrior (High HP, Balanced)", True, WHITE)
-            rogue = self.font.render("2 - Rogue (High Speed, High Damage)", True, WHITE)
-            mage = self.font.render("3 - Mage (High Damage, Low HP)", True, WHITE)
-            start = self.font.render("Press ENTER to Start", True, WHITE)
-            meta = self.font.render("Press M for Meta-Upgrades", True, GOLD)
-            
-            self.screen.blit(title, (self.screen_width//2 - title.get_width()//2, 100))
-            self.screen.blit(warrior, (self.screen_width//2 - warrior.get_width()//2, 200))
-            self.screen.blit(rogue, (self.screen_width//2 - rogue.get_width()//2, 250))
-            self.screen.blit(mage, (self.screen_width//2 - mage.get_width()//2, 300))
-            self.screen.blit(start, (self.screen_width//2 - start.get_width()//2, 400))
-            self.screen.blit(meta, (self.screen_width//2 - meta.get_width()//2, 450))
+            # Draw semi-transparent overlay and character selection UI
+            self._blit_overlay()
+            self.layers.blit(self.screen, 'character_select', self._build_character_select_ui,
+                             transparent=True)
         elif self.state == 'meta_upgrades':
             self._render_meta_upgrades()
         else:
             # Draw game entities
-            self.player.draw(self.screen, self.world)
+            drawn.append(self.player.draw(self.screen, self.world))
             for enemy in self.enemies:
-                enemy.draw(self.screen, self.world)
+                drawn.append(enemy.draw(self.screen, self.world))
+            drawn.extend(self.simulation.projectiles.draw(self.screen, self.world))
             
             # Draw battle UI
             if self.state == 'battle' and self.combat.is_battle_active():
-                # Draw semi-transparent overlay
-                overlay = pygame.Surface((self.screen_width, self.screen_height))
-                overlay.fill(BLACK)
-                overlay.set_alpha(64)  # Less dim overlay
-                self.screen.blit(overlay, (0, 0))
+                self._blit_overlay()
+                self.layers.blit(self.screen, 'battle', self._build_battle_ui, transparent=True)
                 
                 # Draw battle log
                 y = self.screen_height - 200
+                drawn.append(pygame.Rect(0, y, self.screen_width, 20 * 5))
                 for entry in self.battle_log[-5:]:  # Show last 5 entries
                     text = self.small_font.render(entry, True, WHITE)
                     self.screen.blit(text, (10, y))
                     y += 20
-                
-                # Draw instructions
-                text = self.small_font.render("Press SPACE to continue", True, WHITE)
-                self.screen.blit(text, (10, self.screen_height - 50))
             elif self.state == 'inventory':
                 self._render_inventory()
+                # Page content (e.g. cooldown bars) sits between the tabs and instructions
+                drawn.append(pygame.Rect(0, 50, self.screen_width, self.screen_height - 150))
             elif self.state == 'rewards':
-                # Draw semi-transparent overlay
-                overlay = pygame.Surface((self.screen_width, self.screen_height))
-                overlay.fill(BLACK)
-                overlay.set_alpha(64)  # Less dim overlay
-                self.screen.blit(overlay, (0, 0))
-                
-                # Draw rewards text
-                text = self.font.render("Battle Complete!", True, WHITE)
-                self.screen.blit(text, (self.screen_width//2 - text.get_width()//2, 100))
+                self._blit_overlay()
+                self.layers.blit(self.screen, 'rewards', self._build_rewards_ui, transparent=True)
                 
                 # Draw experience gained
                 battle_stats = self.combat.get_battle_stats()
                 exp_gained = battle_stats.get('exp_gained', 0)
                 exp_text = self.font.render(f"Experience Gained: {exp_gained}", True, WHITE)
-                self.screen.blit(exp_text, (self.screen_width//2 - exp_text.get_width()//2, 200))
+                drawn.append(self.screen.blit(exp_text, (self.screen_width//2 - exp_text.get_width()//2, 200)))
                 
                 # Draw gold earned
                 gold_earned = battle_stats.get('gold_earned', 0)
                 gold_text = self.font.render(f"Gold Earned: {gold_earned}", True, GOLD)
-                self.screen.blit(gold_text, (self.screen_width//2 - gold_text.get_width()//2, 250))
+                drawn.append(self.screen.blit(gold_text, (self.screen_width//2 - gold_text.get_width()//2, 250)))
                 
-                # Draw instructions
-                text = self.small_font.render("Press SPACE to view Meta-Upgrades", True, WHITE)
-                self.screen.blit(text, (self.screen_width//2 - text.get_width()//2, self.screen_height - 50))
+                # Draw gear found
+                items_found = battle_stats.get('items_found', 0)
+                if items_found:
+                    items_text = self.font.render(f"Items Found: {items_found}", True, WHITE)
+                    drawn.append(self.screen.blit(items_text, (self.screen_width//2 - items_text.get_width()//2, 300)))
+        
+        # Show when time isn't running normally
+        if self.sim_clock.paused or self.sim_clock.speed != 1:
+            label = "PAUSED" if self.sim_clock.paused else f"x{self.sim_clock.speed}"
+            text = self.small_font.render(label, True, GOLD)
+            drawn.append(self.screen.blit(text, (self.screen_width - text.get_width() - 10, 10)))
+        
+        if self.show_profiler:
+            drawn.extend(self._render_profiler_overlay())
+        
+        self._present(drawn)
+    
+    def toggle_profiler_overlay(self):
+        """Show or hide frame timings; the profiler only runs while needed."""
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler:
+            self.profiler.enable()
+        elif not self.profile:
+            self.profiler.disable()
+    
+    def _render_profiler_overlay(self):
+        """Draw frame time percentiles and entity counts; returns the rects drawn."""
+        p50, p95, p99 = self.profiler.percentiles()
+        lines = [f"frame p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms"]
+        for name in ('update', 'process_turn', 'entities', 'render', 'flip'):
+            s50, s95, s99 = self.profiler.percentiles(name=name)
+            lines.append(f"{name} p50 {s50:.2f}  p95 {s95:.2f}  p99 {s99:.2f}")
+        lines.append(f"enemies {len(self.enemies)}  projectiles {len(self.simulation.projectiles)}"
+                     f"  enemy pool hits {self.simulation.enemy_pool.hit_rate:.0%}")
+        
+        # Values change every frame, so skip the text cache
+        font = self.text.font(20)
+        drawn = []
+        y = self.screen_height - 20 * len(lines) - 10
+        for line in lines:
+            text = font.render(line, True, GOLD)
+            drawn.append(self.screen.blit(text, (self.screen_width - text.get_width() - 10, y)))
+            y += 20
+        return drawn
+    
+    def save_replay(self):
+        """Write the current run's replay, once, if recording is on."""
+        replay = self.simulation.replay
+        if self.replay_dir is None or replay is None or self._replay_saved:
+            return
+        os.makedirs(self.replay_dir, exist_ok=True)
+        replay.save(os.path.join(self.replay_dir, f"replay-{replay.seed}.json"))
+        self._replay_saved = True
+    
+    def _present(self, drawn):
+        """Flip the display, or with dirty rects on, update just what changed."""
+        with self.profiler.section('flip'):
+            if self.dirty_rects is None:
+                pygame.display.flip()
+                return
+            
+            # A different screen means different static layers underneath
+            screen_key = (self.state, self.inventory_page, self.combat.is_battle_active())
+            if screen_key != self._presented_screen:
+                self._presented_screen = screen_key
+                self.dirty_rects.invalidate()
+            self.dirty_rects.add_all(drawn)
+            self.dirty_rects.present()
+    
+    def _blit_overlay(self):
+        """Dim everything drawn so far with the cached semi-transparent overlay."""
+        self.layers.blit(self.screen, 'overlay', lambda surface: surface.fill(BLACK),
+                         alpha=64)  # Less dim overlay
+    
+    def _build_background(self, surface):
+        """Draw the static world background onto a layer."""
+        surface.fill(BLACK)
+        self.world.draw(surface)
+    
+    def _build_character_select_ui(self, surface):
+        """Draw the character selection text onto a layer."""
+        lines = [
+            ("Select Your Character", WHITE, 100),
+            ("1 - Warrior (High HP, Balanced)", WHITE, 200),
+            ("2 - Rogue (High Speed, High Damage)", WHITE, 250),
+            ("3 - Mage (High Damage, Low HP)", WHITE, 300),
+            ("Press ENTER to Start", WHITE, 400),
+            ("Press M for Meta-Upgrades", GOLD, 450)
+        ]
+        for line, color, y in lines:
+            text = self.font.render(line, True, color)
+            surface.blit(text, (self.screen_width//2 - text.get_width()//2, y))
+    
+    def _build_battle_ui(self, surface):
+        """Draw the static battle instructions onto a layer."""
+        text = self.small_font.render("Press SPACE to continue", True, WHITE)
+        surface.blit(text, (10, self.screen_height - 50))
+    
+    def _build_rewards_ui(self, surface):
+        """Draw the static rewards screen text onto a layer."""
+        text = self.font.render("Battle Complete!", True, WHITE)
+        surface.blit(text, (self.screen_width//2 - text.get_width()//2, 100))
         
-        pygame.display.flip()
+        text = self.small_font.render("Press SPACE to view Meta-Upgrades", True, WHITE)
+        surface.blit(text, (self.screen_width//2 - text.get_width()//2, self.screen_height - 50))
 
     def _render_inventory(self):
         """Render the inventory UI with skills, passives, and gear."""
-        # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.fill(BLACK)
-        overlay.set_alpha(64)  # Less dim overlay
-        self.screen.blit(overlay, (0, 0))
+        self._blit_overlay()
         
-        # Draw inventory tabs
-        tabs = ['Skills', 'Passives', 'Gear']
-        for i, tab in enumerate(tabs):
-            color = WHITE if i == self.inventory_page else (128, 128, 128)
-            text = self.font.render(f"{i+1} - {tab}", True, color)
-            self.screen.blit(text, (10 + i * 200, 10))
+        # Tabs and instructions only change with the selected page
+        self.layers.blit(self.screen, 'inventory', self._build_inventory_ui,
+                         key=self.inventory_page, transparent=True)
         
         # Draw content based on current page
         if self.inventory_page == 0:
@@ -379,49 +434,58 @@ class Game:
             self._render_passives()
         else:
             self._render_gear()
+    
+    def _build_inventory_ui(self, surface):
+        """Draw the inventory tabs and instructions onto a layer."""
+        # Draw inventory tabs
+        tabs = ['Skills', 'Passives', 'Gear']
+        for i, tab in enumerate(tabs):
+            color = WHITE if i == self.inventory_page else (128, 128, 128)
+            text = self.font.render(f"{i+1} - {tab}", True, color)
+            surface.blit(text, (10 + i * 200, 10))
         
         # Draw instructions
         instructions = [
-            "Press 1-3 to switch tabs",
+            "Press 1-3 to switch tabs, UP/DOWN or PAGE UP/DOWN to scroll",
             "Press SPACE to close inventory",
             "Press ESC to exit game"
         ]
         for i, text in enumerate(instructions):
             text_surface = self.small_font.render(text, True, WHITE)
-            self.screen.blit(text_surface, (10, self.screen_height - 100 + i * 25))
+            surface.blit(text_surface, (10, self.screen_height - 100 + i * 25))
+    
+    def _inventory_list(self):
+        """The scrolling list on the current inventory page."""
+        return (self.skill_list, self.passive_list, self.gear_list)[self.inventory_page]
     
     def _render_skills(self):
         """Render the skills page."""
-        y = 60
-        for skill in self.player.abilities.skills:
-            # Draw skill name and cooldown
-            name_text = self.font.render(skill.name, True, WHITE)
-            cooldown_text = self.small_font.render(f"Cooldown: {skill.cooldown}s", True, WHITE)
-            self.screen.blit(name_text, (20, y))
-            self.screen.blit(cooldown_text, (20, y + 25))
-            
-            # Draw cooldown bar
-            if not skill.can_use():
-                cooldown_progress = (time.time() - skill.last_used) / skill.cooldown
+        shown = self.skill_list.draw(self.screen, self.player.abilities.skills)
+        
+        # Cooldown bars change every frame, so they go over the cached rows
+        for skill, rect in shown:
+            if not self.player.abilities.can_use_skill(skill):
+                cooldown_progress = skill.cooldown_progress(self.sim_clock.now)
                 bar_width = 200
                 bar_height = 5
                 pygame.draw.rect(self.screen, (100, 100, 100),
-                               (20, y + 50, bar_width, bar_height))
+                               (rect.x, rect.y + 50, bar_width, bar_height))
                 pygame.draw.rect(self.screen, (0, 255, 0),
-                               (20, y + 50, bar_width * cooldown_progress, bar_height))
-            
-            y += 100
+                               (rect.x, rect.y + 50, bar_width * cooldown_progress, bar_height))
+    
+    def _draw_skill_row(self, surface, skill):
+        """Draw a skill's name and cooldown onto its cached row."""
+        surface.blit(self.font.render(skill.name, True, WHITE), (0, 0))
+        surface.blit(self.small_font.render(f"Cooldown: {skill.cooldown}s", True, WHITE), (0, 25))
     
     def _render_passives(self):
         """Render the passives page."""
-        y = 60
-        for passive in self.player.abilities.passives:
-            # Draw passive name and description
-            name_text = self.font.render(passive.name, True, WHITE)
-            desc_text = self.small_font.render(passive.description, True, WHITE)
-            self.screen.blit(name_text, (20, y))
-            self.screen.blit(desc_text, (20, y + 25))
-            y += 80
+        self.passive_list.draw(self.screen, self.player.abilities.passives)
+    
+    def _draw_passive_row(self, surface, passive):
+        """Draw a passive's name and description onto its cached row."""
+        surface.blit(self.font.render(passive.name, True, WHITE), (0, 0))
+        surface.blit(self.small_font.render(passive.description, True, WHITE), (0, 25))
     
     def _render_gear(self):
         """Render the gear page."""
@@ -444,30 +508,37 @@ class Game:
             y += 80
         
         # Draw inventory items
+        items = self.player.gear.inventory.items()
+        self.gear_list.draw(self.screen, items)
+        
+        # Draw the inventory heading with the rows in view
         y += 20
         inventory_text = self.font.render("Inventory:", True, WHITE)
         self.screen.blit(inventory_text, (20, y))
-        y += 40
-        
-        for item in self.player.gear.inventory:
-            name_text = self.small_font.render(item.name, True, WHITE)
-            stats_text = self.small_font.render(str(item.stats), True, WHITE)
-            self.screen.blit(name_text, (20, y))
-            self.screen.blit(stats_text, (20, y + 20))
-            y += 60
+        if items:
+            first = self.gear_list.scroll + 1
+            last = min(len(items), self.gear_list.scroll + self.gear_list.page_rows)
+            range_text = self.small_font.render(f"{first}-{last} of {len(items)}", True, (128, 128, 128))
+            self.screen.blit(range_text, (30 + inventory_text.get_width(), y + 6))
+    
+    def _draw_gear_row(self, surface, item):
+        """Draw an inventory item's name and stats onto its cached row."""
+        # The row is the cache, so don't push thousands of strings through the text cache
+        font = self.text.font(24)
+        surface.blit(font.render(item.name, True, WHITE), (0, 0))
+        surface.blit(font.render(str(item.stats), True, WHITE), (0, 20))
+    
+    @staticmethod
+    def _gear_row_key(item):
+        """Everything a gear row shows, so an edited item gets a fresh row."""
+        return (item.item_id, item.name, tuple(item.stats.items()))
 
     def _render_meta_upgrades(self):
         """Render the meta-upgrades UI."""
-        # Draw semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.fill(BLACK)
-        overlay.set_alpha(64)  # Less dim overlay
-        self.screen.blit(overlay, (0, 0))
+        self._blit_overlay()
         
-        # Draw title and gold
-        title = self.font.render("Meta-Upgrades", True, WHITE)
+        # Draw gold
         gold_text = self.font.render(f"Gold: {self.progression.total_gold}", True, GOLD)
-        self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 20))
         self.screen.blit(gold_text, (WINDOW_WIDTH//2 - gold_text.get_width()//2, 60))
         
         # Draw available upgrades
@@ -494,6 +565,15 @@ class Game:
             
             y += 100
         
+        # Draw title and instructions
+        self.layers.blit(self.screen, 'meta_upgrades', self._build_meta_upgrades_ui,
+                         transparent=True)
+    
+    def _build_meta_upgrades_ui(self, surface):
+        """Draw the meta-upgrades title and instructions onto a layer."""
+        title = self.font.render("Meta-Upgrades", True, WHITE)
+        surface.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 20))
+        
         # Draw instructions
         instructions = [
             "Press 1-5 to purchase upgrades",
@@ -502,37 +582,42 @@ class Game:
         ]
         for i, text in enumerate(instructions):
             text_surface = self.small_font.render(text, True, WHITE)
-            self.screen.blit(text_surface, (10, WINDOW_HEIGHT - 100 + i * 25))
+            surface.blit(text_surface, (10, WINDOW_HEIGHT - 100 + i * 25))
 
     def run(self):
+        # Render as fast as the frame cap allows, but step the simulation
+        # at a fixed tick so outcomes don't depend on the frame rate; the
+        # simulation clock decides how many ticks each frame is worth
+        profiler = self.profiler
         while self.running:
-            self.handle_events()
-            self.update()
-            self.render()
-            self.clock.tick(FPS)
-
-    def spawn_enemies(self):
-        """Spawn new enemies for the next wave."""
-        self.current_wave += 1
-        self.enemies = []
-        num_enemies = 3
-        
-        # Determine enemy types based on wave number
-        enemy_types = ['basic']
-        if self.current_wave >= 3:  # Changed from wave 2 to wave 3
-            enemy_types.append('ranged')
-        if self.current_wave >= 5:  # Changed from wave 4 to wave 5
-            enemy_types.append('tank')
+            frame_time = self.clock.tick(FPS) / 1000.0
+            profiler.begin_frame()
             
-        for _ in range(num_enemies):
-            x = random.randint(100, self.screen_width - 100)
-            y = random.randint(100, self.screen_height - 100)
-            enemy_type = random.choice(enemy_types)
-            enemy = Enemy(x, y, enemy_type)
-            self.enemies.append(enemy)
+            with profiler.section('handle_events'):
+                self.handle_events()
+            with profiler.section('update'):
+                for _ in range(self.sim_clock.ticks_for(frame_time)):
+                    self.update()
+            with profiler.section('render'):
+                self.render()
+            profiler.end_frame()
+        
+        # Keep the replay of a run that was quit part way through, once it
+        # has recorded how the run ended, and make sure the last progress
+        # save is on disk
+        self.simulation.abandon_run()
+        self.save_replay()
+        self.progression.close()
+        if self.profile:
+            self.profiler.export_chrome_trace(self.trace_path)
 
 if __name__ == "__main__":
-    game = Game()
+    game = Game(use_enemy_store='--enemy-store' in sys.argv,
+                use_dirty_rects='--dirty-rects' in sys.argv,
+                replay_dir='replays' if '--record-replays' in sys.argv else None,
+                profile='--profile' in sys.argv,
+                horde='--horde' in sys.argv,
+                chase='--chase' in sys.argv)
     game.run()
     pygame.quit()
     sys.exit() 
\ No newline at end of file
@@ -1,25 +1,31 @@
 from dataclasses import dataclass
 from typing import List, Dict, Optional
-import time
+from utils.clock import SimulationClock
 
 @dataclass
 class Skill:
     name: str
     damage: int
-    cooldown: float  # in seconds
+    cooldown: float  # in simulated seconds
     description: str
-    last_used: float = 0
+    last_used: Optional[float] = None  # simulated time, None if never used
     
-    def can_use(self) -> bool:
+    def can_use(self, now: float) -> bool:
         """Check if the skill is off cooldown."""
-        return time.time() - self.last_used >= self.cooldown
+        return self.last_used is None or now - self.last_used >= self.cooldown
     
-    def use(self) -> bool:
+    def use(self, now: float) -> bool:
         """Use the skill if it's off cooldown."""
-        if self.can_use():
-            self.last_used = time.time()
+        if self.can_use(now):
+            self.last_used = now
             return True
         return False
+    
+    def cooldown_progress(self, now: float) -> float:
+        """Fraction of the cooldown that has elapsed, 1.0 when ready."""
+        if self.can_use(now):
+            return 1.0
+        return (now - self.last_used) / self.cooldown
 
 @dataclass
 class Passive:
@@ -30,10 +36,12 @@ class Passive:
     trigger_chance: float = 1.0  # 0.0 to 1.0
 
 class AbilitySystem:
-    def __init__(self):
+    def __init__(self, clock: Optional[SimulationClock] = None):
+        self.clock = clock if clock is not None else SimulationClock()
         self.skills: List[Skill] = []
         self.passives: List[Passive] = []
         self.max_skills = 4  # Maximum number of skills that can be equipped
+        self.version = 0  # bumped whenever the passives change
         
     def add_skill(self, skill: Skill) -> bool:
         """Add a skill if there's room."""
@@ -53,6 +61,7 @@ class AbilitySystem:
     def add_passive(self, passive: Passive) -> bool:
         """Add a passive trait."""
         self.passives.append(passive)
+        self.version += 1
         return True
     
     def remove_passive(self, passive_name: str) -> bool:
@@ -60,9 +69,19 @@ class AbilitySystem:
         for passive in self.passives:
             if passive.name == passive_name:
                 self.passives.remove(passive)
+                self.version += 1
                 return True
         return False
     
+    def can_use_skill(self, skill: Skill) -> bool:
+        """Check a skill's cooldown against the simulation clock."""
+        return skill.can_use(self.clock.now)
+    
+    def use_skill(self, skill_name: str) -> bool:
+        """Use a skill by name if it's equipped and off cooldown."""
+        skill = self.get_skill(skill_name)
+        return skill is not None and skill.use(self.clock.now)
+    
     def get_skill(self, skill_name: str) -> Optional[Skill]:
         """Get a skill by name."""
         for skill in self.skills:
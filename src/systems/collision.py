@@ -0,0 +1,103 @@
+from typing import Tuple
+import numpy as np
+
+def swept_circle_hits(x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray,
+                      cx: np.ndarray, cy: np.ndarray, radius: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Continuous test of moving points against circles.
+
+    Each segment (x0, y0) -> (x1, y1) is the path a projectile travelled this
+    tick, and radius is the projectile radius plus the target radius. Returns
+    a hit mask and, for hits, the fraction of the segment travelled before
+    the closest approach. Arrays broadcast against each other.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    # Parameter of the closest point on the segment to each circle centre
+    t = np.divide((cx - x0) * dx + (cy - y0) * dy, length_sq,
+                  out=np.zeros(np.broadcast(length_sq, cx).shape), where=length_sq > 0)
+    t = np.clip(t, 0.0, 1.0)
+    px = x0 + t * dx - cx
+    py = y0 + t * dy - cy
+    return px * px + py * py <= radius * radius, t
+
+class CollisionSystem:
+    """Resolves projectile hits with a swept test and a uniform-grid broad phase.
+
+    Targets are bucketed by grid cell once per tick, and each projectile is
+    only tested against targets in the 3x3 block of cells around the middle
+    of its path. Cells are sized to the longest path plus both radii, so that
+    block always covers every target it could reach.
+    """
+
+    def __init__(self, min_cell_size: float = 64):
+        self.min_cell_size = min_cell_size
+
+    def candidate_pairs(self, mid_x: np.ndarray, mid_y: np.ndarray, reach: float,
+                        target_x: np.ndarray, target_y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Broad phase: (projectile, target) index pairs that share a neighbourhood."""
+        if len(mid_x) == 0 or len(target_x) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        cell_size = max(self.min_cell_size, reach)
+
+        # Bucket targets by cell with one sort
+        tcx = np.floor(target_x / cell_size).astype(np.int64)
+        tcy = np.floor(target_y / cell_size).astype(np.int64)
+        origin_x = min(tcx.min(), np.floor(mid_x.min() / cell_size)) - 1
+        origin_y = min(tcy.min(), np.floor(mid_y.min() / cell_size)) - 1
+        span = max(tcy.max(), np.floor(mid_y.max() / cell_size)) - origin_y + 2
+        target_keys = (tcx - origin_x) * span + (tcy - origin_y)
+        order = np.argsort(target_keys, kind='stable')
+        sorted_keys = target_keys[order]
+
+        pcx = np.floor(mid_x / cell_size).astype(np.int64) - origin_x
+        pcy = np.floor(mid_y / cell_size).astype(np.int64) - origin_y
+        projectile_ids = []
+        target_ids = []
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                keys = (pcx + ox) * span + (pcy + oy)
+                start = np.searchsorted(sorted_keys, keys, side='left')
+                counts = np.searchsorted(sorted_keys, keys, side='right') - start
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                # Expand each projectile's [start, start + count) run of targets
+                run_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+                positions = np.arange(total) - run_offsets + np.repeat(start, counts)
+                projectile_ids.append(np.repeat(np.arange(len(mid_x)), counts))
+                target_ids.append(order[positions])
+
+        if not projectile_ids:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        return np.concatenate(projectile_ids), np.concatenate(target_ids)
+
+    def first_hits(self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray,
+                   projectile_radius: np.ndarray, target_x: np.ndarray, target_y: np.ndarray,
+                   target_radius: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """For each projectile that hits something, the first target along its path.
+
+        Returns matching arrays of projectile indices and target indices.
+        """
+        mid_x = (x0 + x1) / 2
+        mid_y = (y0 + y1) / 2
+        half_path = np.hypot(x1 - x0, y1 - y0).max(initial=0) / 2
+        reach = half_path + projectile_radius.max(initial=0) + target_radius.max(initial=0)
+        pi, ti = self.candidate_pairs(mid_x, mid_y, reach, target_x, target_y)
+        if len(pi) == 0:
+            return pi, ti
+
+        # Narrow phase on candidate pairs only
+        hit, t = swept_circle_hits(x0[pi], y0[pi], x1[pi], y1[pi], target_x[ti], target_y[ti],
+                                   projectile_radius[pi] + target_radius[ti])
+        pi, ti, t = pi[hit], ti[hit], t[hit]
+        if len(pi) == 0:
+            return pi, ti
+
+        # A projectile stops at the first target it reaches
+        order = np.lexsort((t, pi))
+        pi, ti = pi[order], ti[order]
+        _, first = np.unique(pi, return_index=True)
+        return pi[first], ti[first]
@@ -1,13 +1,32 @@
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from entities.player import Player
 from entities.enemy import Enemy
+from entities.archetypes import get_archetypes
+from entities.enemy_pool import EnemyPool
+from entities.enemy_store import EnemyStore, ENEMY_TYPES, TYPE_TABLE
+from entities.projectile_pool import ProjectilePool, OWNER_PLAYER, OWNER_ENEMY
 from systems.progression import MetaUpgradeType
+from systems.collision import CollisionSystem, swept_circle_hits
+from systems.gear import GearItem
+from systems.initiative import TurnScheduler, action_interval, PRIORITY_PLAYER, REFERENCE_SPEED, MIN_SPEED
+from systems.loot import LootSystem
+from utils.spatial import SpatialHash
+from utils.clock import SimulationClock
+from utils.text import get_text_renderer
+import math
 import random
-import time
 import pygame
+import numpy as np
+
+# Rewards per enemy type, from the archetype data
+ENEMY_EXP = {name: archetype.exp for name, archetype in get_archetypes().enemies.items()}
+ENEMY_GOLD = {name: archetype.gold for name, archetype in get_archetypes().enemies.items()}
 
 class CombatSystem:
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int,
+                 clock: Optional[SimulationClock] = None):
+        self.clock = clock if clock is not None else SimulationClock()
+        self.rng = random.Random()  # replaced by a seeded stream when run by a Simulation
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.player = None
@@ -15,43 +34,113 @@ class CombatSystem:
         self.battle_active = False
         self.current_wave = 0
         self.enemies_per_wave = 3
+        self.spawns_pending = 0  # enemies of this wave still being streamed in
         self.wave_spacing = 100  # pixels between enemies
         
-        # Turn-related attributes
+        # Dead enemies are recycled into later waves; one wave is allocated up front
+        self.enemy_pool = EnemyPool()
+        self.enemy_pool.prewarm(self.enemies_per_wave)
+        
+        # Spatial index over the living enemies for targeting and range checks
+        self.spatial_index = SpatialHash(screen_width, screen_height)
+        self.max_enemy_range = 0
+        
+        # Projectile hit detection
+        self.collisions = CollisionSystem()
+        
+        # Gear drops; tables are compiled once here, and the wave picks the band
+        self.loot = LootSystem()
+        self.loot_wave = 1
+        
+        # Turn-related attributes, in simulated seconds
+        self.battle_start_tick = 0
         self.battle_duration = 0
-        self.last_turn_time = 0
         self.last_turn_processed = 0
-        self.turn_delay = 0.2  # seconds between turns
-        self.turn_order = []
+        self.turn_delay = 0.2  # seconds between turns at REFERENCE_SPEED
+        self.turn_order = TurnScheduler()  # next action time of everyone in the battle
         self.battle_state = 'preparation'  # 'preparation', 'battle', 'rewards'
         self.exp_gained = 0
         self.gold_earned = 0
         self.enemies_defeated = 0
+        self.items_found: List[GearItem] = []
         
-    def start_battle(self, player: Player, enemies: List[Enemy]):
-        """Start a new battle with the given player and enemies."""
+    def start_battle(self, player: Player, enemies: List[Enemy], wave: int = 1,
+                     store: Optional[EnemyStore] = None):
+        """Start a new battle with the given player and enemies.
+
+        The enemies list is shared with the caller so that kills made here are
+        visible to whoever owns the wave. A wave is only spawned when the caller
+        provided neither enemies nor a store. wave decides which loot tables
+        kills roll on. Pass the EnemyStore when the wave lives in one, so its
+        rows join the initiative order instead of the list.
+        """
         self.player = player
-        self.enemies = enemies.copy()  # Make a copy of the enemies list
+        self.loot_wave = wave
+        self.enemies = enemies
         self.battle_active = True
         self.current_wave = 0
-        self.battle_start_time = time.time()
-        self._spawn_wave()
+        self.battle_start_tick = self.clock.tick
+        
+        # Reset per-battle counters
+        self.battle_duration = 0
+        self.exp_gained = 0
+        self.gold_earned = 0
+        self.enemies_defeated = 0
+        self.items_found = []
+        
+        if not self.enemies and store is None:
+            self._spawn_wave()
+        self.spatial_index.rebuild(self.enemies)
+        self.max_enemy_range = max((e.attack_range for e in self.enemies), default=0)
+        
+        # Everyone's first action comes one interval in, the player first on ties
+        self.turn_order.clear()
+        self._schedule_player(player, 0.0)
+        if store is not None:
+            n = store.count
+            store.next_turn[:n] = self._store_intervals()[store.type_code[:n]]
+        else:
+            for enemy in self.enemies:
+                self._schedule_enemy(enemy, 0.0)
+        
+    def _schedule_player(self, player: Player, after: float) -> None:
+        speed = player.stat_resolver.resolve().speed
+        self.turn_order.schedule(player, after + action_interval(speed, self.turn_delay), PRIORITY_PLAYER)
+        
+    def _schedule_enemy(self, enemy: Enemy, after: float) -> None:
+        self.turn_order.schedule(enemy, after + action_interval(enemy.stats.speed, self.turn_delay))
+        
+    def _store_intervals(self) -> np.ndarray:
+        """action_interval of every enemy type, indexed by type code."""
+        return self.turn_delay * REFERENCE_SPEED / np.maximum(TYPE_TABLE['speed'], MIN_SPEED)
+        
+    def add_reinforcements(self, enemies: List[Enemy], pending: int) -> None:
+        """Index enemies streamed into the running wave (already on the shared list).
+
+        pending is how many more are still to come; the wave isn't complete
+        until they have all arrived and died.
+        """
+        now = self.battle_time
+        for enemy in enemies:
+            self.spatial_index.insert(enemy, enemy.x, enemy.y)
+            self.max_enemy_range = max(self.max_enemy_range, enemy.attack_range)
+            if self.battle_active:
+                self._schedule_enemy(enemy, now)
+        self.spawns_pending = pending
         
     def _spawn_wave(self):
         """Spawn a new wave of enemies."""
-        # Determine enemy types based on wave number
-        enemy_types = ['basic']
-        if self.current_wave >= 2:
-            enemy_types.append('ranged')
-        if self.current_wave >= 4:
-            enemy_types.append('tank')
+        # Determine enemy types based on wave number (current_wave counts from 0 here)
+        enemy_types = get_archetypes().enemy_types_for_wave(self.current_wave + 1)
             
         # Spawn enemies in a line
         start_x = self.screen_width // 2 - (self.enemies_per_wave * self.wave_spacing) // 2
         for i in range(self.enemies_per_wave):
-            enemy_type = random.choice(enemy_types)
-            enemy = Enemy(start_x + i * self.wave_spacing, 100, enemy_type)
+            enemy_type = self.rng.choice(enemy_types)
+            enemy = self.enemy_pool.acquire(start_x + i * self.wave_spacing, 100, enemy_type)
             self.enemies.append(enemy)
+            self.spatial_index.insert(enemy, enemy.x, enemy.y)
+            self.max_enemy_range = max(self.max_enemy_range, enemy.attack_range)
             
     def update(self) -> bool:
         """Update the battle state. Returns True if battle is still active."""
@@ -62,24 +151,25 @@ class CombatSystem:
         self.player.update()
         
         # Update enemies
-        for enemy in self.enemies[:]:  # Use slice copy to avoid modification during iteration
+        for enemy in self.enemies:
             enemy.update()
+            self.spatial_index.move(enemy, enemy.x, enemy.y)
             
-            # Check if enemy is in range to attack player
-            dx = self.player.x - enemy.x
-            dy = self.player.y - enemy.y
-            distance = (dx**2 + dy**2)**0.5
+        # Enemies in range attack the player
+        for enemy, _ in self.enemies_in_range(self.player.x, self.player.y):
+            enemy.attack(self.player, (self.screen_width, self.screen_height))
             
-            if distance <= enemy.attack_range:
-                enemy.attack(self.player)
-                
-            # Check if player is in range to attack enemy
-            if distance <= self.player.attack_range:
-                self.player.attack(enemy)
-                
-            # Remove dead enemies
-            if enemy.stats.hp <= 0:
-                self.enemies.remove(enemy)
+        # Player attacks enemies in range
+        for enemy, _ in self.spatial_index.within_radius(self.player.x, self.player.y,
+                                                         self.player.attack_range):
+            self.player.attack(enemy)
+            
+        # Remove dead enemies
+        for enemy in [e for e in self.enemies if e.stats.hp <= 0]:
+            self.enemies.remove(enemy)
+            self.spatial_index.remove(enemy)
+            self.turn_order.remove(enemy)
+            self.enemy_pool.release(enemy)
                 
         # Check if wave is complete
         if not self.enemies:
@@ -104,12 +194,16 @@ class CombatSystem:
             
         # Draw wave number
         wave_text = f"Wave {self.current_wave + 1}"
-        wave_surface = pygame.font.Font(None, 36).render(wave_text, True, (255, 255, 255))
-        screen.blit(wave_surface, (10, 10))
+        get_text_renderer().blit(screen, wave_text, (10, 10), 36, (255, 255, 255))
         
     def is_battle_active(self) -> bool:
         """Check if a battle is currently active."""
         return self.battle_active
+    
+    @property
+    def battle_time(self) -> float:
+        """Simulated seconds since the current battle started."""
+        return self.clock.seconds_since(self.battle_start_tick)
         
     def get_battle_rewards(self) -> dict:
         """Calculate and return battle rewards."""
@@ -131,97 +225,302 @@ class CombatSystem:
             'wave': self.current_wave
         }
     
+    def nearest_enemy(self, x: float, y: float) -> Tuple[Optional[Enemy], float]:
+        """Closest living enemy to a point and its distance across the screen wrap."""
+        nearest = self.spatial_index.nearest(x, y)
+        if not nearest:
+            return None, float('inf')
+        return nearest[0]
+    
+    def enemies_in_range(self, x: float, y: float) -> List[Tuple[Enemy, float]]:
+        """Enemies whose attack range reaches a point, with their distances."""
+        return [(enemy, distance)
+                for enemy, distance in self.spatial_index.within_radius(x, y, self.max_enemy_range)
+                if distance <= enemy.attack_range]
+    
     def _get_enemy_exp(self, enemy: Enemy) -> int:
         """Get experience value for enemy type."""
-        exp_values = {
-            'basic': 10,
-            'ranged': 15,
-            'tank': 20
-        }
-        return exp_values.get(enemy.enemy_type, 10)
+        return ENEMY_EXP.get(enemy.enemy_type, 10)
         
     def _get_enemy_gold(self, enemy: Enemy) -> int:
         """Get gold value for enemy type."""
-        gold_values = {
-            'basic': 5,
-            'ranged': 8,
-            'tank': 12
-        }
-        return gold_values.get(enemy.enemy_type, 5)
+        return ENEMY_GOLD.get(enemy.enemy_type, 5)
         
-    def process_turn(self, player: Player, enemies: List[Enemy], current_time: float) -> List[str]:
-        """Process a single turn of combat."""
+    def process_turn(self, player: Player, enemies: List[Enemy],
+                     current_time: Optional[float] = None) -> List[str]:
+        """Let everyone whose turn has come act, in initiative order.
+
+        Each combatant acts again action_interval(speed) after its last
+        action, so only the few that are due are touched, however large the
+        wave. current_time is the battle time in seconds and defaults to the
+        simulation clock's.
+
+        An enemy out of range does nothing on its turn, so it also skips the
+        turns it couldn't possibly close the gap by. This relies on being
+        called every tick, in which it and the player each move at most
+        their max_step. The skipped beats are still added one at a time, so
+        the turn it gets lands exactly where it would have anyway.
+        """
         log_entries = []
+        if current_time is None:
+            current_time = self.battle_time
         
         # Update battle duration
         self.battle_duration = current_time
         
-        # Process player's turn
-        if current_time - self.last_turn_time >= self.turn_delay:
-            # Player attacks nearest enemy
-            if self.enemies:  # Only proceed if there are enemies
-                nearest_enemy = min(self.enemies, 
-                                 key=lambda e: ((e.x - player.x)**2 + 
-                                              (e.y - player.y)**2)**0.5)
-                
-                # Calculate distance to nearest enemy
-                dx = nearest_enemy.x - player.x
-                dy = nearest_enemy.y - player.y
-                distance = (dx**2 + dy**2)**0.5
+        turn_order = self.turn_order
+        ticks_per_second = self.clock.tick_rate
+        player_step = player.max_step
+        while self.battle_active:
+            due = turn_order.pop_due(current_time)
+            if due is None:
+                break
+            time, actor = due
+            if actor is player:
+                log_entries.extend(self._player_turn(player))
+                self._schedule_player(player, time)
+            elif actor.stats.hp > 0:
+                interval = action_interval(actor.stats.speed, self.turn_delay)
+                gap = self.spatial_index.distance(actor.x, actor.y, player.x, player.y) - actor.attack_range
+                if gap <= 0:
+                    log_entries.extend(self._enemy_turn(player, actor))
+                else:
+                    # In j more turns the gap closes by at most closing * (j * interval * tick rate + 1)
+                    closing = actor.max_step + player_step
+                    reachable = (gap / closing - 1) / (interval * ticks_per_second)
+                    for _ in range(math.ceil(reachable) - 1):
+                        time += interval
+                turn_order.schedule(actor, time + interval)
+        
+        return log_entries
+    
+    def _player_turn(self, player: Player) -> List[str]:
+        """Player attacks the nearest enemy if it is in range."""
+        log_entries = []
+        nearest_enemy, distance = self.nearest_enemy(player.x, player.y)
+        if nearest_enemy is not None and distance <= player.attack_range:
+            if player.attack(nearest_enemy):
+                log_entries.append(f"Player attacks {nearest_enemy.enemy_type} for {player.stats.attack} damage")
                 
-                if distance <= player.attack_range:
-                    # Player attacks enemy
-                    if player.attack(nearest_enemy):
-                        log_entries.append(f"Player attacks {nearest_enemy.enemy_type} for {player.stats.attack} damage")
-                        
-                        # Check if enemy died
-                        if nearest_enemy.stats.hp <= 0:
-                            # Add rewards
-                            exp_gained = self._get_enemy_exp(nearest_enemy)
-                            gold_gained = self._get_enemy_gold(nearest_enemy)
-                            self.exp_gained += exp_gained
-                            self.gold_earned += gold_gained
-                            self.enemies_defeated += 1
-                            
-                            # Give experience to player
-                            player.gain_experience(exp_gained)
-                            
-                            # Remove dead enemy
-                            self.enemies.remove(nearest_enemy)
-                            log_entries.append(f"{nearest_enemy.enemy_type} defeated! +{exp_gained} XP, +{gold_gained} Gold")
-                            
-                            # Check if all enemies are defeated
-                            if not self.enemies:
-                                self.battle_active = False
-                                log_entries.append("Wave complete!")
+                # Check if enemy died
+                if nearest_enemy.stats.hp <= 0:
+                    log_entries.extend(self._defeat_enemy(player, nearest_enemy))
+        return log_entries
+    
+    def _enemy_turn(self, player: Player, enemy: Enemy) -> List[str]:
+        """An enemy in range of the player attacks it."""
+        log_entries = []
+        if enemy.attack(player, (self.screen_width, self.screen_height)):
+            log_entries.append(f"{enemy.enemy_type} attacks player for {enemy.stats.attack} damage")
             
-            # Process enemy turns
-            for enemy in self.enemies[:]:  # Use slice copy to avoid modification during iteration
-                # Calculate distance to player
-                dx = player.x - enemy.x
-                dy = player.y - enemy.y
-                distance = (dx**2 + dy**2)**0.5
+            # Check if player died
+            if player.stats.hp <= 0:
+                self.battle_active = False
+                log_entries.append("Player defeated!")
+        return log_entries
+    
+    def collect_defeated(self, player: Player) -> List[str]:
+        """Reward and remove every enemy that died outside of a player turn."""
+        log_entries = []
+        for enemy in [e for e in self.enemies if e.stats.hp <= 0]:
+            log_entries.extend(self._defeat_enemy(player, enemy))
+        return log_entries
+    
+    def _defeat_enemy(self, player: Player, enemy: Enemy) -> List[str]:
+        """Grant rewards for a dead enemy and remove it from the battle."""
+        log_entries = []
+        
+        # Add rewards
+        exp_gained = self._get_enemy_exp(enemy)
+        gold_gained = self._get_enemy_gold(enemy)
+        self.exp_gained += exp_gained
+        self.gold_earned += gold_gained
+        self.enemies_defeated += 1
+        
+        # Give experience to player
+        player.gain_experience(exp_gained)
+        
+        # Remove dead enemy
+        self.enemies.remove(enemy)
+        self.spatial_index.remove(enemy)
+        self.turn_order.remove(enemy)
+        log_entries.append(f"{enemy.enemy_type} defeated! +{exp_gained} XP, +{gold_gained} Gold")
+        
+        # Roll for a gear drop
+        item = self.loot.roll(enemy.enemy_type, self.loot_wave)
+        if item is not None:
+            log_entries.extend(self._collect_items(player, [item]))
+        self.enemy_pool.release(enemy)
+        
+        # Check if all enemies are defeated
+        if not self.enemies and not self.spawns_pending:
+            self.battle_active = False
+            log_entries.append("Wave complete!")
+        
+        return log_entries
+    
+    def process_projectiles(self, player: Player, projectiles: ProjectilePool,
+                            store: Optional[EnemyStore] = None) -> List[str]:
+        """Apply this tick's projectile hits to the player and the enemies.
+
+        Every projectile is tested along the whole path it travelled this tick,
+        so fast shots can't skip over a target. Enemies killed here are reaped
+        by collect_defeated (or the store's compaction) like any other kill.
+        """
+        log_entries = []
+        slots = projectiles.live_slots()
+        if len(slots) == 0:
+            return log_entries
+        owners = projectiles.owner[slots]
+        
+        # Enemy shots against the player
+        enemy_shots = slots[owners == OWNER_ENEMY]
+        if len(enemy_shots):
+            hit, _ = swept_circle_hits(
+                projectiles.prev_x[enemy_shots], projectiles.prev_y[enemy_shots],
+                projectiles.x[enemy_shots], projectiles.y[enemy_shots],
+                player.x, player.y, projectiles.radius[enemy_shots] + player.width / 2)
+            if hit.any():
+                damage = int(projectiles.damage[enemy_shots[hit]].sum())
+                player.take_damage(damage)
+                projectiles.release(enemy_shots[hit])
+                log_entries.append(f"Projectiles hit player for {damage} damage")
                 
-                # Enemy attacks player if in range
-                if distance <= enemy.attack_range:
-                    if enemy.attack(player):
-                        log_entries.append(f"{enemy.enemy_type} attacks player for {enemy.stats.attack} damage")
-                        
-                        # Check if player died
-                        if player.stats.hp <= 0:
-                            self.battle_active = False
-                            log_entries.append("Player defeated!")
-                            break
-            
-            self.last_turn_time = current_time
+                if player.stats.hp <= 0:
+                    self.battle_active = False
+                    log_entries.append("Player defeated!")
+        
+        # Player shots against enemies
+        player_shots = slots[owners == OWNER_PLAYER]
+        if len(player_shots):
+            if store is not None:
+                target_x = store.x[:len(store)]
+                target_y = store.y[:len(store)]
+                target_radius = store.radii()
+            else:
+                target_x = np.array([e.x for e in self.enemies])
+                target_y = np.array([e.y for e in self.enemies])
+                target_radius = np.array([e.width / 2 for e in self.enemies])
+            shots, targets = self.collisions.first_hits(
+                projectiles.prev_x[player_shots], projectiles.prev_y[player_shots],
+                projectiles.x[player_shots], projectiles.y[player_shots],
+                projectiles.radius[player_shots].astype(np.float64),
+                target_x, target_y, target_radius)
+            if len(shots):
+                shot_slots = player_shots[shots]
+                damages = projectiles.damage[shot_slots]
+                if store is not None:
+                    store.take_damage(targets, damages)
+                else:
+                    for target, damage in zip(targets.tolist(), damages.tolist()):
+                        self.enemies[target].take_damage(damage)
+                projectiles.release(shot_slots)
+        
+        return log_entries
+    
+    def process_store_turn(self, player: Player, store: EnemyStore,
+                           current_time: Optional[float] = None) -> List[str]:
+        """Process a single turn of combat against an array-backed enemy wave.
+
+        Same rules as process_turn, but the enemies' action times live in the
+        store's next_turn column: the due ones are found and resolved for the
+        whole wave at once, around the player's turn, and kills are reported
+        as one entry per type.
+        """
+        log_entries = []
+        if current_time is None:
+            current_time = self.battle_time
+        self.battle_duration = current_time
+        
+        # Rows streamed in since the last turn get their first action one interval from now
+        n = store.count
+        intervals = self._store_intervals()
+        next_turn = store.next_turn[:n]
+        fresh = np.flatnonzero(next_turn < 0)
+        if len(fresh):
+            next_turn[fresh] = current_time + intervals[store.type_code[fresh]]
+        due = np.flatnonzero(next_turn <= current_time)
+        due = due[store.hp[due] > 0]
+        
+        # Enemies due before the player act first; ties go to the player
+        player_time = self.turn_order.next_time(player)
+        player_due = player_time is not None and player_time <= current_time
+        early = next_turn[due] < player_time if player_due else np.ones(len(due), dtype=bool)
+        log_entries.extend(self._store_enemy_turns(player, store, due[early]))
+        if player_due and player.stats.hp > 0:
+            self.turn_order.pop_due(current_time)
+            log_entries.extend(self._store_player_turn(player, store))
+            self._schedule_player(player, player_time)
+            late = due[~early]
+            log_entries.extend(self._store_enemy_turns(player, store, late[store.hp[late] > 0]))
+        next_turn[due] += intervals[store.type_code[due]]
+        
+        # Remove the dead and hand out rewards
+        dead_codes = store.compact()
+        if len(dead_codes):
+            counts = np.bincount(dead_codes, minlength=len(ENEMY_TYPES))
+            for code, count in enumerate(counts):
+                if count:
+                    log_entries.extend(self.record_kills(player, ENEMY_TYPES[code], int(count)))
+        
+        if player.stats.hp <= 0:
+            self.battle_active = False
+            log_entries.append("Player defeated!")
+        elif len(store) == 0 and not self.spawns_pending:
+            self.battle_active = False
+            log_entries.append("Wave complete!")
         
         return log_entries
     
+    def _store_player_turn(self, player: Player, store: EnemyStore) -> List[str]:
+        """Player attacks the nearest stored enemy if it is in range."""
+        nearest = store.nearest(player.x, player.y)
+        if nearest < 0:
+            return []
+        target = store.view(nearest)
+        distance = self.spatial_index.distance(player.x, player.y, target.x, target.y)
+        if distance <= player.attack_range and player.attack(target):
+            return [f"Player attacks {target.enemy_type} for {player.stats.attack} damage"]
+        return []
+    
+    def _store_enemy_turns(self, player: Player, store: EnemyStore, rows: np.ndarray) -> List[str]:
+        """The given rows attack the player if ready and in range."""
+        if player.stats.hp <= 0 or not len(rows):
+            return []
+        damage, _ = store.attack_target(player, rows)
+        if damage:
+            return [f"Enemies hit player for {damage} damage"]
+        return []
+    
+    def record_kills(self, player: Player, enemy_type: str, count: int = 1) -> List[str]:
+        """Grant rewards for enemies of one type killed outside the enemy list."""
+        exp_gained = ENEMY_EXP.get(enemy_type, 10) * count
+        gold_gained = ENEMY_GOLD.get(enemy_type, 5) * count
+        self.exp_gained += exp_gained
+        self.gold_earned += gold_gained
+        self.enemies_defeated += count
+        player.gain_experience(exp_gained)
+        log_entries = [f"{count} {enemy_type} defeated! +{exp_gained} XP, +{gold_gained} Gold"]
+        log_entries.extend(self._collect_items(player, self.loot.roll_batch(enemy_type, self.loot_wave, count)))
+        return log_entries
+    
+    def _collect_items(self, player: Player, items: List[GearItem]) -> List[str]:
+        """Put dropped items in the player's inventory."""
+        if not items:
+            return []
+        self.items_found.extend(items)
+        for item in items:
+            player.gear.add_to_inventory(item)
+        if len(items) == 1:
+            return [f"Found {items[0].name}!"]
+        return [f"Found {len(items)} items!"]
+    
     def get_battle_stats(self) -> Dict[str, Any]:
         """Get current battle statistics."""
         return {
             'duration': round(self.battle_duration, 1),
             'exp_gained': self.exp_gained,
             'gold_earned': self.gold_earned,
-            'enemies_defeated': len([e for e in self.enemies if e.stats.hp <= 0])
+            'enemies_defeated': self.enemies_defeated,
+            'items_found': len(self.items_found)
         } 
\ No newline at end of file
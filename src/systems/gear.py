@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from enum import Enum
+from systems.inventory import Inventory
 
 class GearSlot(Enum):
     WEAPON = "weapon"
@@ -15,6 +16,7 @@ class GearItem:
     description: str
     level: int = 1
     rarity: str = "common"  # common, uncommon, rare, epic, legendary
+    item_id: Optional[int] = field(default=None, compare=False)  # assigned by the inventory
     
     def get_stat_bonus(self, stat: str) -> float:
         """Get the bonus value for a specific stat."""
@@ -32,8 +34,9 @@ class GearSystem:
         self.equipped_items: Dict[GearSlot, Optional[GearItem]] = {
             slot: None for slot in GearSlot
         }
-        self.inventory: List[GearItem] = []
-        self.max_inventory_size = 20
+        self.max_inventory_size = 5000
+        self.inventory = Inventory(self.max_inventory_size)
+        self.version = 0  # bumped whenever the equipped set changes
         
     def equip_item(self, item: GearItem) -> bool:
         """Equip an item to its slot."""
@@ -43,6 +46,7 @@ class GearSystem:
                 self.unequip_item(item.slot)
             
             self.equipped_items[item.slot] = item
+            self.version += 1
             return True
         return False
     
@@ -51,20 +55,18 @@ class GearSystem:
         if slot in self.equipped_items:
             item = self.equipped_items[slot]
             self.equipped_items[slot] = None
+            self.version += 1
             return item
         return None
     
     def add_to_inventory(self, item: GearItem) -> bool:
         """Add an item to inventory if there's room."""
-        if len(self.inventory) < self.max_inventory_size:
-            self.inventory.append(item)
-            return True
-        return False
+        return self.inventory.add(item) is not None
     
     def remove_from_inventory(self, item: GearItem) -> bool:
         """Remove an item from inventory."""
         if item in self.inventory:
-            self.inventory.remove(item)
+            self.inventory.remove(item.item_id)
             return True
         return False
     
@@ -92,8 +94,8 @@ class GearSystem:
                 return item
         
         # Check inventory
-        for item in self.inventory:
-            if item.name == name:
-                return item
-        
-        return None 
\ No newline at end of file
+        return self.inventory.find_by_name(name)
+    
+    def get_best_item(self, slot: GearSlot, stat: str) -> Optional[GearItem]:
+        """The inventory item for a slot with the highest level-scaled stat."""
+        return self.inventory.best_for_slot(slot, stat) 
\ No newline at end of file
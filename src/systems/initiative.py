@@ -0,0 +1,70 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+import heapq
+import itertools
+
+REFERENCE_SPEED = 4  # a combatant this fast acts once per turn_delay
+MIN_SPEED = 1  # slow gear can't stall anyone completely
+
+# Ties at the same moment go to the player, then to whoever was scheduled first
+PRIORITY_PLAYER = 0
+PRIORITY_ENEMY = 1
+
+def action_interval(speed: float, turn_delay: float) -> float:
+    """Seconds between a combatant's actions; faster combatants act more often."""
+    return turn_delay * REFERENCE_SPEED / max(speed, MIN_SPEED)
+
+class TurnScheduler:
+    """Initiative queue: who acts next, ordered by their next action time.
+
+    A min-heap of (time, priority, sequence) entries. Taking the combatants
+    due at a moment costs O(k log n) for the k that are due, however many
+    are idle in between. Rescheduling or removing a combatant marks its old
+    entry dead instead of searching the heap for it; dead entries are
+    dropped when they surface.
+    """
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, actor: Hashable) -> bool:
+        return actor in self._entries
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+
+    def schedule(self, actor: Hashable, time: float, priority: int = PRIORITY_ENEMY) -> None:
+        """Set when an actor next acts, replacing any earlier booking."""
+        self.remove(actor)
+        entry = [time, priority, next(self._sequence), actor]
+        self._entries[actor] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, actor: Hashable) -> None:
+        entry = self._entries.pop(actor, None)
+        if entry is not None:
+            entry[-1] = None
+
+    def next_time(self, actor: Hashable) -> Optional[float]:
+        entry = self._entries.get(actor)
+        return entry[0] if entry is not None else None
+
+    def pop_due(self, now: float) -> Optional[Tuple[float, Hashable]]:
+        """Take the earliest actor due at or before now, with its action time."""
+        heap = self._heap
+        while heap:
+            time, _, _, actor = heap[0]
+            if actor is None:
+                heapq.heappop(heap)
+                continue
+            if time > now:
+                return None
+            heapq.heappop(heap)
+            del self._entries[actor]
+            return time, actor
+        return None
@@ -0,0 +1,183 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+import heapq
+import itertools
+
+if TYPE_CHECKING:
+    from systems.gear import GearItem, GearSlot
+
+class Inventory:
+    """Gear items keyed by stable id, with secondary indexes.
+
+    Items live in an insertion-ordered dict, so add, remove and lookup by id
+    are O(1) and iteration keeps pickup order. Each item gets an id on its
+    first add that stays with it (equipping and stashing it again keeps the
+    id). Sets of ids are kept per slot, rarity, level and name. Rankings of
+    a slot by a stat are heaps built on first query: an add pushes onto them
+    in O(log n), and a remove only retires the item's entries, which are
+    dropped once they reach the top or outnumber the live ones. The best
+    item is then the heap's top; longer rankings are sorted on demand.
+    items() hands out the stash in pickup order as one tuple that is only
+    rebuilt after a change, so a UI can page through it every frame. An
+    item edited in place must be passed to update().
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self._items: Dict[int, 'GearItem'] = {}
+        self._next_id = 1
+        self._by_slot: Dict['GearSlot', Set[int]] = defaultdict(set)
+        self._by_rarity: Dict[str, Set[int]] = defaultdict(set)
+        self._by_level: Dict[int, Set[int]] = defaultdict(set)
+        self._by_name: Dict[str, Set[int]] = defaultdict(set)
+        # (slot, stat) -> heap of (-scaled value, id, generation), best on top
+        self._rankings: Dict[Tuple['GearSlot', str], List[Tuple[float, int, int]]] = {}
+        # id -> what the item was indexed under, so edits can be undone; the
+        # generation tells its current ranking entries from retired ones
+        self._indexed: Dict[int, Tuple] = {}
+        self._generations = itertools.count()
+        self._ordered: Optional[Tuple['GearItem', ...]] = None  # items(), until the next change
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator['GearItem']:
+        # Walks the snapshot, so the stash may change while it is iterated
+        return iter(self.items())
+
+    def items(self) -> Tuple['GearItem', ...]:
+        """Every stored item in pickup order, as a snapshot shared until the next change."""
+        if self._ordered is None:
+            self._ordered = tuple(self._items.values())
+        return self._ordered
+
+    def __contains__(self, item: 'GearItem') -> bool:
+        return item.item_id is not None and self._items.get(item.item_id) is item
+
+    def is_full(self) -> bool:
+        return self.max_size is not None and len(self._items) >= self.max_size
+
+    def add(self, item: 'GearItem') -> Optional[int]:
+        """Store an item and return its id, or None if full or already stored."""
+        if self.is_full() or item in self:
+            return None
+        if item.item_id is None or item.item_id in self._items:
+            item.item_id = self._next_id
+        self._next_id = max(self._next_id, item.item_id + 1)
+        self._items[item.item_id] = item
+        self._ordered = None
+        self._index(item)
+        return item.item_id
+
+    def remove(self, item_id: int) -> Optional['GearItem']:
+        """Take an item out by id."""
+        item = self._items.pop(item_id, None)
+        if item is not None:
+            self._ordered = None
+            self._unindex(item)
+        return item
+
+    def update(self, item: 'GearItem') -> None:
+        """Re-index an item after changing its level, stats or rarity in place."""
+        if item not in self:
+            return
+        self._unindex(item)
+        self._index(item)
+
+    def get(self, item_id: int) -> Optional['GearItem']:
+        return self._items.get(item_id)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._ordered = None
+        for index in (self._by_slot, self._by_rarity, self._by_level, self._by_name):
+            index.clear()
+        self._rankings.clear()
+        self._indexed.clear()
+
+    def find_by_name(self, name: str) -> Optional['GearItem']:
+        """The earliest stored item with this name."""
+        ids = self._by_name.get(name)
+        return self._items[min(ids)] if ids else None
+
+    def by_slot(self, slot: 'GearSlot') -> List['GearItem']:
+        return self._collect(self._by_slot.get(slot))
+
+    def by_rarity(self, rarity: str) -> List['GearItem']:
+        return self._collect(self._by_rarity.get(rarity))
+
+    def by_level(self, min_level: int, max_level: Optional[int] = None) -> List['GearItem']:
+        """Items with min_level <= level <= max_level."""
+        ids = set()
+        for level, level_ids in self._by_level.items():
+            if level >= min_level and (max_level is None or level <= max_level):
+                ids |= level_ids
+        return self._collect(ids)
+
+    def best_for_slot(self, slot: 'GearSlot', stat: str) -> Optional['GearItem']:
+        """The item for slot with the highest level-scaled stat, if any has it."""
+        ranked = self.ranked(slot, stat, limit=1)
+        return ranked[0] if ranked else None
+
+    def ranked(self, slot: 'GearSlot', stat: str, limit: Optional[int] = None) -> List['GearItem']:
+        """Items for slot that have stat, best first (ties by id, i.e. pickup order)."""
+        ranking = self._rankings.get((slot, stat))
+        if ranking is None:
+            ranking = []
+            for item_id in self._by_slot.get(slot, ()):
+                value = self._scaled(self._items[item_id], stat)
+                if value is not None:
+                    ranking.append((-value, item_id, self._indexed[item_id][-1]))
+            heapq.heapify(ranking)
+            self._rankings[(slot, stat)] = ranking
+        # Retired entries on top would hide the best item
+        while ranking and not self._is_current(ranking[0]):
+            heapq.heappop(ranking)
+        if limit == 1:
+            entries = ranking[:1]
+        else:
+            current = [entry for entry in ranking if self._is_current(entry)]
+            entries = sorted(current) if limit is None else heapq.nsmallest(limit, current)
+        return [self._items[item_id] for _, item_id, _ in entries]
+
+    def _is_current(self, entry: Tuple[float, int, int]) -> bool:
+        indexed = self._indexed.get(entry[1])
+        return indexed is not None and indexed[-1] == entry[2]
+
+    def _collect(self, ids: Optional[Set[int]]) -> List['GearItem']:
+        return [self._items[item_id] for item_id in sorted(ids)] if ids else []
+
+    @staticmethod
+    def _scaled(item: 'GearItem', stat: str) -> Optional[float]:
+        if stat not in item.stats:
+            return None
+        return item.get_total_stats()[stat]
+
+    def _index(self, item: 'GearItem') -> None:
+        item_id = item.item_id
+        values = item.get_total_stats()
+        self._by_slot[item.slot].add(item_id)
+        self._by_rarity[item.rarity].add(item_id)
+        self._by_level[item.level].add(item_id)
+        self._by_name[item.name].add(item_id)
+        generation = next(self._generations)
+        self._indexed[item_id] = (item.slot, item.rarity, item.level, item.name, generation)
+        slot_size = len(self._by_slot[item.slot])
+        for (slot, stat), ranking in self._rankings.items():
+            if slot == item.slot and stat in values:
+                heapq.heappush(ranking, (-values[stat], item_id, generation))
+                if len(ranking) > 2 * slot_size + 16:
+                    # Mostly retired entries; keep the heap within a constant of the stash
+                    ranking[:] = [entry for entry in ranking if self._is_current(entry)]
+                    heapq.heapify(ranking)
+
+    def _unindex(self, item: 'GearItem') -> None:
+        item_id = item.item_id
+        slot, rarity, level, name, _ = self._indexed.pop(item_id)
+        for index, key in ((self._by_slot, slot), (self._by_rarity, rarity),
+                           (self._by_level, level), (self._by_name, name)):
+            ids = index[key]
+            ids.discard(item_id)
+            if not ids:
+                del index[key]
+        # Its ranking entries are retired by dropping it from _indexed
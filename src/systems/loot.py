@@ -0,0 +1,172 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+import numpy as np
+from entities.archetypes import get_archetypes
+from systems.gear import GearItem, GearSlot
+
+# Item bases every drop is built from: name, slot, base stats, relative weight
+ITEM_BASES: List[Tuple[str, GearSlot, Dict[str, float], float]] = [
+    ("Sword", GearSlot.WEAPON, {'attack': 5}, 3.0),
+    ("Axe", GearSlot.WEAPON, {'attack': 7, 'speed': -1}, 2.0),
+    ("Dagger", GearSlot.WEAPON, {'attack': 3, 'speed': 1}, 2.0),
+    ("Staff", GearSlot.WEAPON, {'attack': 6}, 1.0),
+    ("Leather Armor", GearSlot.ARMOR, {'defense': 3}, 3.0),
+    ("Chainmail", GearSlot.ARMOR, {'defense': 5, 'speed': -1}, 2.0),
+    ("Plate Armor", GearSlot.ARMOR, {'defense': 8, 'speed': -2}, 1.0),
+    ("Ring", GearSlot.ACCESSORY, {'attack': 2}, 2.0),
+    ("Amulet", GearSlot.ACCESSORY, {'max_hp': 15}, 2.0),
+    ("Boots", GearSlot.ACCESSORY, {'speed': 1, 'defense': 1}, 2.0),
+]
+
+RARITIES = ('common', 'uncommon', 'rare', 'epic', 'legendary')
+RARITY_MULTIPLIER = {
+    'common': 1.0,
+    'uncommon': 1.25,
+    'rare': 1.5,
+    'epic': 2.0,
+    'legendary': 3.0
+}
+
+# Chance that a kill drops anything, per enemy type
+ENEMY_DROP_CHANCE = {name: archetype.drop_chance for name, archetype in get_archetypes().enemies.items()}
+DEFAULT_DROP_CHANCE = 0.05
+
+# Rarity weights by the first wave they apply from
+WAVE_RARITY_WEIGHTS: List[Tuple[int, Tuple[float, ...]]] = [
+    (1, (80, 18, 2, 0, 0)),
+    (5, (60, 28, 10, 2, 0)),
+    (10, (40, 32, 20, 7, 1)),
+    (20, (25, 30, 27, 14, 4)),
+]
+
+# Below this many kills of one type a batch is rolled one by one
+BATCH_THRESHOLD = 16
+
+class AliasTable:
+    """Weighted sampling in O(1) per draw (Vose's alias method).
+
+    Building the table is O(n). Each draw then picks a column uniformly and
+    keeps it or takes its alias with one comparison, however many outcomes
+    there are.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        if n == 0 or weights.sum() <= 0:
+            raise ValueError("alias table needs at least one positive weight")
+        scaled = weights * (n / weights.sum())
+        self.size = n
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding and keeps prob 1
+
+        # Python lists are quicker than numpy scalars for single draws
+        self._prob = self.prob.tolist()
+        self._alias = self.alias.tolist()
+
+    def sample(self, rng: random.Random) -> int:
+        """One outcome index, from a single uniform draw."""
+        u = rng.random() * self.size
+        column = int(u)
+        return column if u - column < self._prob[column] else self._alias[column]
+
+    def sample_many(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """count outcome indices at once."""
+        u = rng.random(count) * self.size
+        columns = u.astype(np.intp)
+        return np.where(u - columns < self.prob[columns], columns, self.alias[columns])
+
+class DropTable:
+    """Every possible drop of one enemy type in one wave band, with its odds.
+
+    Outcome 0 is "nothing"; the rest are (item base, rarity) pairs, all in
+    one alias table so a kill resolves with a single draw.
+    """
+
+    def __init__(self, drop_chance: float, rarity_weights: Sequence[float],
+                 bases: Sequence[Tuple[str, GearSlot, Dict[str, float], float]] = ITEM_BASES):
+        base_total = sum(weight for *_, weight in bases)
+        rarity_total = sum(rarity_weights)
+        self.outcomes: List[Optional[Tuple[int, str]]] = [None]
+        weights = [1.0 - drop_chance]
+        for base_index, (*_, base_weight) in enumerate(bases):
+            for rarity, rarity_weight in zip(RARITIES, rarity_weights):
+                if rarity_weight > 0:
+                    self.outcomes.append((base_index, rarity))
+                    weights.append(drop_chance * (base_weight / base_total) * (rarity_weight / rarity_total))
+        self.table = AliasTable(weights)
+
+class LootSystem:
+    """Rolls gear drops for kills from precompiled drop tables.
+
+    A table is compiled per enemy type and wave band when the system is
+    created. Resolving a kill is one dict lookup (the wave's band is found
+    once per enemy type and wave) and one alias draw. Large batches of kills
+    of one type (a whole wave dying at once) are drawn with numpy in one call.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
+        self.items_dropped = 0
+        self._band_starts = [start for start, _ in WAVE_RARITY_WEIGHTS]
+        self._tables: Dict[Tuple[str, int], DropTable] = {}
+        for enemy_type, drop_chance in list(ENEMY_DROP_CHANCE.items()) + [(None, DEFAULT_DROP_CHANCE)]:
+            for band, (_, rarity_weights) in enumerate(WAVE_RARITY_WEIGHTS):
+                self._tables[(enemy_type, band)] = DropTable(drop_chance, rarity_weights)
+        # (enemy type, wave) -> its band's table, filled in as waves come up
+        self._lookup: Dict[Tuple[str, int], DropTable] = {}
+
+    def _table(self, enemy_type: str, wave: int) -> DropTable:
+        table = self._lookup.get((enemy_type, wave))
+        if table is None:
+            band = max(0, bisect_right(self._band_starts, wave) - 1)
+            table = self._tables.get((enemy_type, band)) or self._tables[(None, band)]
+            self._lookup[(enemy_type, wave)] = table
+        return table
+
+    def roll(self, enemy_type: str, wave: int) -> Optional[GearItem]:
+        """The item one kill drops, if any."""
+        table = self._table(enemy_type, wave)
+        outcome = table.outcomes[table.table.sample(self.rng)]
+        if outcome is None:
+            return None
+        self.items_dropped += 1
+        return make_item(outcome[0], outcome[1], wave)
+
+    def roll_batch(self, enemy_type: str, wave: int, count: int) -> List[GearItem]:
+        """Every item count kills of one type drop."""
+        if count < BATCH_THRESHOLD:
+            items = [self.roll(enemy_type, wave) for _ in range(count)]
+            return [item for item in items if item is not None]
+
+        table = self._table(enemy_type, wave)
+        # Seed numpy from the stream so batches stay reproducible
+        generator = np.random.default_rng(self.rng.getrandbits(64))
+        drawn = table.table.sample_many(generator, count)
+        items = [make_item(*table.outcomes[index], wave) for index in drawn[drawn > 0].tolist()]
+        self.items_dropped += len(items)
+        return items
+
+def make_item(base_index: int, rarity: str, wave: int) -> GearItem:
+    """Build a dropped item; its level follows the wave it dropped in."""
+    name, slot, stats, _ = ITEM_BASES[base_index]
+    multiplier = RARITY_MULTIPLIER[rarity]
+    return GearItem(
+        name=name if rarity == 'common' else f"{rarity.title()} {name}",
+        slot=slot,
+        stats={stat: round(value * multiplier, 2) for stat, value in stats.items()},
+        description=f"A {rarity} {name.lower()} found on wave {wave}",
+        level=max(1, wave),
+        rarity=rarity
+    )
@@ -4,6 +4,8 @@ from enum import Enum
 import json
 import os
 import time
+from utils.persistence import AsyncJsonWriter, write_json_atomic
+from systems.run_history import RunHistory, OUTCOME_DEFEATED
 
 class MetaUpgradeType(Enum):
     DAMAGE_BOOST = "damage_boost"
@@ -34,7 +36,18 @@ class RunData:
         self.timestamp = time.time()
 
 class ProgressionSystem:
-    def __init__(self):
+    def __init__(self, save_path: Optional[str] = 'progress.json', background_saves: bool = True,
+                 history_path: Optional[str] = None):
+        # Where progress is persisted; None keeps everything in memory
+        self.save_path = save_path
+        
+        # Finished runs go to a history file next to the save unless told otherwise
+        if history_path is None and save_path is not None:
+            history_path = os.path.splitext(save_path)[0] + '_history.bin'
+        self.history = RunHistory(history_path) if history_path is not None else None
+        
+        # Saves are written off the main thread unless background_saves is off
+        self._writer = AsyncJsonWriter(save_path) if save_path is not None and background_saves else None
         self.current_run: Optional[RunData] = None
         self.run_number = 0
         self.total_gold = 0
@@ -103,18 +116,18 @@ class ProgressionSystem:
     
     def end_run(self, enemies_defeated: int, experience_gained: int,
                 gold_earned: int, duration: float) -> None:
-        """End the current run and calculate rewards."""
+        """Record a finished battle of the current run and bank its gold."""
         if self.current_run:
             # Apply gold gain boost
             gold_multiplier = 1.0 + (self.meta_upgrades[MetaUpgradeType.GOLD_GAIN] * 
                                    self.available_upgrades[MetaUpgradeType.GOLD_GAIN].effect_value)
             gold_earned = int(gold_earned * gold_multiplier)
             
-            # Update run data
-            self.current_run.enemies_defeated = enemies_defeated
-            self.current_run.experience_gained = experience_gained
-            self.current_run.gold_earned = gold_earned
-            self.current_run.duration = duration
+            # Update run data with this battle's totals
+            self.current_run.enemies_defeated += enemies_defeated
+            self.current_run.experience_gained += experience_gained
+            self.current_run.gold_earned += gold_earned
+            self.current_run.duration += duration
             
             # Add gold to total
             self.total_gold += gold_earned
@@ -122,6 +135,26 @@ class ProgressionSystem:
             # Save progress
             self.save_progress()
     
+    def finish_run(self, waves_survived: int, level: int, outcome: int = OUTCOME_DEFEATED) -> None:
+        """Close the current run and append it to the run history."""
+        run = self.current_run
+        if run is None:
+            return
+        if self.history is not None:
+            self.history.append(
+                timestamp=run.timestamp,
+                run_number=run.run_number,
+                player_class=run.player_class,
+                enemies_defeated=run.enemies_defeated,
+                experience_gained=run.experience_gained,
+                gold_earned=run.gold_earned,
+                duration=run.duration,
+                waves_survived=waves_survived,
+                level=level,
+                outcome=outcome
+            )
+        self.current_run = None
+    
     def get_upgrade_cost(self, upgrade_type: MetaUpgradeType) -> int:
         """Calculate the cost of the next level of an upgrade."""
         current_level = self.meta_upgrades[upgrade_type]
@@ -152,24 +185,51 @@ class ProgressionSystem:
         return 1.0 + (self.run_number * 0.1)  # 10% increase per run
     
     def save_progress(self) -> None:
-        """Save progression data to a file."""
+        """Save progression data to a file.
+
+        With background saves the snapshot is handed to the writer thread,
+        which coalesces rapid saves; otherwise it is written right away.
+        Either way the file is replaced atomically.
+        """
+        if self.save_path is None:
+            return
+        
         data = {
             'run_number': self.run_number,
             'total_gold': self.total_gold,
             'meta_upgrades': {k.value: v for k, v in self.meta_upgrades.items()}
         }
         
+        if self._writer is not None:
+            self._writer.submit(data)
+            return
         try:
-            with open('progress.json', 'w') as f:
-                json.dump(data, f)
+            write_json_atomic(self.save_path, data)
         except Exception as e:
             print(f"Error saving progress: {e}")
     
+    def flush_progress(self) -> None:
+        """Wait until every save so far is on disk."""
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def close(self) -> None:
+        """Flush pending saves and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None  # any later saves are written synchronously
+    
     def load_progress(self) -> None:
         """Load progression data from file."""
+        if self.save_path is None:
+            return
+        
+        # Don't read back a file that a pending save is about to replace
+        self.flush_progress()
+        
         try:
-            if os.path.exists('progress.json'):
-                with open('progress.json', 'r') as f:
+            if os.path.exists(self.save_path):
+                with open(self.save_path, 'r') as f:
                     data = json.load(f)
                     self.run_number = data.get('run_number', 0)
                     self.total_gold = data.get('total_gold', 0)
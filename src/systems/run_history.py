@@ -0,0 +1,268 @@
+"""
+Append-only store of finished runs.
+
+Every run is one fixed-width binary record appended to a single file, which
+is memory-mapped for reading, so aggregate queries are numpy reductions over
+columns rather than loops over Python objects. Print a summary of a history
+file from the src directory:
+
+    python -m systems.run_history progress_history.bin
+"""
+from typing import Dict, Optional
+import argparse
+import os
+import time
+import numpy as np
+from entities.archetypes import MAX_HISTORY_CODE, get_archetypes
+
+MAGIC = b'RUNHIST\0'
+VERSION = 1
+
+# On-disk layout of one run, little-endian and unpadded
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),  # run start, seconds since the epoch
+    ('run_number', '<u4'),
+    ('enemies_defeated', '<u4'),
+    ('experience_gained', '<u4'),
+    ('gold_earned', '<u4'),
+    ('duration', '<f4'),  # simulated seconds spent in battle
+    ('waves_survived', '<u2'),
+    ('level', '<u2'),
+    ('player_class', 'u1'),
+    ('outcome', 'u1'),
+])
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('record_size', '<u4')])
+
+# Per-class sums kept up to date as runs are appended
+_TOTALS = ('runs', 'wins', 'waves_survived', 'gold_earned', 'duration')
+
+# Each class is stored under the history_code it has in data/archetypes.json,
+# which stays put when classes are added or reordered
+CLASS_CODES = {name: archetype.history_code for name, archetype in get_archetypes().classes.items()}
+UNKNOWN_CLASS = MAX_HISTORY_CODE
+
+# How a run ended
+OUTCOME_DEFEATED = 0
+OUTCOME_CLEARED = 1  # survived every wave it was allowed to play
+OUTCOME_ABANDONED = 2  # quit or stalled before either
+
+class RunHistory:
+    """Fixed-width run records in one append-only file.
+
+    Reads go through a memory map of the whole file, remapped when a query
+    finds the file has grown, whether this instance or another one (say the
+    game, while the CLI reads) appended to it. A small in-memory index (row
+    ids sorted by class, plus whether timestamps are in order) is rebuilt
+    in one pass over two columns when it is stale, so class and time-range
+    filters select rows with searchsorted instead of scanning. Per-class
+    totals are folded in only for rows added since the last query, so
+    unfiltered and per-class aggregates don't touch the records at all.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._records: Optional[np.ndarray] = None
+        self._index_size = -1
+        self._class_order = np.empty(0, dtype=np.intp)
+        self._class_starts = np.zeros(UNKNOWN_CLASS + 2, dtype=np.intp)
+        self._time_sorted = True
+        self._totals_size = 0
+        self._totals = {name: np.zeros(UNKNOWN_CLASS + 1) for name in _TOTALS}
+
+    def append(self, timestamp: float, run_number: int, player_class: str, enemies_defeated: int,
+               experience_gained: int, gold_earned: int, duration: float,
+               waves_survived: int, level: int, outcome: int) -> None:
+        """Add one finished run to the end of the file."""
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record['timestamp'] = timestamp
+        record['run_number'] = run_number
+        record['enemies_defeated'] = enemies_defeated
+        record['experience_gained'] = experience_gained
+        record['gold_earned'] = gold_earned
+        record['duration'] = duration
+        record['waves_survived'] = waves_survived
+        record['level'] = level
+        record['player_class'] = CLASS_CODES.get(player_class, UNKNOWN_CLASS)
+        record['outcome'] = outcome
+        self.append_records(record)
+
+    def append_records(self, records: np.ndarray) -> None:
+        """Add a batch of RECORD_DTYPE records with one write."""
+        self._records = None  # let go of the map; it is remapped to see the new rows
+        try:
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            # A file too short to hold a header is started over
+            new_file = size < HEADER_DTYPE.itemsize
+            with open(self.path, 'wb' if new_file else 'r+b') as f:
+                if new_file:
+                    header = np.array([(MAGIC, VERSION, RECORD_DTYPE.itemsize)], dtype=HEADER_DTYPE)
+                    f.write(header.tobytes())
+                else:
+                    # Cut off a partial record left by an interrupted append so
+                    # the new records start on a record boundary
+                    end = size - (size - HEADER_DTYPE.itemsize) % RECORD_DTYPE.itemsize
+                    f.truncate(end)
+                    f.seek(end)
+                f.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+        except Exception as e:
+            print(f"Error saving run history: {e}")
+
+    def records(self) -> np.ndarray:
+        """Every stored run, memory-mapped read-only."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        # Ignore a partial record left by an interrupted append
+        count = max(size - HEADER_DTYPE.itemsize, 0) // RECORD_DTYPE.itemsize
+        # The map is kept until the file holds a different number of records,
+        # which also picks up rows appended by another RunHistory
+        if self._records is not None and len(self._records) == count:
+            return self._records
+        if count == 0:
+            self._records = np.zeros(0, dtype=RECORD_DTYPE)
+            return self._records
+
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)[0]
+        if header['magic'] != MAGIC.rstrip(b'\0') or header['record_size'] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{self.path} is not a version {VERSION} run history file")
+        self._records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r',
+                                  offset=HEADER_DTYPE.itemsize, shape=(count,))
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+    def _ensure_index(self) -> None:
+        records = self.records()
+        if self._index_size == len(records):
+            return
+        classes = records['player_class']
+        self._class_order = np.argsort(classes, kind='stable')
+        self._class_starts = np.searchsorted(classes[self._class_order],
+                                             np.arange(UNKNOWN_CLASS + 2))
+        timestamps = records['timestamp']
+        self._time_sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        self._index_size = len(records)
+
+    def _ensure_totals(self) -> Dict[str, np.ndarray]:
+        records = self.records()
+        if self._totals_size > len(records):  # file was replaced under us
+            self._totals_size = 0
+            for totals in self._totals.values():
+                totals[:] = 0
+        new = records[self._totals_size:]
+        if len(new):
+            classes = new['player_class']
+            bins = UNKNOWN_CLASS + 1
+            self._totals['runs'] += np.bincount(classes, minlength=bins)
+            self._totals['wins'] += np.bincount(classes, weights=new['outcome'] == OUTCOME_CLEARED,
+                                                minlength=bins)
+            for name in ('waves_survived', 'gold_earned', 'duration'):
+                self._totals[name] += np.bincount(classes, weights=new[name], minlength=bins)
+            self._totals_size = len(records)
+        return self._totals
+
+    def _class_totals(self, filters: Dict) -> Optional[Dict[str, float]]:
+        """Cached sums for a query filtered by class alone (or not at all)."""
+        if filters.get('since') is not None or filters.get('until') is not None:
+            return None
+        totals = self._ensure_totals()
+        player_class = filters.get('player_class')
+        if player_class is None:
+            return {name: float(values.sum()) for name, values in totals.items()}
+        code = CLASS_CODES.get(player_class, UNKNOWN_CLASS)
+        return {name: float(values[code]) for name, values in totals.items()}
+
+    def select(self, player_class: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> np.ndarray:
+        """Row ids of runs for a class and/or started in [since, until), in file order."""
+        self._ensure_index()
+        records = self.records()
+        if player_class is None:
+            rows = np.arange(len(records))
+        else:
+            code = CLASS_CODES.get(player_class, UNKNOWN_CLASS)
+            rows = self._class_order[self._class_starts[code]:self._class_starts[code + 1]]
+        if since is None and until is None:
+            return rows
+
+        timestamps = records['timestamp'][rows]
+        if self._time_sorted:
+            # Rows within a class keep file order, so their timestamps are sorted too
+            start = 0 if since is None else np.searchsorted(timestamps, since, side='left')
+            end = len(rows) if until is None else np.searchsorted(timestamps, until, side='left')
+            return rows[start:end]
+        keep = np.ones(len(rows), dtype=bool)
+        if since is not None:
+            keep &= timestamps >= since
+        if until is not None:
+            keep &= timestamps < until
+        return rows[keep]
+
+    def _column(self, name: str, rows: Optional[np.ndarray]) -> np.ndarray:
+        column = self.records()[name]
+        return column if rows is None else column[rows]
+
+    def win_rate(self, **filters) -> float:
+        """Share of matching runs that cleared every wave."""
+        totals = self._class_totals(filters)
+        if totals is not None:
+            return totals['wins'] / totals['runs'] if totals['runs'] else 0.0
+        rows = self.select(**filters) if filters else None
+        outcomes = self._column('outcome', rows)
+        return float(np.mean(outcomes == OUTCOME_CLEARED)) if len(outcomes) else 0.0
+
+    def mean_waves(self, **filters) -> float:
+        """Average waves survived over matching runs."""
+        totals = self._class_totals(filters)
+        if totals is not None:
+            return totals['waves_survived'] / totals['runs'] if totals['runs'] else 0.0
+        rows = self.select(**filters) if filters else None
+        waves = self._column('waves_survived', rows)
+        return float(waves.mean()) if len(waves) else 0.0
+
+    def gold_per_minute(self, **filters) -> float:
+        """Gold earned per minute of battle over matching runs."""
+        totals = self._class_totals(filters)
+        if totals is not None:
+            minutes = totals['duration'] / 60
+            return totals['gold_earned'] / minutes if minutes > 0 else 0.0
+        rows = self.select(**filters) if filters else None
+        minutes = self._column('duration', rows).sum(dtype=np.float64) / 60
+        gold = self._column('gold_earned', rows).sum(dtype=np.float64)
+        return float(gold / minutes) if minutes > 0 else 0.0
+
+    def summary_by_class(self) -> Dict[str, Dict[str, float]]:
+        """Runs, win rate, mean waves and gold per minute for every class at once."""
+        totals = self._ensure_totals()
+        runs, wins = totals['runs'], totals['wins']
+        waves, gold, duration = totals['waves_survived'], totals['gold_earned'], totals['duration']
+
+        summary = {}
+        for name, code in CLASS_CODES.items():
+            if runs[code] == 0:
+                continue
+            summary[name] = {
+                'runs': int(runs[code]),
+                'win_rate': float(wins[code] / runs[code]),
+                'mean_waves': float(waves[code] / runs[code]),
+                'gold_per_minute': float(gold[code] / (duration[code] / 60)) if duration[code] > 0 else 0.0
+            }
+        return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize a run history file.")
+    parser.add_argument('path', help="history file written by the game")
+    args = parser.parse_args()
+
+    history = RunHistory(args.path)
+    started = time.perf_counter()
+    summary = history.summary_by_class()
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(history)} runs, summarized in {elapsed * 1000:.1f} ms")
+    print(f"{'class':10} {'runs':>10} {'win rate':>9} {'waves':>7} {'gold/min':>9}")
+    for name, row in summary.items():
+        print(f"{name:10} {row['runs']:>10} {row['win_rate']:>9.1%} "
+              f"{row['mean_waves']:>7.2f} {row['gold_per_minute']:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from entities.stats import Stats
+from systems.abilities import AbilitySystem
+from systems.gear import GearSystem
+from systems.progression import ProgressionSystem, MetaUpgradeType
+
+@dataclass(frozen=True)
+class EffectiveStats:
+    """A character's combat numbers with gear, passives and meta-upgrades applied."""
+    attack: float
+    defense: float
+    speed: float
+    max_hp: float
+    damage_multiplier: float = 1.0
+    crit_chance: float = 0.0
+    crit_multiplier: float = 1.0
+    life_steal: float = 0.0
+
+class StatResolver:
+    """Combines base stats, gear, passives and meta-upgrades, and caches the result.
+
+    resolve() only rebuilds when an input has changed: the base stat values
+    (level-ups edit these), the gear and ability versions (bumped on every
+    equip, unequip, add and remove), or the meta-upgrade level. Editing an
+    equipped item or a passive in place isn't seen; call invalidate() after.
+    """
+
+    def __init__(self, stats: Stats, abilities: AbilitySystem, gear: GearSystem,
+                 progression: Optional[ProgressionSystem] = None):
+        self.stats = stats
+        self.abilities = abilities
+        self.gear = gear
+        self.progression = progression
+        self.resolves = 0  # cache misses, for profiling
+        self._key: Optional[Tuple] = None
+        self._resolved: Optional[EffectiveStats] = None
+
+    def invalidate(self) -> None:
+        """Force the next resolve() to rebuild."""
+        self._key = None
+
+    def _input_key(self) -> Tuple:
+        stats = self.stats
+        damage_boost = (self.progression.meta_upgrades.get(MetaUpgradeType.DAMAGE_BOOST, 0)
+                        if self.progression else 0)
+        return (stats.attack, stats.defense, stats.speed, stats.max_hp,
+                self.gear.version, self.abilities.version, damage_boost)
+
+    def resolve(self) -> EffectiveStats:
+        """The current effective stats, rebuilt only if an input changed."""
+        key = self._input_key()
+        if key != self._key:
+            self._resolved = self._build()
+            self._key = key
+            self.resolves += 1
+        return self._resolved
+
+    def _build(self) -> EffectiveStats:
+        gear_stats = self.gear.get_total_stats()
+        effects = self.abilities.apply_passive_effects(0)
+
+        # Meta damage boost scales everything the passives allow
+        damage_multiplier = effects['damage_multiplier']
+        if self.progression:
+            damage_multiplier *= 1.0 + self.progression.get_upgrade_effect(MetaUpgradeType.DAMAGE_BOOST)
+
+        return EffectiveStats(
+            attack=self.stats.attack + gear_stats.get('attack', 0),
+            defense=self.stats.defense + gear_stats.get('defense', 0),
+            speed=self.stats.speed + gear_stats.get('speed', 0),
+            max_hp=self.stats.max_hp + gear_stats.get('max_hp', 0),
+            damage_multiplier=damage_multiplier,
+            crit_chance=effects['crit_chance'],
+            crit_multiplier=effects['crit_multiplier'],
+            life_steal=effects['life_steal']
+        )
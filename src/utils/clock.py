@@ -0,0 +1,79 @@
+from typing import Tuple
+
+# Cap on wall time fed to the clock per frame, to avoid a spiral of death
+MAX_FRAME_TIME = 0.25
+
+# Fast-forward speeds cycled through by the game
+SPEEDS: Tuple[int, ...] = (1, 2, 4, 8)
+
+class SimulationClock:
+    """Simulated time, advanced one fixed tick at a time.
+
+    Everything that needs to know "now" (skill cooldowns, turn timing, the
+    countdown between waves) reads it from here instead of the wall clock,
+    so a battle plays out the same however fast its ticks are run. The
+    pause, single-step and speed controls only change how many ticks a
+    frame of wall time is worth; they never change what a tick does.
+    """
+
+    def __init__(self, tick_rate: int = 60):
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+        self.tick = 0
+
+        # Playback controls
+        self.paused = False
+        self.speed = 1
+        self._pending_steps = 0
+        self._accumulator = 0.0
+
+    @property
+    def now(self) -> float:
+        """Simulated seconds since the clock started."""
+        return self.tick * self.tick_dt
+
+    def advance(self, ticks: int = 1) -> None:
+        """Move simulated time forward."""
+        self.tick += ticks
+
+    def seconds_since(self, start_tick: int) -> float:
+        """Simulated seconds elapsed since an earlier tick.
+
+        Measured in whole ticks, so intervals don't pick up float drift.
+        """
+        return (self.tick - start_tick) * self.tick_dt
+
+    def pause(self) -> None:
+        self.paused = True
+
+    def resume(self) -> None:
+        self.paused = False
+        self._pending_steps = 0
+
+    def toggle_pause(self) -> None:
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self, ticks: int = 1) -> None:
+        """While paused, run this many ticks on the next frame."""
+        if self.paused:
+            self._pending_steps += ticks
+
+    def cycle_speed(self) -> int:
+        """Switch to the next fast-forward speed and return it."""
+        index = SPEEDS.index(self.speed) if self.speed in SPEEDS else -1
+        self.speed = SPEEDS[(index + 1) % len(SPEEDS)]
+        return self.speed
+
+    def ticks_for(self, frame_time: float) -> int:
+        """How many ticks to run for a frame that took frame_time wall seconds."""
+        if self.paused:
+            ticks, self._pending_steps = self._pending_steps, 0
+            return ticks
+
+        self._accumulator += min(frame_time, MAX_FRAME_TIME) * self.speed
+        ticks = int(self._accumulator / self.tick_dt)
+        self._accumulator -= ticks * self.tick_dt
+        return ticks
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+import heapq
+import math
+import numpy as np
+
+# Neighbour offsets: (dcol, drow, cost); orthogonal first so ties go straight
+NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+)
+
+class FlowField:
+    """Shortest-path directions to one goal for every cell of the wrapping grid.
+
+    One Dijkstra pass from the goal's cell fills in, for every cell, the
+    direction of the next cell on its shortest path there. Any number of
+    agents then find their way by looking up the cell they stand in, so
+    steering costs the same per agent however many are chasing. The field
+    only has to be rebuilt when the goal moves to another cell or a cell is
+    blocked or cleared. Paths wrap around the screen edges like everything
+    else, and never cut the corner of a blocked cell.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int = 32):
+        self.width = width
+        self.height = height
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        # Stretch cells so a whole number of them tiles each wrapped axis
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.blocked = [False] * (self.cols * self.rows)
+        self.goal: Optional[Tuple[float, float]] = None
+        self.goal_cell = -1
+        self.builds = 0  # rebuilds so far, for profiling
+
+        # Per-cell step towards the goal, as lists for single lookups and
+        # arrays for whole waves at once; (0, 0) at the goal and where unreachable
+        cells = self.cols * self.rows
+        self.distance = [math.inf] * cells
+        self._step_x = [0.0] * cells
+        self._step_y = [0.0] * cells
+        self.step_x = np.zeros(cells)
+        self.step_y = np.zeros(cells)
+        self._neighbours = [self._cell_neighbours(cell) for cell in range(cells)]
+
+    def _cell_neighbours(self, cell: int) -> List[Tuple[int, float, int, int, int]]:
+        """(neighbour, cost, direction, corner, corner) around a cell.
+
+        direction indexes NEIGHBOURS; corners are the two cells a diagonal
+        step cuts past (the cell itself for orthogonal steps).
+        """
+        col, row = cell % self.cols, cell // self.cols
+        neighbours = []
+        for direction, (dcol, drow, cost) in enumerate(NEIGHBOURS):
+            neighbour = ((row + drow) % self.rows) * self.cols + (col + dcol) % self.cols
+            corner_a = row * self.cols + (col + dcol) % self.cols
+            corner_b = ((row + drow) % self.rows) * self.cols + col
+            neighbours.append((neighbour, cost, direction, corner_a, corner_b))
+        return neighbours
+
+    def cell_of(self, x: float, y: float) -> int:
+        return (int((y % self.height) // self.cell_height) % self.rows * self.cols
+                + int((x % self.width) // self.cell_width) % self.cols)
+
+    def set_blocked(self, col: int, row: int, blocked: bool = True) -> None:
+        """Wall off (or reopen) a cell; the next update() rebuilds the field."""
+        self.blocked[row * self.cols + col] = blocked
+        self.goal_cell = -1
+
+    def update(self, goal_x: float, goal_y: float) -> bool:
+        """Point the field at a goal. Returns True if it had to be rebuilt."""
+        self.goal = (goal_x, goal_y)
+        cell = self.cell_of(goal_x, goal_y)
+        if cell == self.goal_cell:
+            return False
+        self._build(cell)
+        self.goal_cell = cell
+        return True
+
+    def _build(self, goal_cell: int) -> None:
+        cells = len(self.blocked)
+        distance = [math.inf] * cells
+        came_from = [-1] * cells  # NEIGHBOURS index of the step that reached each cell
+        blocked = self.blocked
+        neighbours = self._neighbours
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        # Search outwards from the goal; a cell is reached by stepping away
+        # from a cell one hop nearer the goal, so its way there is that step reversed
+        distance[goal_cell] = 0.0
+        frontier = [(0.0, goal_cell)]
+        while frontier:
+            dist, cell = heappop(frontier)
+            if dist > distance[cell]:
+                continue
+            for neighbour, cost, direction, corner_a, corner_b in neighbours[cell]:
+                new_dist = dist + cost
+                if new_dist < distance[neighbour] and not (
+                        blocked[neighbour] or blocked[corner_a] or blocked[corner_b]):
+                    distance[neighbour] = new_dist
+                    came_from[neighbour] = direction
+                    heappush(frontier, (new_dist, neighbour))
+
+        steps = [(-dcol * self.cell_width, -drow * self.cell_height) for dcol, drow, _ in NEIGHBOURS]
+        steps.append((0.0, 0.0))  # came_from -1: the goal, or unreachable
+        self.distance = distance
+        self._step_x = [steps[direction][0] for direction in came_from]
+        self._step_y = [steps[direction][1] for direction in came_from]
+        self.step_x = np.array(self._step_x)
+        self.step_y = np.array(self._step_y)
+        self.builds += 1
+
+    def waypoint(self, x: float, y: float) -> Tuple[float, float]:
+        """Where an agent at (x, y) should head next: one cell along its path,
+        or the goal itself once it shares the goal's cell."""
+        cell = self.cell_of(x, y)
+        if cell == self.goal_cell:
+            return self.goal
+        return x + self._step_x[cell], y + self._step_y[cell]
+
+    def waypoints(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """waypoint() for whole arrays of agents."""
+        cells = ((np.mod(ys, self.height) // self.cell_height).astype(np.intp) % self.rows * self.cols
+                 + (np.mod(xs, self.width) // self.cell_width).astype(np.intp) % self.cols)
+        at_goal = cells == self.goal_cell
+        target_x = np.where(at_goal, self.goal[0], xs + self.step_x[cells])
+        target_y = np.where(at_goal, self.goal[1], ys + self.step_y[cells])
+        return target_x, target_y
@@ -0,0 +1,136 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON so that path always holds either the old or the new file.
+
+    The data goes to a temporary file in the same directory, is fsynced,
+    and then renamed over path, so a crash mid-write can't truncate it.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Persist the rename itself where the platform allows it
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+class AsyncJsonWriter:
+    """Saves JSON snapshots to one file from a background thread.
+
+    submit() only hands the snapshot over, so the caller never waits on the
+    disk. The writer waits until no new snapshot has arrived for `debounce`
+    seconds and then writes only the latest, so a burst of saves costs one
+    write. A steady stream of saves can't hold the write off for good: once
+    a snapshot has waited `max_wait` seconds, the latest is written anyway,
+    so a crash loses at most that much. Writes are atomic (see
+    write_json_atomic). Anything still pending is written by flush(),
+    close(), or at interpreter exit.
+    """
+
+    def __init__(self, path: str, debounce: float = 0.2, max_wait: float = 1.0):
+        self.path = path
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.submitted = 0
+        self.written = 0
+
+        self._condition = threading.Condition()
+        self._pending: Optional[Any] = None
+        self._has_pending = False
+        self._submitted_at = 0.0
+        self._first_pending_at = 0.0  # when the oldest unwritten snapshot came in
+        self._writing = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, data: Any) -> None:
+        """Queue a snapshot to be written, replacing any not yet written.
+
+        data must not be modified afterwards; pass a fresh object.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            now = time.monotonic()
+            if not self._has_pending:
+                self._first_pending_at = now
+            self._pending = data
+            self._has_pending = True
+            self._submitted_at = now
+            self.submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='progress-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write anything pending now and wait for it. False on timeout."""
+        with self._condition:
+            self._submitted_at = 0.0  # skip the rest of the debounce
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._has_pending and not self._writing,
+                                            timeout)
+
+    def close(self) -> None:
+        """Write anything pending and stop the background thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._has_pending and not self._closed:
+                    self._condition.wait()
+                if not self._has_pending:
+                    return
+
+                # Let a burst of submits settle before writing, but not for
+                # longer than max_wait
+                while not self._closed:
+                    deadline = min(self._submitted_at + self.debounce,
+                                   self._first_pending_at + self.max_wait)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                data = self._pending
+                self._pending = None
+                self._has_pending = False
+                self._writing = True
+
+            try:
+                write_json_atomic(self.path, data)
+                self.written += 1
+            except Exception as e:
+                print(f"Error saving {self.path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,146 @@
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+import numpy as np
+
+class _Section:
+    """Times one pass through a with-block."""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> '_Section':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.profiler._record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class _NullSection:
+    """Stand-in section used while profiling is off; does nothing."""
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSection':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class FrameProfiler:
+    """Per-frame timing of named sections, with a ring buffer and trace export.
+
+    Code marks its hot spots with `with profiler.section('name'):`. While the
+    profiler is disabled that hands back a shared no-op object, so an
+    instrumented call costs one attribute check. While enabled, the duration
+    of every frame and the per-frame total of every section go into ring
+    buffers of the last `capacity` frames (for percentiles), and each section
+    pass is kept as a trace event that can be exported for chrome://tracing
+    or Perfetto.
+    """
+
+    def __init__(self, capacity: int = 600, max_trace_events: int = 200_000):
+        self.enabled = False
+        self.capacity = capacity
+        self.frame_times = np.zeros(capacity)  # milliseconds
+        self.section_times: Dict[str, np.ndarray] = {}
+        self.frames = 0  # frames recorded since the last reset
+        self.trace_events: Deque[Tuple[str, int, int]] = deque(maxlen=max_trace_events)
+
+        self._origin = time.perf_counter_ns()
+        self._frame_start: Optional[int] = None
+        self._frame_sections: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._frame_start = None
+
+    def reset(self) -> None:
+        """Forget every recorded frame and trace event."""
+        self.frame_times[:] = 0
+        self.section_times.clear()
+        self.frames = 0
+        self.trace_events.clear()
+        self._frame_start = None
+        self._frame_sections.clear()
+
+    def section(self, name: str):
+        """Context manager that times a section of the current frame."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def _record(self, name: str, start: int, end: int) -> None:
+        self._frame_sections[name] = self._frame_sections.get(name, 0) + (end - start)
+        self.trace_events.append((name, start, end))
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._frame_start = time.perf_counter_ns()
+            self._frame_sections.clear()
+
+    def end_frame(self) -> None:
+        """Close the frame and write its timings into the ring buffers."""
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        self.trace_events.append(('frame', self._frame_start, end))
+
+        slot = self.frames % self.capacity
+        self.frame_times[slot] = (end - self._frame_start) / 1e6
+        for name, total in self._frame_sections.items():
+            times = self.section_times.get(name)
+            if times is None:
+                times = self.section_times[name] = np.zeros(self.capacity)
+            times[slot] = total / 1e6
+        # Sections that didn't run this frame took no time
+        for name, times in self.section_times.items():
+            if name not in self._frame_sections:
+                times[slot] = 0
+        self.frames += 1
+        self._frame_start = None
+
+    def percentiles(self, qs: Sequence[float] = (50, 95, 99),
+                    name: Optional[str] = None) -> Tuple[float, ...]:
+        """Frame time percentiles in ms over the buffered frames, or a section's."""
+        count = min(self.frames, self.capacity)
+        if count == 0:
+            return tuple(0.0 for _ in qs)
+        times = self.frame_times if name is None else self.section_times.get(name)
+        if times is None:
+            return tuple(0.0 for _ in qs)
+        return tuple(float(v) for v in np.percentile(times[:count], qs))
+
+    def export_chrome_trace(self, path: str) -> None:
+        """Write the buffered trace events in Chrome trace-event JSON format."""
+        events = [{
+            'name': name,
+            'ph': 'X',
+            'ts': (start - self._origin) / 1000,  # microseconds
+            'dur': (end - start) / 1000,
+            'pid': 1,
+            'tid': 1
+        } for name, start, end in self.trace_events]
+        try:
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        except Exception as e:
+            print(f"Error exporting trace: {e}")
+
+_profiler: Optional[FrameProfiler] = None
+
+def get_profiler() -> FrameProfiler:
+    """The profiler shared by the game loop and every system it times."""
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+    return _profiler
@@ -0,0 +1,27 @@
+import random
+from typing import Dict
+
+# Seeds are drawn from [0, SEED_RANGE)
+SEED_RANGE = 2**32
+
+class RandomStreams:
+    """Independent, reproducible random streams keyed by subsystem name.
+
+    Every stream is seeded from the master seed and its name, so wave
+    spawning, crit rolls and anything else random each get their own
+    sequence. Adding a draw to one subsystem never shifts the numbers
+    another one sees, and the same seed always replays the same run.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self._streams: Dict[str, random.Random] = {}
+
+    def stream(self, name: str) -> random.Random:
+        """The random stream for a subsystem, created on first use."""
+        rng = self._streams.get(name)
+        if rng is None:
+            # String seeds are hashed with SHA-512, so this is stable across processes
+            rng = random.Random(f"{self.seed}:{name}")
+            self._streams[name] = rng
+        return rng
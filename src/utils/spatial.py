@@ -0,0 +1,186 @@
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+import heapq
+import itertools
+import math
+
+def wrapped_delta(delta, size: float):
+    """Shortest signed offset along one wrapped axis.
+
+    Works on plain floats and NumPy arrays alike. The world wraps at the
+    screen edges (see World.world_to_screen), so two points near opposite
+    edges are actually close together.
+    """
+    half = size / 2
+    return (delta + half) % size - half
+
+class SpatialHash:
+    """Uniform grid over the wrapping screen for nearest and radius queries.
+
+    Objects are bucketed by the cell they stand in. Moving an object only
+    touches the buckets when it crosses into another cell, so keeping the
+    index current costs a dictionary lookup per entity per tick. Distances
+    are measured across the screen wrap.
+
+    Buckets keep insertion order and equal distances go to the object
+    inserted first, so query results never depend on memory addresses and
+    a seeded battle plays out the same in every process.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int = 64):
+        self.width = width
+        self.height = height
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        # Stretch cells so a whole number of them tiles each wrapped axis
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.cell_size = min(self.cell_width, self.cell_height)
+        # cell -> objects in it, as an insertion-ordered dict used as a set
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, None]] = {}
+        # object -> (x, y, cell, insertion number for tie-breaks)
+        self._entries: Dict[Hashable, Tuple[float, float, Tuple[int, int], int]] = {}
+        self._sequence = itertools.count()
+        
+        # Cached cell offsets per search ring
+        self._rings: List[List[Tuple[int, int]]] = []
+        self._seen_offsets: Set[Tuple[int, int]] = set()
+        self.max_ring = max(self.cols, self.rows) // 2 + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self._entries
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (int((x % self.width) // self.cell_width) % self.cols,
+                int((y % self.height) // self.cell_height) % self.rows)
+
+    def clear(self) -> None:
+        """Remove every object."""
+        self._cells.clear()
+        self._entries.clear()
+        self._sequence = itertools.count()
+
+    def insert(self, obj: Hashable, x: float, y: float) -> None:
+        """Add an object at a position, or move it if already present."""
+        if obj in self._entries:
+            self.move(obj, x, y)
+            return
+        cell = self._cell_of(x, y)
+        self._cells.setdefault(cell, {})[obj] = None
+        self._entries[obj] = (x, y, cell, next(self._sequence))
+
+    def move(self, obj: Hashable, x: float, y: float) -> None:
+        """Update an object's position, re-bucketing only on a cell change."""
+        _, _, old_cell, sequence = self._entries[obj]
+        cell = self._cell_of(x, y)
+        if cell != old_cell:
+            bucket = self._cells[old_cell]
+            del bucket[obj]
+            if not bucket:
+                del self._cells[old_cell]
+            self._cells.setdefault(cell, {})[obj] = None
+        self._entries[obj] = (x, y, cell, sequence)
+
+    def remove(self, obj: Hashable) -> None:
+        """Remove an object if present."""
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return
+        bucket = self._cells[entry[2]]
+        del bucket[obj]
+        if not bucket:
+            del self._cells[entry[2]]
+
+    def rebuild(self, objects: Iterable[Any]) -> None:
+        """Replace the contents with objects that expose x and y."""
+        self.clear()
+        for obj in objects:
+            self.insert(obj, obj.x, obj.y)
+
+    def distance(self, x1: float, y1: float, x2: float, y2: float) -> float:
+        """Distance between two points across the screen wrap."""
+        dx = wrapped_delta(x2 - x1, self.width)
+        dy = wrapped_delta(y2 - y1, self.height)
+        return math.hypot(dx, dy)
+
+    def offset(self, x1: float, y1: float, x2: float, y2: float) -> Tuple[float, float]:
+        """Shortest (dx, dy) from the first point to the second across the wrap."""
+        return wrapped_delta(x2 - x1, self.width), wrapped_delta(y2 - y1, self.height)
+
+    def _ring_offsets(self, radius: int) -> List[Tuple[int, int]]:
+        """Cell offsets at Chebyshev distance radius, excluding any nearer ring.
+
+        Offsets are reduced modulo the grid, so on a small wrapped grid a cell
+        reached by several rings is only listed in the first one.
+        """
+        while len(self._rings) <= radius:
+            r = len(self._rings)
+            offsets = []
+            for dx in range(-r, r + 1):
+                for dy in range(-r, r + 1):
+                    if max(abs(dx), abs(dy)) != r:
+                        continue
+                    offset = (dx % self.cols, dy % self.rows)
+                    if offset not in self._seen_offsets:
+                        self._seen_offsets.add(offset)
+                        offsets.append(offset)
+            self._rings.append(offsets)
+        return self._rings[radius]
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[Tuple[Any, float]]:
+        """Every object within radius of a point, as (object, distance) pairs."""
+        results = []
+        reach = min(math.ceil(radius / self.cell_size), self.max_ring)
+        cx, cy = self._cell_of(x, y)
+        cells = self._cells
+        for ring in range(reach + 1):
+            for ox, oy in self._ring_offsets(ring):
+                bucket = cells.get(((cx + ox) % self.cols, (cy + oy) % self.rows))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    ex, ey, _, _ = self._entries[obj]
+                    distance = self.distance(x, y, ex, ey)
+                    if distance <= radius:
+                        results.append((obj, distance))
+        return results
+
+    def nearest(self, x: float, y: float, k: int = 1,
+                max_distance: float = math.inf) -> List[Tuple[Any, float]]:
+        """The k closest objects to a point, nearest first, as (object, distance) pairs.
+
+        Searches outwards ring by ring and stops once no unvisited cell can
+        hold anything closer than the k-th best match found so far. Ties go
+        to the object inserted first.
+        """
+        if not self._entries or k <= 0:
+            return []
+        # Max-heap of the k best by (distance, insertion number), both negated
+        best: List[Tuple[float, int, Any]] = []
+        cx, cy = self._cell_of(x, y)
+        cells = self._cells
+        for ring in range(self.max_ring + 1):
+            for ox, oy in self._ring_offsets(ring):
+                bucket = cells.get(((cx + ox) % self.cols, (cy + oy) % self.rows))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    ex, ey, _, sequence = self._entries[obj]
+                    distance = self.distance(x, y, ex, ey)
+                    if distance > max_distance:
+                        continue
+                    item = (-distance, -sequence, obj)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+            # Anything in a further ring is at least this far away, and one
+            # exactly this far could still win a tie
+            bound = ring * self.cell_size
+            if bound > max_distance or (len(best) == k and -best[0][0] < bound):
+                break
+
+        return [(obj, -neg) for neg, _, obj in sorted(best, reverse=True)]
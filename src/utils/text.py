@@ -0,0 +1,148 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+Color = Tuple[int, int, int]
+
+# Characters covered by the glyph atlas: enough for counters, damage and EXP values
+NUMERIC_GLYPHS = "0123456789+-/:.,% "
+
+class GlyphAtlas:
+    """One pre-rendered strip of glyphs for a font size and colour.
+
+    Fast-changing numbers are drawn by blitting each character's slice of the
+    strip, so a new value never has to be rasterized.
+    """
+
+    def __init__(self, font: pygame.font.Font, color: Color, glyphs: str = NUMERIC_GLYPHS):
+        rendered = [font.render(glyph, True, color) for glyph in glyphs]
+        width = sum(surface.get_width() for surface in rendered)
+        height = max(surface.get_height() for surface in rendered)
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.rects: Dict[str, pygame.Rect] = {}
+
+        x = 0
+        for glyph, surface in zip(glyphs, rendered):
+            self.surface.blit(surface, (x, 0))
+            self.rects[glyph] = pygame.Rect(x, 0, surface.get_width(), height)
+            x += surface.get_width()
+
+    def covers(self, text: str) -> bool:
+        """Whether every character of text is in the atlas."""
+        return all(char in self.rects for char in text)
+
+    def width(self, text: str) -> int:
+        """Width in pixels of text drawn from the atlas."""
+        return sum(self.rects[char].width for char in text)
+
+    def blit(self, surface: pygame.Surface, text: str, pos: Tuple[int, int]) -> pygame.Rect:
+        """Draw text at pos and return the area it covers."""
+        x, y = pos
+        start = x
+        for char in text:
+            rect = self.rects[char]
+            surface.blit(self.surface, (x, y), rect)
+            x += rect.width
+        return pygame.Rect(start, y, x - start, self.surface.get_height())
+
+class CachedFont:
+    """Drop-in stand-in for pygame.font.Font whose render() hits the shared cache."""
+
+    def __init__(self, renderer: 'TextRenderer', size: int):
+        self.renderer = renderer
+        self.font_size = size
+
+    def render(self, text: str, antialias: bool, color: Color) -> pygame.Surface:
+        return self.renderer.render(text, self.font_size, color, antialias)
+
+    def size(self, text: str) -> Tuple[int, int]:
+        return self.renderer.font(self.font_size).size(text)
+
+    def get_linesize(self) -> int:
+        return self.renderer.font(self.font_size).get_linesize()
+
+class TextRenderer:
+    """Shared text rendering with loaded-once fonts and cached surfaces.
+
+    Each font size is loaded a single time. Rendered strings are kept in an
+    LRU cache keyed by (text, size, colour), and numeric strings can be drawn
+    from a per-size glyph atlas instead of being rendered at all.
+    """
+
+    def __init__(self, max_cached_surfaces: int = 512):
+        self.max_cached_surfaces = max_cached_surfaces
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self._surfaces: 'OrderedDict[Tuple[str, int, Color, bool], pygame.Surface]' = OrderedDict()
+        self._atlases: Dict[Tuple[int, Color], GlyphAtlas] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size: int) -> pygame.font.Font:
+        """The default font at a size, loaded on first use."""
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+
+    def cached_font(self, size: int) -> CachedFont:
+        """A Font-like object whose renders go through this cache."""
+        return CachedFont(self, size)
+
+    def render(self, text: str, size: int, color: Color, antialias: bool = True) -> pygame.Surface:
+        """Rendered surface for text, reused while it stays in the LRU cache."""
+        key = (text, size, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_cached_surfaces:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def atlas(self, size: int, color: Color) -> GlyphAtlas:
+        """Glyph atlas for numeric text at a size and colour."""
+        key = (size, tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(self.font(size), color)
+            self._atlases[key] = atlas
+        return atlas
+
+    def blit(self, surface: pygame.Surface, text: str, pos: Tuple[int, int],
+             size: int, color: Color) -> pygame.Rect:
+        """Draw cached text at pos and return the area it covers."""
+        return surface.blit(self.render(text, size, color), pos)
+
+    def blit_number(self, surface: pygame.Surface, text: str, pos: Tuple[int, int],
+                    size: int, color: Color) -> pygame.Rect:
+        """Draw a fast-changing numeric string from the glyph atlas.
+
+        Falls back to the surface cache if text has characters the atlas
+        doesn't cover. Returns the area drawn.
+        """
+        atlas = self.atlas(size, color)
+        if atlas.covers(text):
+            return atlas.blit(surface, text, pos)
+        return self.blit(surface, text, pos, size, color)
+
+    def clear(self) -> None:
+        """Drop every cached surface and atlas (fonts stay loaded)."""
+        self._surfaces.clear()
+        self._atlases.clear()
+
+_renderer: Optional[TextRenderer] = None
+
+def get_text_renderer() -> TextRenderer:
+    """The text renderer shared by every entity and screen."""
+    global _renderer
+    if _renderer is None:
+        _renderer = TextRenderer()
+    return _renderer
@@ -0,0 +1,18 @@
+import os
+import shutil
+
+import entities.archetypes as archetypes_module
+from entities.archetypes import DATA_PATH, load_archetypes
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    data_path = tmp_path / 'archetypes.json'
+    shutil.copy(DATA_PATH, data_path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(archetypes_module.os, 'replace', fail)
+
+    archetypes = load_archetypes(str(data_path))
+    assert 'warrior' in archetypes.classes
+    assert os.listdir(tmp_path / '__pycache__') == []
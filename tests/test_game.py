@@ -0,0 +1,22 @@
+import os
+
+import pygame
+
+from game.replay import Replay
+from main import Game
+
+
+def test_quitting_mid_battle_records_how_the_run_ended(tmp_path, monkeypatch):
+    # Progress and history are saved next to the working directory
+    monkeypatch.chdir(tmp_path)
+    game = Game(replay_dir=str(tmp_path / 'replays'))
+    game.start_game()
+    for _ in range(10):
+        game.update()
+    assert game.simulation.state == 'battle'
+
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    game.run()
+
+    replay = Replay.load(os.path.join(game.replay_dir, f"replay-{game.simulation.replay.seed}.json"))
+    assert tuple(replay.transitions[-1]) == (game.simulation.run_tick, 'idle')
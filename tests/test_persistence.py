@@ -0,0 +1,34 @@
+import json
+import time
+
+from utils.persistence import AsyncJsonWriter
+
+
+def test_steady_saves_are_written_within_max_wait(tmp_path):
+    path = tmp_path / 'progress.json'
+    writer = AsyncJsonWriter(str(path), debounce=0.2, max_wait=0.5)
+    try:
+        start = time.monotonic()
+        # Faster than the debounce, for well past max_wait
+        i = 0
+        while time.monotonic() - start < 1.5:
+            writer.submit({'save': i})
+            i += 1
+            time.sleep(0.05)
+        # A trailing-only debounce would not have written anything yet
+        assert writer.written >= 2
+        assert json.loads(path.read_text())['save'] < i
+    finally:
+        writer.close()
+    assert json.loads(path.read_text()) == {'save': i - 1}
+
+
+def test_burst_of_saves_is_written_once(tmp_path):
+    path = tmp_path / 'progress.json'
+    writer = AsyncJsonWriter(str(path), debounce=0.2, max_wait=5.0)
+    for i in range(20):
+        writer.submit({'save': i})
+    assert writer.flush(timeout=5)
+    assert writer.written == 1
+    assert json.loads(path.read_text()) == {'save': 19}
+    writer.close()
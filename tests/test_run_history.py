@@ -0,0 +1,33 @@
+from systems.run_history import OUTCOME_CLEARED, OUTCOME_DEFEATED, RunHistory
+
+
+def _append_run(history, player_class, outcome, timestamp=0.0):
+    history.append(timestamp, 1, player_class, enemies_defeated=10, experience_gained=50,
+                   gold_earned=30, duration=60.0, waves_survived=3, level=2, outcome=outcome)
+
+
+def test_reader_sees_runs_appended_by_another_instance(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    writer = RunHistory(path)
+    reader = RunHistory(path)
+    _append_run(writer, 'warrior', OUTCOME_CLEARED)
+    assert len(reader) == 1
+    assert reader.win_rate(player_class='warrior') == 1.0
+
+    _append_run(writer, 'warrior', OUTCOME_DEFEATED, timestamp=1.0)
+    _append_run(writer, 'mage', OUTCOME_CLEARED, timestamp=2.0)
+    assert len(reader) == 3
+    assert reader.win_rate(player_class='warrior') == 0.5
+    assert list(reader.select(player_class='mage')) == [2]
+    assert reader.summary_by_class()['mage']['runs'] == 1
+
+
+def test_append_after_partial_record_starts_on_a_record_boundary(tmp_path):
+    path = tmp_path / 'history.bin'
+    history = RunHistory(str(path))
+    _append_run(history, 'rogue', OUTCOME_CLEARED)
+    with open(path, 'ab') as f:
+        f.write(b'\0' * 5)  # an append cut short
+    _append_run(history, 'rogue', OUTCOME_DEFEATED)
+    assert len(history) == 2
+    assert history.win_rate(player_class='rogue') == 0.5
@@ -0,0 +1,43 @@
+import random
+
+from utils.spatial import SpatialHash
+
+
+class Marker:
+    """A hashable object with identity equality, like an enemy."""
+
+
+def test_ties_go_to_the_object_inserted_first():
+    index = SpatialHash(800, 600)
+    markers = [Marker() for _ in range(6)]
+    # All the same distance from (400, 300), spread over several cells
+    for marker, (x, y) in zip(markers, [(500, 300), (300, 300), (400, 400),
+                                        (400, 200), (400, 300 + 100), (500, 300)]):
+        index.insert(marker, x, y)
+    assert [obj for obj, _ in index.nearest(400, 300, k=3)] == markers[:3]
+    assert index.nearest(400, 300)[0][0] is markers[0]
+
+
+def test_nearest_matches_a_full_scan():
+    rng = random.Random(7)
+    index = SpatialHash(800, 600)
+    points = {}
+    for _ in range(300):
+        marker = Marker()
+        # Coarse coordinates so many distances tie
+        points[marker] = (rng.randrange(0, 800, 20), rng.randrange(0, 600, 20))
+        index.insert(marker, *points[marker])
+    order = list(points)
+    for _ in range(50):
+        x, y = rng.randrange(800), rng.randrange(600)
+        expected = sorted(order, key=lambda m: (index.distance(x, y, *points[m]), order.index(m)))
+        assert [obj for obj, _ in index.nearest(x, y, k=5)] == expected[:5]
+
+
+def test_within_radius_keeps_insertion_order_within_a_cell():
+    index = SpatialHash(800, 600)
+    markers = [Marker() for _ in range(20)]
+    for i, marker in enumerate(markers):
+        index.insert(marker, 10 + i, 10)
+    index.move(markers[0], 11, 10)  # moving inside a cell keeps its place
+    assert [obj for obj, _ in index.within_radius(10, 10, 40)] == markers